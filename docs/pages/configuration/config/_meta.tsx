@@ -3,6 +3,7 @@ export default {
     caching: "Caching",
     logging: "Logging & Webhooks",
     messages: "Messages",
+    profiling: "Profiling",
     "structured-output": "Structured Output",
     "web-ui": "Web UI",
 };
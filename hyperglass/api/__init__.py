@@ -14,8 +14,14 @@ from hyperglass.constants import __version__
 from hyperglass.exceptions import HyperglassError
 
 # Local
-from .events import check_redis
-from .routes import info, query, device, devices, queries
+from .events import (
+    check_redis,
+    enable_log_sinks,
+    stop_webhook_worker,
+    start_webhook_worker,
+    close_external_sessions,
+)
+from .routes import info, query, device, devices, metrics, queries
 from .middleware import COMPRESSION_CONFIG, create_cors_config
 from .error_handlers import app_handler, http_handler, default_handler, validation_handler
 
@@ -41,6 +47,7 @@ HANDLERS = [
     queries,
     info,
     query,
+    metrics,
 ]
 
 if not STATE.settings.disable_ui:
@@ -63,7 +70,8 @@ app = Litestar(
         ValidationException: validation_handler,
         Exception: default_handler,
     },
-    on_startup=[check_redis],
+    on_startup=[check_redis, enable_log_sinks, start_webhook_worker],
+    on_shutdown=[stop_webhook_worker, close_external_sessions],
     debug=STATE.settings.debug,
     cors_config=create_cors_config(state=STATE),
     compression_config=COMPRESSION_CONFIG,
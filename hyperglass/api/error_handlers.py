@@ -10,6 +10,7 @@ from litestar.exceptions import ValidationException
 # Project
 from hyperglass.log import log
 from hyperglass.state import use_state
+from hyperglass.metrics import count_error
 
 __all__ = (
     "default_handler",
@@ -45,6 +46,7 @@ def get_validation_exception_detail(exc: ValidationException) -> Response:
 def default_handler(request: Request, exc: BaseException) -> Response:
     """Handle uncaught errors."""
     state = use_state()
+    count_error(exc)
     log.bind(method=request.method, path=request.url.path, detail=str(exc)).critical("Error")
     return Response(
         {"output": state.params.messages.general, "level": "danger", "keywords": []},
@@ -54,6 +56,7 @@ def default_handler(request: Request, exc: BaseException) -> Response:
 
 def http_handler(request: Request, exc: BaseException) -> Response:
     """Handle web server errors."""
+    count_error(exc)
     log.bind(method=request.method, path=request.url.path, detail=exc.detail).critical("HTTP Error")
     return Response(
         {"output": exc.detail, "level": "danger", "keywords": []},
@@ -63,6 +66,7 @@ def http_handler(request: Request, exc: BaseException) -> Response:
 
 def app_handler(request: Request, exc: BaseException) -> Response:
     """Handle application errors."""
+    count_error(exc)
     log.bind(method=request.method, path=request.url.path, detail=exc.message).critical(
         "hyperglass Error"
     )
@@ -74,5 +78,6 @@ def app_handler(request: Request, exc: BaseException) -> Response:
 
 def validation_handler(request: Request, exc: ValidationException) -> Response:
     """Handle Pydantic validation errors raised by FastAPI."""
+    count_error(exc)
     log.bind(method=request.method, path=request.url.path, detail=exc).critical("Validation Error")
     return get_validation_exception_detail(exc)
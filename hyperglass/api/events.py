@@ -2,17 +2,72 @@
 
 # Standard Library
 import typing as t
+import logging
 
 # Third Party
 from litestar import Litestar
 
 # Project
 from hyperglass.state import use_state
+from hyperglass.tracing import enable_trace_export
+from hyperglass.settings import Settings
+from hyperglass.external._base import close_sessions
+from hyperglass.external.webhook_queue import WebhookWorker
+from hyperglass.log import enable_file_logging, enable_syslog_logging
 
-__all__ = ("check_redis",)
+__all__ = (
+    "check_redis",
+    "enable_log_sinks",
+    "close_external_sessions",
+    "start_webhook_worker",
+    "stop_webhook_worker",
+)
 
 
 async def check_redis(_: Litestar) -> t.NoReturn:
     """Ensure Redis is running before starting server."""
     cache = use_state("cache")
     cache.check()
+
+
+async def enable_log_sinks(_: Litestar) -> t.NoReturn:
+    """Log & export traces to the configured destinations from this worker process."""
+    params = use_state("params")
+    level = logging.DEBUG if Settings.debug else logging.INFO
+    # Sinks already added in this process, i.e. when running a single worker, aren't added again.
+    enable_file_logging(
+        directory=params.logging.directory,
+        max_size=params.logging.max_size,
+        log_format=params.logging.format,
+        level=level,
+        header=False,
+    )
+    if params.logging.syslog is not None:
+        enable_syslog_logging(
+            host=params.logging.syslog.host, port=params.logging.syslog.port, level=level
+        )
+    if params.logging.traces:
+        enable_trace_export(
+            directory=params.logging.directory, max_size=int(params.logging.max_size)
+        )
+
+
+async def start_webhook_worker(app: Litestar) -> t.NoReturn:
+    """Start delivering queued webhooks, if HTTP logging is enabled."""
+    params = use_state("params")
+    if params.logging.http is not None:
+        worker = WebhookWorker(params.logging.http)
+        worker.start()
+        app.state.webhook_worker = worker
+
+
+async def stop_webhook_worker(app: Litestar) -> t.NoReturn:
+    """Stop the webhook worker, if it was started."""
+    worker = app.state.get("webhook_worker")
+    if worker is not None:
+        await worker.stop()
+
+
+async def close_external_sessions(_: Litestar) -> t.NoReturn:
+    """Close shared external HTTP sessions."""
+    await close_sessions()
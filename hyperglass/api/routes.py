@@ -12,16 +12,19 @@ from litestar.di import Provide
 from litestar.background_tasks import BackgroundTask
 
 # Project
-from hyperglass.log import log
+from hyperglass.log import Lazy, log
 from hyperglass.state import HyperglassState
 from hyperglass.exceptions import HyperglassError
 from hyperglass.models.api import Query
 from hyperglass.models.data import OutputDataModel
+from hyperglass.tracing import span, use_trace
+from hyperglass.profiling import PROFILE_HEADER, PROFILE_ID_HEADER, profile_query
 from hyperglass.util.typing import is_type
 from hyperglass.execution.main import execute
 from hyperglass.models.api.response import QueryResponse
 from hyperglass.models.config.params import Params, APIParams
 from hyperglass.models.config.devices import Devices, APIDevice
+from hyperglass.metrics import CACHE_OPERATIONS, export, track_request
 
 # Local
 from .state import get_state, get_params, get_devices
@@ -34,6 +37,7 @@ __all__ = (
     "queries",
     "info",
     "query",
+    "metrics",
 )
 
 
@@ -64,106 +68,132 @@ async def info(params: Params) -> APIParams:
 @post("/api/query", dependencies={"_state": Provide(get_state)})
 async def query(_state: HyperglassState, request: Request, data: Query) -> QueryResponse:
     """Ingest request data pass it to the backend application to perform the query."""
+    profiling_key = request.headers.get(PROFILE_HEADER)
+    with (
+        track_request(directive=data.query_type, device=data.device.id),
+        use_trace(data.trace),
+        profile_query(data, _state.params.profiling, profiling_key) as profile,
+    ):
+        timestamp = datetime.now(UTC)
 
-    timestamp = datetime.now(UTC)
+        # Initialize cache
+        cache = _state.redis
 
-    # Initialize cache
-    cache = _state.redis
+        # Use hashed `data` string as key for for k/v cache store so
+        # each command output value is unique.
+        cache_key = f"hyperglass.query.{data.digest()}"
 
-    # Use hashed `data` string as key for for k/v cache store so
-    # each command output value is unique.
-    cache_key = f"hyperglass.query.{data.digest()}"
+        _log = log.bind(query=Lazy(data.summary))
 
-    _log = log.bind(query=data.summary())
+        _log.info("Starting query execution")
 
-    _log.info("Starting query execution")
+        with span("cache"):
+            cache_response = cache.get_map(cache_key, "output")
+        json_output = False
+        cached = False
+        runtime = 65535
 
-    cache_response = cache.get_map(cache_key, "output")
-    json_output = False
-    cached = False
-    runtime = 65535
+        if cache_response:
+            _log.bind(cache_key=cache_key).debug("Cache hit")
+            CACHE_OPERATIONS.labels(operation="hit").inc()
 
-    if cache_response:
-        _log.bind(cache_key=cache_key).debug("Cache hit")
+            # If a cached response exists, reset the expiration time.
+            with span("cache"):
+                cache.expire(cache_key, expire_in=_state.params.cache.timeout)
+                timestamp = cache.get_map(cache_key, "timestamp")
+            CACHE_OPERATIONS.labels(operation="expire").inc()
 
-        # If a cached response exists, reset the expiration time.
-        cache.expire(cache_key, expire_in=_state.params.cache.timeout)
+            cached = True
+            runtime = 0
 
-        cached = True
-        runtime = 0
-        timestamp = cache.get_map(cache_key, "timestamp")
+        elif not cache_response:
+            _log.bind(cache_key=cache_key).debug("Cache miss")
+            CACHE_OPERATIONS.labels(operation="miss").inc()
 
-    elif not cache_response:
-        _log.bind(cache_key=cache_key).debug("Cache miss")
+            timestamp = data.timestamp
 
-        timestamp = data.timestamp
+            starttime = time.time()
 
-        starttime = time.time()
+            if _state.params.fake_output:
+                # Return fake, static data for development purposes, if enabled.
+                output = await fake_output(
+                    query_type=data.query_type,
+                    structured=data.device.structured_output or False,
+                )
+            else:
+                # Pass request to execution module
+                with span("execute"):
+                    output = await execute(data)
 
-        if _state.params.fake_output:
-            # Return fake, static data for development purposes, if enabled.
-            output = await fake_output(
-                query_type=data.query_type,
-                structured=data.device.structured_output or False,
-            )
-        else:
-            # Pass request to execution module
-            output = await execute(data)
+            endtime = time.time()
+            elapsedtime = round(endtime - starttime, 4)
+            _log.debug("Runtime: {!s} seconds", elapsedtime)
 
-        endtime = time.time()
-        elapsedtime = round(endtime - starttime, 4)
-        _log.debug("Runtime: {!s} seconds", elapsedtime)
+            if output is None:
+                raise HyperglassError(message=_state.params.messages.general, alert="danger")
 
-        if output is None:
-            raise HyperglassError(message=_state.params.messages.general, alert="danger")
+            json_output = is_type(output, OutputDataModel)
 
-        json_output = is_type(output, OutputDataModel)
+            if json_output:
+                # Export structured output as JSON string to guarantee value
+                # is serializable, then convert it back to a dict.
+                as_json = output.export_json()
+                raw_output = json.loads(as_json)
+            else:
+                raw_output = str(output)
+
+            with span("cache"):
+                cache.set_map_item(cache_key, "output", raw_output)
+                cache.set_map_item(cache_key, "timestamp", timestamp)
+                cache.expire(cache_key, expire_in=_state.params.cache.timeout)
+            CACHE_OPERATIONS.labels(operation="expire").inc()
+
+            _log.bind(cache_timeout=_state.params.cache.timeout).debug("Response cached")
+
+            runtime = int(round(elapsedtime, 0))
+
+        # If it does, return the cached entry
+        with span("cache"):
+            cache_response = cache.get_map(cache_key, "output")
+
+        json_output = is_type(cache_response, t.Dict)
+        response_format = "text/plain"
 
         if json_output:
-            # Export structured output as JSON string to guarantee value
-            # is serializable, then convert it back to a dict.
-            as_json = output.export_json()
-            raw_output = json.loads(as_json)
-        else:
-            raw_output = str(output)
-
-        cache.set_map_item(cache_key, "output", raw_output)
-        cache.set_map_item(cache_key, "timestamp", timestamp)
-        cache.expire(cache_key, expire_in=_state.params.cache.timeout)
-
-        _log.bind(cache_timeout=_state.params.cache.timeout).debug("Response cached")
-
-        runtime = int(round(elapsedtime, 0))
-
-    # If it does, return the cached entry
-    cache_response = cache.get_map(cache_key, "output")
-
-    json_output = is_type(cache_response, t.Dict)
-    response_format = "text/plain"
-
-    if json_output:
-        response_format = "application/json"
-    _log.info("Execution completed")
-
-    response = {
-        "output": cache_response,
-        "id": cache_key,
-        "cached": cached,
-        "runtime": runtime,
-        "timestamp": timestamp,
-        "format": response_format,
-        "random": data.random(),
-        "level": "success",
-        "keywords": [],
-    }
-
-    return Response(
-        response,
-        background=BackgroundTask(
-            send_webhook,
-            params=_state.params,
-            data=data,
-            request=request,
-            timestamp=timestamp,
-        ),
-    )
+            response_format = "application/json"
+        _log.info("Execution completed")
+
+        response = {
+            "output": cache_response,
+            "id": cache_key,
+            "cached": cached,
+            "runtime": runtime,
+            "timestamp": timestamp,
+            "format": response_format,
+            "random": data.random(),
+            "level": "success",
+            "keywords": [],
+            "timing": data.trace.timings(),
+        }
+        headers = {"Server-Timing": data.trace.server_timing()}
+        if profile is not None:
+            headers[PROFILE_ID_HEADER] = profile.id
+
+        return Response(
+            response,
+            headers=headers,
+            background=BackgroundTask(
+                send_webhook,
+                params=_state.params,
+                data=data,
+                request=request,
+                timestamp=timestamp,
+            ),
+        )
+
+
+@get("/metrics", include_in_schema=False, sync_to_thread=True)
+def metrics() -> Response:
+    """Export Prometheus metrics from all worker processes."""
+    content, content_type = export()
+    return Response(content, media_type=content_type)
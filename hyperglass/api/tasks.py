@@ -10,7 +10,7 @@ from litestar import Request
 
 # Project
 from hyperglass.log import log
-from hyperglass.external import Webhook, bgptools
+from hyperglass.external.webhook_queue import WebhookQueue
 from hyperglass.models.api import Query
 
 if t.TYPE_CHECKING:
@@ -40,7 +40,7 @@ async def send_webhook(
     request: Request,
     timestamp: datetime,
 ) -> t.NoReturn:
-    """If webhooks are enabled, get request info and send a webhook."""
+    """If webhooks are enabled, get request info and queue a webhook."""
     try:
         if params.logging.http is not None:
             headers = await process_headers(headers=request.headers)
@@ -52,19 +52,17 @@ async def send_webhook(
             else:
                 host = request.client.host
 
-            network_info = await bgptools.network_info(host)
-
-            async with Webhook(params.logging.http) as hook:
-                await hook.send(
-                    query={
-                        **data.dict(),
-                        "headers": headers,
-                        "source": host,
-                        "network": network_info.get(host, {}),
-                        "timestamp": timestamp,
-                    }
-                )
+            # Network information is added and the webhook is sent by the webhook worker.
+            WebhookQueue().publish(
+                {
+                    **data.dict(),
+                    "headers": headers,
+                    "source": host,
+                    "timestamp": timestamp,
+                },
+                max_length=params.logging.http.queue_size,
+            )
     except Exception as err:
         log.bind(destination=params.logging.http.provider, error=str(err)).error(
-            "Failed to send webhook"
+            "Failed to queue webhook"
         )
@@ -0,0 +1,272 @@
+"""Load test the query API.
+
+By default, the API app is run in-process against the local state backend, and device execution
+is replaced with simulated devices that return `fake_output` data after a configurable latency.
+A running hyperglass instance can be tested instead by passing its URL.
+
+Example scenario file:
+
+```yaml
+scenarios:
+  - name: bgp_route
+    rate: 50
+    duration: 30
+    concurrency: 20
+    device_latency: 0.5
+    queries:
+      - location: router01
+        type: __hyperglass_juniper_bgp_route__
+        target: 1.1.1.0/24
+        weight: 3
+      - location: router02
+        type: __hyperglass_juniper_bgp_route__
+        target: 8.8.8.0/24
+```
+"""
+
+# Standard Library
+import time
+import random
+import typing as t
+import asyncio
+from pathlib import Path
+from contextlib import nullcontext, contextmanager
+from unittest import mock
+
+# Third Party
+from pydantic import Field
+
+# Project
+from hyperglass.models.main import HyperglassModel
+
+if t.TYPE_CHECKING:
+    # Third Party
+    import httpx
+
+# Latency percentiles reported for each scenario.
+PERCENTILES = (50, 90, 99)
+
+
+class LoadTestQuery(HyperglassModel):
+    """Query sent by a load test scenario."""
+
+    location: str
+    type: str
+    target: t.Union[str, t.List[str]]
+    weight: int = Field(1, ge=1)
+
+    def body(self) -> t.Dict[str, t.Any]:
+        """Get the query API request body."""
+        return {"queryLocation": self.location, "queryType": self.type, "queryTarget": self.target}
+
+
+class LoadTestScenario(HyperglassModel):
+    """Mix of queries sent at a target rate."""
+
+    name: str
+    queries: t.List[LoadTestQuery] = Field(min_length=1)
+    # Requests per second.
+    rate: float = Field(10, gt=0)
+    # Seconds.
+    duration: float = Field(10, gt=0)
+    # Maximum number of in-flight requests.
+    concurrency: int = Field(10, ge=1)
+    # If false, cached responses are removed as soon as they are received, so that most
+    # requests are cache misses.
+    cache: bool = True
+    # Simulated device response time & random variation, in seconds.
+    device_latency: float = Field(0, ge=0)
+    device_jitter: float = Field(0, ge=0)
+
+
+class LoadTestConfig(HyperglassModel):
+    """Load test scenarios."""
+
+    scenarios: t.List[LoadTestScenario] = Field(min_length=1)
+
+
+class LoadTestResult(HyperglassModel):
+    """Results of a load test scenario."""
+
+    name: str
+    requests: int
+    succeeded: int
+    cached: int
+    # Error counts by HTTP status or exception name.
+    errors: t.Dict[str, int]
+    # Seconds.
+    elapsed: float
+    # Successful requests per second.
+    throughput: float
+    # Latency percentiles, in milliseconds, for all, cached & uncached successful requests.
+    latency: t.Dict[str, t.Dict[str, float]]
+
+    @property
+    def error_rate(self) -> float:
+        """Get the share of failed requests."""
+        return (self.requests - self.succeeded) / self.requests if self.requests else 0.0
+
+
+class Sample(t.NamedTuple):
+    """Outcome of a single request."""
+
+    latency: float
+    error: t.Optional[str]
+    cached: bool
+
+
+def percentiles(values: t.Sequence[float]) -> t.Dict[str, float]:
+    """Get nearest-rank latency percentiles & maximum, in milliseconds."""
+    if len(values) == 0:
+        return {}
+    ordered = sorted(values)
+    result = {
+        f"p{p}": round(ordered[max(-(-p * len(ordered) // 100) - 1, 0)] * 1000, 2)
+        for p in PERCENTILES
+    }
+    result["max"] = round(ordered[-1] * 1000, 2)
+    return result
+
+
+def summarize(
+    scenario: LoadTestScenario, samples: t.List[Sample], elapsed: float
+) -> LoadTestResult:
+    """Summarize a scenario's samples."""
+    errors: t.Dict[str, int] = {}
+    hits, misses = [], []
+    for sample in samples:
+        if sample.error is not None:
+            errors[sample.error] = errors.get(sample.error, 0) + 1
+        elif sample.cached:
+            hits.append(sample.latency)
+        else:
+            misses.append(sample.latency)
+    succeeded = len(hits) + len(misses)
+    return LoadTestResult(
+        name=scenario.name,
+        requests=len(samples),
+        succeeded=succeeded,
+        cached=len(hits),
+        errors=errors,
+        elapsed=round(elapsed, 3),
+        throughput=round(succeeded / elapsed, 2) if elapsed else 0.0,
+        latency={
+            "all": percentiles(hits + misses),
+            "cached": percentiles(hits),
+            "uncached": percentiles(misses),
+        },
+    )
+
+
+def load_scenarios(path: Path) -> LoadTestConfig:
+    """Load scenarios from a YAML, TOML or JSON file."""
+    # Project
+    from hyperglass.configuration.load import load_dsl
+
+    return LoadTestConfig.model_validate(load_dsl(path, empty_allowed=False))
+
+
+@contextmanager
+def simulated_devices(latency: float, jitter: float) -> t.Generator[None, None, None]:
+    """Replace device execution with fake output returned after a simulated response time."""
+    # Project
+    from hyperglass.api.fake_output import fake_output
+
+    async def execute(query: t.Any) -> t.Any:
+        await asyncio.sleep(max(latency + random.uniform(-jitter, jitter), 0))
+        return await fake_output(
+            query_type=query.query_type, structured=query.device.structured_output or False
+        )
+
+    with mock.patch("hyperglass.api.routes.execute", execute):
+        yield
+
+
+async def run_scenario(client: "httpx.AsyncClient", scenario: LoadTestScenario) -> LoadTestResult:
+    """Send a scenario's queries at its target rate & collect the results.
+
+    Requests are started on a fixed schedule regardless of how long earlier requests take, and
+    latency is measured from each request's scheduled start. Time spent waiting for a free slot
+    when `concurrency` requests are in flight is therefore included in the latency.
+    """
+    # Project
+    from hyperglass.state import use_state
+
+    cache = None if scenario.cache else use_state("cache")
+    limit = asyncio.Semaphore(scenario.concurrency)
+    weights = [query.weight for query in scenario.queries]
+    samples: t.List[Sample] = []
+
+    async def send(query: LoadTestQuery, scheduled: float) -> None:
+        async with limit:
+            error, cached = None, False
+            try:
+                response = await client.post("/api/query", json=query.body())
+                if response.is_success:
+                    data = response.json()
+                    cached = data.get("cached", False)
+                    if cache is not None:
+                        await asyncio.to_thread(cache.delete, data["id"])
+                else:
+                    error = f"HTTP {response.status_code}"
+            except Exception as err:
+                error = err.__class__.__name__
+            samples.append(Sample(time.perf_counter() - scheduled, error, cached))
+
+    total = max(int(scenario.rate * scenario.duration), 1)
+    start = time.perf_counter()
+    tasks = []
+    for idx in range(total):
+        scheduled = start + idx / scenario.rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        query = random.choices(scenario.queries, weights)[0]
+        tasks.append(asyncio.create_task(send(query, scheduled)))
+    await asyncio.gather(*tasks)
+
+    return summarize(scenario, samples, time.perf_counter() - start)
+
+
+def init_app() -> None:
+    """Load configuration & plugins into the local state backend, as `hyperglass start` does."""
+    # Project
+    from hyperglass.main import register_all_plugins
+    from hyperglass.configuration import init_user_config
+
+    init_user_config()
+    register_all_plugins()
+
+
+async def run_load_test(
+    config: LoadTestConfig, *, url: t.Optional[str] = None
+) -> t.List[LoadTestResult]:
+    """Run each scenario in turn, in-process with simulated devices or against `url`."""
+    results = []
+
+    if url is None:
+        init_app()
+
+        # Third Party
+        from litestar.testing import AsyncTestClient
+
+        # Project
+        from hyperglass.api import app
+
+        client = AsyncTestClient(app=app)
+    else:
+        # Third Party
+        import httpx
+
+        client = httpx.AsyncClient(base_url=url, timeout=None)
+
+    async with client:
+        for scenario in config.scenarios:
+            if url is None:
+                simulated = simulated_devices(scenario.device_latency, scenario.device_jitter)
+            else:
+                simulated = nullcontext()
+            with simulated:
+                results.append(await run_scenario(client, scenario))
+
+    return results
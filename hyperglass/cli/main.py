@@ -4,6 +4,7 @@
 import re
 import sys
 import typing as t
+from pathlib import Path
 
 # Third Party
 import typer
@@ -138,6 +139,109 @@ def _clear_cache():
         raise typer.Exit(1)
 
 
+@cli.command(name="profiles")
+def _profiles(
+    profile_id: t.Optional[str] = typer.Argument(None, help="Profile ID"),
+    output: t.Optional[Path] = typer.Option(
+        None, help="Write the profile's folded stacks to a file, for flame graph tools"
+    ),
+):
+    """Show stored query profiles"""
+    # Standard Library
+    from datetime import datetime
+
+    # Third Party
+    from rich.table import Table
+
+    # Project
+    from hyperglass.profiling import get_profile, get_profiles, folded_stacks
+
+    if profile_id is None:
+        table = Table("ID", "Time", "Device", "Type", "Target", "Duration (ms)", "Samples", "Error")
+        for profile in get_profiles():
+            query = profile["query"]
+            table.add_row(
+                profile["id"],
+                datetime.fromtimestamp(profile["timestamp"]).strftime("%Y-%m-%d %H:%M:%S"),
+                query["query_location"],
+                query["query_type"],
+                str(query["query_target"]),
+                str(round(profile["duration"] * 1000, 1)),
+                str(profile["samples"]),
+                profile["error"] or "",
+            )
+        echo.plain(table)
+        raise typer.Exit(0)
+
+    profile = get_profile(profile_id)
+    if profile is None:
+        echo.error("Profile {!r} does not exist or has expired", profile_id)
+        raise typer.Exit(1)
+
+    stacks = folded_stacks(profile)
+    if output is None:
+        sys.stdout.write(stacks)
+        raise typer.Exit(0)
+
+    output.write_text(stacks)
+    echo.success("Wrote {} samples to {}", profile["samples"], output)
+
+
+@cli.command(name="load-test")
+def _load_test(
+    scenarios: Path = typer.Argument(..., help="Load test scenario file (YAML, TOML or JSON)"),
+    url: t.Optional[str] = typer.Option(
+        None,
+        help=(
+            "URL of a running hyperglass instance. By default, the API runs in-process with "
+            "simulated devices"
+        ),
+    ),
+    output: t.Optional[Path] = typer.Option(None, help="Write results to a JSON file"),
+):
+    """Load test the query API"""
+    # Standard Library
+    import json
+    import asyncio
+
+    # Third Party
+    from rich.table import Table
+
+    # Local
+    from .loadtest import PERCENTILES, run_load_test, load_scenarios
+
+    config = load_scenarios(scenarios)
+    results = asyncio.run(run_load_test(config, url=url))
+
+    table = Table(
+        "Scenario",
+        "Requests",
+        "Errors",
+        "Cached",
+        "Requests/s",
+        *(f"p{p} (ms)" for p in PERCENTILES),
+        "Max (ms)",
+    )
+    for result in results:
+        latency = result.latency["all"]
+        table.add_row(
+            result.name,
+            str(result.requests),
+            f"{result.error_rate:.1%}",
+            str(result.cached),
+            str(result.throughput),
+            *(str(latency.get(f"p{p}", "-")) for p in PERCENTILES),
+            str(latency.get("max", "-")),
+        )
+        for error, count in result.errors.items():
+            echo.warning("{}: {} {} errors", result.name, count, error)
+    echo.plain(table)
+
+    if output is not None:
+        output.write_text(json.dumps([result.model_dump() for result in results], indent=2))
+        echo.success("Wrote results to {}", output)
+
+
 @cli.command(name="devices")
 def _devices(
     search: t.Optional[str] = typer.Argument(None, help="Device ID or Name Search Pattern")
@@ -0,0 +1,52 @@
+"""Test load test result summaries."""
+
+# Local
+from ..loadtest import Sample, LoadTestScenario, summarize, percentiles
+
+SCENARIO = LoadTestScenario(
+    name="test", queries=[{"location": "router01", "type": "bgp_route", "target": "1.1.1.0/24"}]
+)
+
+
+def test_percentiles():
+    assert percentiles([]) == {}
+    assert percentiles([0.2]) == {"p50": 200.0, "p90": 200.0, "p99": 200.0, "max": 200.0}
+
+    # 1ms to 100ms, out of order.
+    values = [i / 1000 for i in range(100, 0, -1)]
+    assert percentiles(values) == {"p50": 50.0, "p90": 90.0, "p99": 99.0, "max": 100.0}
+    # Nearest-rank percentiles are always one of the values.
+    assert percentiles([0.01, 0.02, 0.03]) == {"p50": 20.0, "p90": 30.0, "p99": 30.0, "max": 30.0}
+
+
+def test_summarize():
+    samples = [
+        Sample(latency=0.01, error=None, cached=True),
+        Sample(latency=0.02, error=None, cached=False),
+        Sample(latency=0.03, error=None, cached=False),
+        Sample(latency=0.5, error="504", cached=False),
+        Sample(latency=1.0, error="504", cached=False),
+        Sample(latency=0.1, error="ReadTimeout", cached=False),
+    ]
+    result = summarize(SCENARIO, samples, 2.0)
+
+    assert result.name == "test"
+    assert result.requests == 6
+    assert result.succeeded == 3
+    assert result.cached == 1
+    assert result.errors == {"504": 2, "ReadTimeout": 1}
+    assert result.error_rate == 0.5
+    assert result.throughput == 1.5
+    # Failed requests aren't included in latency percentiles.
+    assert result.latency["all"]["max"] == 30.0
+    assert result.latency["all"]["p50"] == 20.0
+    assert result.latency["cached"] == {"p50": 10.0, "p90": 10.0, "p99": 10.0, "max": 10.0}
+    assert result.latency["uncached"]["p50"] == 20.0
+
+
+def test_summarize_empty():
+    result = summarize(SCENARIO, [], 0.0)
+    assert result.requests == 0
+    assert result.throughput == 0.0
+    assert result.error_rate == 0.0
+    assert result.latency == {"all": {}, "cached": {}, "uncached": {}}
@@ -7,6 +7,7 @@ from abc import ABC, abstractmethod
 # Project
 from hyperglass.types import Series
 from hyperglass.plugins import OutputPluginManager
+from hyperglass.models.data import BGPRouteTable
 
 # Local
 from ._construct import Construct
@@ -45,4 +46,9 @@ class Connection(ABC):
         if response is None:
             response = ()
 
+        if isinstance(response, BGPRouteTable):
+            # Enrich structured output with RPKI states after parsing, so external lookups for
+            # the whole table happen concurrently rather than once per route during validation.
+            response = await response.validate_rpki()
+
         return response
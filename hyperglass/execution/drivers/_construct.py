@@ -13,10 +13,8 @@ import ipaddress
 
 # Project
 from hyperglass.log import log
-from hyperglass.util import get_fmt_keys
 from hyperglass.constants import TRANSPORT_REST, TARGET_FORMAT_SPACE
 from hyperglass.exceptions.public import InputInvalid
-from hyperglass.exceptions.private import ConfigError
 
 if t.TYPE_CHECKING:
     # Third Party
@@ -87,20 +85,8 @@ class Construct:
             }
         )
 
-    def format(self, command: str) -> str:
-        """Return formatted command for 'Scrape' endpoints (SSH)."""
-        keys = get_fmt_keys(command)
-        attrs = {k: v for k, v in self.device.attrs.items() if k in keys}
-        for key in [k for k in keys if k != "target" and k != "mask"]:
-            if key not in attrs:
-                raise ConfigError(
-                    ("Command '{c}' has attribute '{k}', " "which is missing from device '{d}'"),
-                    level="danger",
-                    c=self.directive.name,
-                    k=key,
-                    d=self.device.name,
-                )
-
+    def mask(self) -> t.Union[ipaddress.IPv4Address, ipaddress.IPv6Address]:
+        """Get the target's network mask, if it's an IPv4 network with more than one host."""
         mask = ipaddress.ip_address("255.255.255.255")
         try:
             network = ipaddress.ip_network(self.target)
@@ -109,23 +95,22 @@ class Construct:
                 mask = network.netmask
         except ValueError:
             pass
-
-        return command.format(target=self.target, mask=mask, **attrs)
+        return mask
 
     def queries(self):
         """Return queries for each enabled AFI."""
-        query = []
-
-        rules = [r for r in self.directive.rules if r._passed is True]
-        if len(rules) < 1:
+        # Rules are matched per query, since directives are shared by concurrent queries.
+        validation = self.query.validation
+        if len(validation.rules) < 1:
             raise InputInvalid(
                 error="No validation rules matched target '{target}'",
                 target=self.query.query_target,
             )
 
-        for rule in [r for r in self.directive.rules if r._passed is True]:
-            for command in rule.commands:
-                query.append(self.format(command))
+        # Device attributes are substituted in each rule's commands when the device is loaded.
+        templates = self.device.command_templates(self.directive.id, validation.indexes)
+        mask = self.mask() if any(template.uses_mask for template in templates) else None
+        query = [template.render(self.target, mask) for template in templates]
         self._log.bind(constructed_query=query).debug("Constructed query")
         return query
 
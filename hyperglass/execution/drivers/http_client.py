@@ -8,6 +8,8 @@ import httpx
 
 # Project
 from hyperglass.util import get_fmt_keys
+from hyperglass.tracing import span
+from hyperglass.metrics import DEVICE_DURATION, timer
 from hyperglass.exceptions.public import AuthError, RestError, DeviceTimeout, ResponseEmpty
 
 # Local
@@ -96,9 +98,13 @@ class HttpClient(Connection):
                 body = self._body()
 
             try:
-                response: httpx.Response = await client.request(
-                    method=self.config.method, url=self.config.path, params=query, **body
-                )
+                with (
+                    timer(DEVICE_DURATION, device=self.device.id, stage="command"),
+                    span("command", path=self.config.path),
+                ):
+                    response: httpx.Response = await client.request(
+                        method=self.config.method, url=self.config.path, params=query, **body
+                    )
                 response.raise_for_status()
                 data = response.text.strip()
 
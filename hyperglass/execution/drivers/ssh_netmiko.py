@@ -17,6 +17,8 @@ from netmiko import (  # type: ignore
 # Project
 from hyperglass.log import log
 from hyperglass.state import use_state
+from hyperglass.tracing import span
+from hyperglass.metrics import DEVICE_DURATION, timer
 from hyperglass.exceptions.public import AuthError, DeviceTimeout, ResponseEmpty
 
 # Local
@@ -84,12 +86,17 @@ class NetmikoConnection(SSHConnection):
                 driver_kwargs["passphrase"] = self.device.credential.password.get_secret_value()
 
         try:
-            nm_connect_direct = ConnectHandler(**driver_kwargs)
+            with timer(DEVICE_DURATION, device=self.device.id, stage="connect"), span("connect"):
+                nm_connect_direct = ConnectHandler(**driver_kwargs)
 
             responses = ()
 
             for query in self.query:
-                raw = nm_connect_direct.send_command(query, **send_args)
+                with (
+                    timer(DEVICE_DURATION, device=self.device.id, stage="command"),
+                    span("command", command=query),
+                ):
+                    raw = nm_connect_direct.send_command(query, **send_args)
                 responses += (raw,)
 
             nm_connect_direct.disconnect()
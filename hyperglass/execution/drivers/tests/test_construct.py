@@ -46,6 +46,26 @@ def directives():
             "juniper_bgp_route": {
                 "name": "BGP Route",
                 "field": {"description": "test"},
+                "rules": [
+                    {
+                        "condition": "192.0.2.0/24",
+                        "ge": 24,
+                        "le": 32,
+                        "command": "show route {target}",
+                    },
+                    {
+                        "condition": "198.51.100.0/24",
+                        "ge": 24,
+                        "le": 32,
+                        "command": "show route {target} exact",
+                    },
+                    {
+                        "condition": "203.0.113.0/24",
+                        "ge": 24,
+                        "le": 32,
+                        "command": ["show route {target} {mask}", "ping {target} source {source4}"],
+                    },
+                ],
             }
         }
     ]
@@ -88,3 +108,32 @@ def test_construct(state):
     )
     constructor = Construct(device=state.devices["test1"], query=query)
     assert constructor.target == "192.0.2.0/24"
+
+
+def test_construct_concurrent_queries(state):
+    # Both queries are validated before either is constructed, as with concurrent requests.
+    first = Query(
+        queryLocation="test1",
+        queryTarget="192.0.2.0/24",
+        queryType="juniper_bgp_route",
+    )
+    second = Query(
+        queryLocation="test1",
+        queryTarget="198.51.100.0/24",
+        queryType="juniper_bgp_route",
+    )
+    device = state.devices["test1"]
+    assert Construct(device=device, query=first).queries() == ["show route 192.0.2.0/24"]
+    assert Construct(device=device, query=second).queries() == ["show route 198.51.100.0/24 exact"]
+
+
+def test_construct_command_templates(state):
+    query = Query(
+        queryLocation="test1",
+        queryTarget="203.0.113.0/24",
+        queryType="juniper_bgp_route",
+    )
+    assert Construct(device=state.devices["test1"], query=query).queries() == [
+        "show route 203.0.113.0/24 255.255.255.0",
+        "ping 203.0.113.0/24 source 192.0.2.1",
+    ]
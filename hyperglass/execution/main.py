@@ -8,12 +8,15 @@ http client API calls, returns the output back to the front end.
 
 # Standard Library
 import signal
+from contextlib import ExitStack
 from typing import TYPE_CHECKING, Any, Dict, Union, Callable
 
 # Project
-from hyperglass.log import log
+from hyperglass.log import Lazy, log
 from hyperglass.state import use_state
+from hyperglass.tracing import span
 from hyperglass.util.typing import is_series
+from hyperglass.metrics import DEVICE_DURATION, timer
 from hyperglass.exceptions.public import DeviceTimeout, ResponseEmpty
 
 if TYPE_CHECKING:
@@ -47,7 +50,7 @@ async def execute(query: "Query") -> Union["OutputDataModel", str]:
     """Initiate query validation and execution."""
     params = use_state("params")
     output = params.messages.general
-    _log = log.bind(query=query.summary(), device=query.device.id)
+    _log = log.bind(query=Lazy(query.summary), device=query.device.id)
     _log.debug("")
 
     mapped_driver = map_driver(query.device.driver)
@@ -61,12 +64,17 @@ async def execute(query: "Query") -> Union["OutputDataModel", str]:
 
     if query.device.proxy:
         proxy = driver.setup_proxy()
-        with proxy() as tunnel:
-            response = await driver.collect(tunnel.local_bind_host, tunnel.local_bind_port)
+        with ExitStack() as stack:
+            with span("tunnel", device=query.device.id):
+                tunnel = stack.enter_context(proxy())
+            with span("collect", device=query.device.id):
+                response = await driver.collect(tunnel.local_bind_host, tunnel.local_bind_port)
     else:
-        response = await driver.collect()
+        with span("collect", device=query.device.id):
+            response = await driver.collect()
 
-    output = await driver.response(response)
+    with timer(DEVICE_DURATION, device=query.device.id, stage="parse"), span("parse"):
+        output = await driver.response(response)
 
     if is_series(output):
         if len(output) == 0:
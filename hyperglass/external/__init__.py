@@ -1,7 +1,7 @@
 """Functions & handlers for external data."""
 
 # Local
-from .rpki import rpki_state
+from .rpki import rpki_state, rpki_states
 from .slack import SlackHook
 from .generic import BaseExternal
 from .msteams import MSTeams
@@ -16,6 +16,7 @@ __all__ = (
     "network_info_sync",
     "network_info",
     "rpki_state",
+    "rpki_states",
     "SlackHook",
     "Webhook",
 )
@@ -3,10 +3,14 @@
 # Standard Library
 import re
 import json as _json
+import time
 import socket
 import typing as t
+import asyncio
+import weakref
+import threading
 from json import JSONDecodeError
-from socket import gaierror
+from functools import lru_cache
 
 # Third Party
 import httpx
@@ -21,6 +25,7 @@ from hyperglass.exceptions.private import ExternalError
 
 if t.TYPE_CHECKING:
     # Standard Library
+    import ssl
     from types import TracebackType
 
     # Project
@@ -29,11 +34,53 @@ if t.TYPE_CHECKING:
 
 D = t.TypeVar("D", bound=t.Dict)
 
+# (Base URL, timeout, verify SSL)
+SessionKey = t.Tuple[str, int, bool]
+
+# Seconds between connection checks for each base URL.
+HEALTH_CHECK_INTERVAL = 60
+
+AsyncSessions = t.Dict[SessionKey, httpx.AsyncClient]
+
+_SESSIONS: t.Dict[SessionKey, httpx.Client] = {}
+# Async sessions can only be used by the event loop they were created in.
+_ASYNC_SESSIONS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncSessions]" = (
+    weakref.WeakKeyDictionary()
+)
+# Base URL: (available, time of last check)
+_HEALTH: t.Dict[str, t.Tuple[bool, float]] = {}
+_CHECKING: t.Set[str] = set()
+_LOCK = threading.Lock()
+
 
 def _prepare_dict(_dict: D) -> D:
     return _json.loads(_json.dumps(_dict, default=str))
 
 
+@lru_cache(maxsize=None)
+def _ssl_context(verify_ssl: bool) -> "ssl.SSLContext":
+    """Create an SSL context once for each verification mode."""
+    context = httpx.create_ssl_context(verify=verify_ssl)
+
+    if Settings.ca_cert is not None:
+        context.load_verify_locations(cafile=str(Settings.ca_cert))
+
+    return context
+
+
+async def close_sessions() -> None:
+    """Close all shared sessions, e.g. on shutdown."""
+    loop = asyncio.get_running_loop()
+    with _LOCK:
+        sessions = list(_SESSIONS.values())
+        async_sessions = list(_ASYNC_SESSIONS.pop(loop, {}).values())
+        _SESSIONS.clear()
+    for session in sessions:
+        session.close()
+    for asession in async_sessions:
+        await asession.aclose()
+
+
 class BaseExternal:
     """Base session handler."""
 
@@ -58,19 +105,36 @@ class BaseExternal:
         self.timeout = timeout
         self.parse = parse
 
-        context = httpx.create_ssl_context(verify=verify_ssl)
-
-        if Settings.ca_cert is not None:
-            context.load_verify_locations(cafile=str(Settings.ca_cert))
+    @property
+    def _session_key(self: "BaseExternal") -> SessionKey:
+        return (self.base_url, self.timeout, self.verify_ssl)
 
-        client_kwargs = {
+    def _client_kwargs(self: "BaseExternal") -> t.Dict[str, t.Any]:
+        return {
             "base_url": self.base_url,
             "timeout": self.timeout,
-            "verify": context,
+            "verify": _ssl_context(self.verify_ssl),
         }
 
-        self._session = httpx.Client(**client_kwargs)
-        self._asession = httpx.AsyncClient(**client_kwargs)
+    @property
+    def _session(self: "BaseExternal") -> httpx.Client:
+        """Get the shared sync session for this instance's base URL & options."""
+        key = self._session_key
+        with _LOCK:
+            if key not in _SESSIONS:
+                _SESSIONS[key] = httpx.Client(**self._client_kwargs())
+            return _SESSIONS[key]
+
+    @property
+    def _asession(self: "BaseExternal") -> httpx.AsyncClient:
+        """Get the shared async session for the running event loop."""
+        key = self._session_key
+        loop = asyncio.get_running_loop()
+        with _LOCK:
+            sessions = _ASYNC_SESSIONS.setdefault(loop, {})
+            if key not in sessions:
+                sessions[key] = httpx.AsyncClient(**self._client_kwargs())
+            return sessions[key]
 
     @classmethod
     def __init_subclass__(
@@ -81,11 +145,8 @@ class BaseExternal:
         cls.name = name or cls.__name__
 
     async def __aenter__(self: "BaseExternal") -> "BaseExternal":
-        """Test connection on entry."""
-        available = await self._atest()
-
-        if available:
-            log.bind(url=self.base_url).debug("Initialized session")
+        """Ensure the base URL was reachable when last checked."""
+        if self._available(background=True):
             return self
         raise self._exception(f"Unable to create session to {self.name}")
 
@@ -95,23 +156,17 @@ class BaseExternal:
         exc_value: t.Optional[BaseException] = None,
         traceback: t.Optional["TracebackType"] = None,
     ) -> True:
-        """Close connection on exit."""
-        log.bind(url=self.base_url).debug("Closing session")
-
+        """Log errors on exit. The shared session remains open for reuse."""
         if exc_type is not None:
             log.error(str(exc_value))
 
-        await self._asession.aclose()
         if exc_value is not None:
             raise exc_value
         return True
 
     def __enter__(self: "BaseExternal") -> "BaseExternal":
-        """Test connection on entry."""
-        available = self._test()
-
-        if available:
-            log.bind(url=self.base_url).debug("Initialized session")
+        """Ensure the base URL was reachable when last checked."""
+        if self._available(background=False):
             return self
         raise self._exception(f"Unable to create session to {self.name}")
 
@@ -121,10 +176,9 @@ class BaseExternal:
         exc_value: t.Optional[BaseException] = None,
         exc_traceback: t.Optional["TracebackType"] = None,
     ) -> bool:
-        """Close connection on exit."""
+        """Log errors on exit. The shared session remains open for reuse."""
         if exc_type is not None:
             log.error(str(exc_value))
-        self._session.close()
         if exc_value is not None:
             raise exc_value
         return True
@@ -169,19 +223,13 @@ class BaseExternal:
             # E.g. `https://www.example.com` becomes `www.example.com`
             test_host = re.sub(r"http(s)?\:\/\/", "", self.base_url)
 
-            # Create a generic socket object
-            test_socket = socket.socket()
+            # Try opening a low-level socket to make sure it's even listening on the port prior
+            # to trying to use it. The timeout keeps an unresponsive host from tying up the check.
+            with socket.create_connection((test_host, 443), timeout=self.timeout) as test_socket:
+                test_socket.shutdown(socket.SHUT_WR)
 
-            # Try opening a low-level socket to make sure it's even
-            # listening on the port prior to trying to use it.
-            test_socket.connect((test_host, 443))
-
-            # Properly shutdown & close the socket.
-            test_socket.shutdown(1)
-            test_socket.close()
-
-        except gaierror as err:
-            # Raised if the target isn't listening on the port
+        except OSError as err:
+            # Raised if the host can't be resolved, refuses the connection, or doesn't respond.
             raise self._exception(
                 f"{self.name!r} appears to be unreachable at {self.base_url!r}", err
             ) from None
@@ -190,7 +238,37 @@ class BaseExternal:
 
     async def _atest(self: "BaseExternal") -> bool:
         """Open a low-level connection to the base URL to ensure its port is open."""
-        return self._test()
+        return await asyncio.to_thread(self._test)
+
+    def _check(self: "BaseExternal") -> bool:
+        """Test the connection and record the result."""
+        try:
+            available = self._test()
+        except Exception as err:
+            # Any failure, not just an unreachable host, marks the base URL unavailable.
+            log.bind(url=self.base_url, error=str(err)).warning("Connection check failed")
+            available = False
+        finally:
+            _CHECKING.discard(self.base_url)
+        _HEALTH[self.base_url] = (available, time.monotonic())
+        return available
+
+    def _available(self: "BaseExternal", background: bool) -> bool:
+        """Get the result of the last connection check, starting a new check if it's stale.
+
+        If the base URL hasn't been checked yet, it's assumed to be available, and the first
+        request surfaces any connection error. Checks run in a separate thread so callers use
+        the last result instead of waiting for a new one, unless the last check failed and
+        `background` is false.
+        """
+        available, checked = _HEALTH.get(self.base_url, (True, 0.0))
+        stale = time.monotonic() - checked > HEALTH_CHECK_INTERVAL
+        if stale and self.base_url not in _CHECKING:
+            if not available and not background:
+                return self._check()
+            _CHECKING.add(self.base_url)
+            threading.Thread(target=self._check, daemon=True).start()
+        return available
 
     def _build_request(self: "BaseExternal", **kwargs: t.Any) -> t.Dict[str, t.Any]:
         """Process requests parameters into structure usable by http library."""
@@ -241,8 +319,8 @@ class BaseExternal:
             request["params"] = params
 
         if data is not None:
-            if not isinstance(data, dict):
-                raise self._exception(f"Data must be a dict, got: {str(data)}")
+            if not isinstance(data, (dict, list)):
+                raise self._exception(f"Data must be a dict or list, got: {str(data)}")
             request["json"] = _prepare_dict(data)
 
         if timeout is not None:
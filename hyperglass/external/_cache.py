@@ -0,0 +1,101 @@
+"""Expiring, size-bounded cache for external data."""
+
+# Standard Library
+import time
+import pickle
+import typing as t
+
+# Project
+from hyperglass.state import use_state
+from hyperglass.exceptions.private import StateError
+from hyperglass.models.config.cache import ExternalCache
+
+if t.TYPE_CHECKING:
+    # Third Party
+    from redis import Redis
+
+
+class ExpiringCache:
+    """Cache external data as individual Redis keys with a TTL.
+
+    Each entry is stored under its own key, so entries expire independently and can be fetched
+    in a single `MGET` without reading unrelated entries. A sorted set indexes entries by
+    insertion time so the oldest entries can be evicted once `max_entries` is exceeded.
+    """
+
+    namespace: str
+    _redis: "Redis"
+    _prefix: str
+    _index: str
+
+    def __init__(self, namespace: str) -> None:
+        """Set up cache key names for `namespace`."""
+        cache = use_state("cache")
+        self.namespace = namespace
+        self._redis = cache.instance
+        self._prefix = cache.key(namespace)
+        self._index = f"{self._prefix}:index"
+
+    @property
+    def config(self) -> ExternalCache:
+        """Get external cache configuration, or defaults if configuration isn't loaded."""
+        try:
+            return use_state("params").cache.external
+        except StateError:
+            return ExternalCache()
+
+    def _name(self, item: str) -> str:
+        # Items often contain `.` (e.g. IP addresses), which would be mangled by
+        # `RedisManager.key()`, so they're joined to the namespace as-is.
+        return f"{self._prefix}:{item}"
+
+    def get_many(self, *items: str) -> t.Dict[str, t.Any]:
+        """Get all unexpired values for `items` in a single call."""
+        if len(items) == 0:
+            return {}
+        values = self._redis.mget([self._name(item) for item in items])
+        return {
+            item: pickle.loads(value)  # noqa
+            for item, value in zip(items, values)
+            if isinstance(value, bytes)
+        }
+
+    def get(self, item: str) -> t.Any:
+        """Get an unexpired value, or `None`."""
+        return self.get_many(item).get(item)
+
+    def set_many(self, values: t.Dict[str, t.Any], *, negative: bool = False) -> None:
+        """Cache values, expiring after the configured timeout.
+
+        If `negative` is `True`, the values are the result of a failed lookup and expire after
+        the (shorter) negative timeout, so the lookup isn't retried on every request.
+        """
+        if len(values) == 0:
+            return
+        config = self.config
+        ttl = config.negative_timeout if negative else config.timeout
+        now = time.time()
+
+        with self._redis.pipeline(transaction=False) as pipeline:
+            for item, value in values.items():
+                pipeline.set(self._name(item), pickle.dumps(value), ex=ttl)
+            pipeline.zadd(self._index, {item: now for item in values})
+            # Anything indexed before the longest TTL has already expired.
+            pipeline.zremrangebyscore(self._index, "-inf", now - config.timeout)
+            pipeline.zcard(self._index)
+            *_, size = pipeline.execute()
+
+        excess = size - config.max_entries
+        if excess > 0:
+            evicted = self._redis.zrange(self._index, 0, excess - 1)
+            with self._redis.pipeline(transaction=False) as pipeline:
+                pipeline.delete(*(self._name(item.decode()) for item in evicted))
+                pipeline.zrem(self._index, *evicted)
+                pipeline.execute()
+
+    def clear(self) -> None:
+        """Delete all entries."""
+        items = self._redis.zrange(self._index, 0, -1)
+        if items:
+            self._redis.delete(*(self._name(item.decode()) for item in items))
+        self._redis.delete(self._index)
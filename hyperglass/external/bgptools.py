@@ -8,16 +8,27 @@
 import re
 import typing as t
 import asyncio
+import weakref
 from ipaddress import IPv4Address, IPv6Address, ip_address
 
 # Project
 from hyperglass.log import log
-from hyperglass.state import use_state
+
+# Local
+from ._cache import ExpiringCache
 
 DEFAULT_KEYS = ("asn", "ip", "prefix", "country", "rir", "allocated", "org")
 
 CACHE_KEY = "hyperglass.external.bgptools"
 
+# Time to wait for concurrent lookups to be added to a bulk whois query.
+BATCH_WINDOW = 0.05
+
+# Maximum number of targets sent in a single bulk whois query.
+BATCH_SIZE = 1000
+
+READ_SIZE = 65536
+
 TargetDetail = t.TypedDict(
     "TargetDetail",
     {"asn": str, "ip": str, "country": str, "rir": str, "allocated": str, "org": str},
@@ -80,15 +91,15 @@ def parse_whois(output: str, targets: t.List[str]) -> TargetDetail:
             yield fields
 
     data = {}
+    wanted = set(targets)
 
     for line in lines(output):
         # Unpack each line's parsed values.
         asn, ip, prefix, country, rir, allocated, org = line
 
         # Match the line to the item in the list of resources to query.
-        if ip in targets:
-            i = targets.index(ip)
-            data[targets[i]] = {
+        if ip in wanted:
+            data[ip] = {
                 "asn": asn,
                 "ip": ip,
                 "prefix": prefix,
@@ -118,17 +129,98 @@ async def run_whois(targets: t.List[str]) -> str:
     await writer.drain()
 
     # Read the response
-    response = b""
+    response = []
     while True:
-        data = await reader.read(128)
+        data = await reader.read(READ_SIZE)
         if data:
-            response += data
+            response.append(data)
         else:
             log.debug("Closing connection to bgp.tools")
             writer.close()
             break
 
-    return response.decode()
+    return b"".join(response).decode()
+
+
+class WhoisBatcher:
+    """Coalesce concurrent bgp.tools lookups into bulk whois queries.
+
+    Targets requested within `BATCH_WINDOW` seconds of each other are sent in a single bulk query,
+    and each caller receives the parsed data for the targets it requested.
+    """
+
+    def __init__(self: "WhoisBatcher") -> None:
+        """Initialize an empty batch."""
+        self._pending: t.Dict[str, t.List[asyncio.Future]] = {}
+        self._flush: t.Optional[asyncio.TimerHandle] = None
+        # The event loop only keeps weak references to tasks, so running sends are kept here.
+        self._tasks: t.Set[asyncio.Task] = set()
+
+    async def lookup(self: "WhoisBatcher", *targets: str) -> TargetData:
+        """Get parsed whois data for targets, omitting targets missing from the response."""
+        loop = asyncio.get_running_loop()
+        futures = {}
+        for target in dict.fromkeys(targets):
+            future = loop.create_future()
+            self._pending.setdefault(target, []).append(future)
+            futures[target] = future
+
+        if len(self._pending) >= BATCH_SIZE:
+            self._schedule(loop, 0)
+        elif self._flush is None:
+            self._schedule(loop, BATCH_WINDOW)
+
+        results = await asyncio.gather(*futures.values())
+        return {target: data for target, data in zip(futures, results) if data is not None}
+
+    def _schedule(self: "WhoisBatcher", loop: asyncio.AbstractEventLoop, delay: float) -> None:
+        """Send the pending batch after `delay` seconds."""
+        if self._flush is not None:
+            self._flush.cancel()
+        self._flush = loop.call_later(delay, self._start_send, loop)
+
+    def _start_send(self: "WhoisBatcher", loop: asyncio.AbstractEventLoop) -> None:
+        """Send the pending batch in a task that's kept until it's done."""
+        task = loop.create_task(self._send())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self: "WhoisBatcher") -> None:
+        """Send the pending batch in bulk whois queries of up to `BATCH_SIZE` targets."""
+        pending, self._pending, self._flush = self._pending, {}, None
+        targets = list(pending)
+        for start in range(0, len(targets), BATCH_SIZE):
+            await self._query({t: pending[t] for t in targets[start : start + BATCH_SIZE]})
+
+    async def _query(self: "WhoisBatcher", pending: t.Dict[str, t.List[asyncio.Future]]) -> None:
+        """Run one bulk whois query and resolve its waiters."""
+        targets = list(pending)
+        log.bind(count=len(targets)).debug("Sending batched bgp.tools query")
+        try:
+            parsed = parse_whois(await run_whois(targets), targets)
+        except Exception as err:
+            for future in (f for futures in pending.values() for f in futures):
+                if not future.done():
+                    future.set_exception(err)
+            return
+
+        for target, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(parsed.get(target))
+
+
+_BATCHERS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, WhoisBatcher]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def whois_batcher() -> WhoisBatcher:
+    """Get the whois batcher for the running event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _BATCHERS:
+        _BATCHERS[loop] = WhoisBatcher()
+    return _BATCHERS[loop]
 
 
 async def network_info(*targets: str) -> TargetData:
@@ -136,19 +228,19 @@ async def network_info(*targets: str) -> TargetData:
 
     default_data, query_targets = default_ip_targets(*targets)
 
-    cache = use_state("cache")
+    cache = ExpiringCache(CACHE_KEY)
 
     # Set default data structure.
     query_data = {t: {k: "" for k in DEFAULT_KEYS} for t in query_targets}
 
-    # Get all cached bgp.tools data.
-    cached = cache.get_map(CACHE_KEY) or {}
+    # Get cached bgp.tools data for only the targets being queried.
+    cached = cache.get_many(*query_targets)
 
     # Try to use cached data for each of the items in the list of
     # resources.
-    for target in (target for target in query_targets if target in cached):
+    for target, data in cached.items():
         # Reassign the cached network info to the matching resource.
-        query_data[target] = cached[target]
+        query_data[target] = data
         log.bind(target=target).debug("Using cached network info")
 
     # Remove cached items from the resource list so they're not queried.
@@ -156,19 +248,19 @@ async def network_info(*targets: str) -> TargetData:
 
     try:
         if targets:
-            whoisdata = await run_whois(targets)
-
-            if whoisdata:
-                # If the response is not empty, parse it.
-                query_data.update(parse_whois(whoisdata, targets))
+            # Share a bulk whois query with any concurrent lookups.
+            parsed = await whois_batcher().lookup(*targets)
+            query_data.update(parsed)
 
-                # Cache the response
-                for target in targets:
-                    cache.set_map_item(CACHE_KEY, target, query_data[target])
-                    log.bind(target=t).debug("Cached network info")
+            # Cache the response, and briefly cache targets missing from the response.
+            cache.set_many(parsed)
+            cache.set_many({t: query_data[t] for t in targets if t not in parsed}, negative=True)
+            log.bind(targets=targets).debug("Cached network info")
 
     except Exception as err:
         log.error(err)
+        # Briefly cache failed lookups so they aren't retried on every request.
+        cache.set_many({t: query_data[t] for t in targets}, negative=True)
 
     return {**default_data, **query_data}
 
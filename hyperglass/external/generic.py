@@ -35,3 +35,16 @@ class GenericHook(BaseExternal, name="Generic"):
             params=self.config.params,
             data=payload.export_dict(),
         )
+
+    async def send_many(self: "GenericHook", queries: t.Sequence[t.Dict[str, t.Any]]):
+        """Send multiple webhooks to http endpoint as a single JSON array."""
+
+        payload = [Webhook(**query).export_dict() for query in queries]
+        log.bind(host=self.config.host.host, count=len(payload)).debug("Sending batched request")
+
+        return await self._apost(
+            endpoint=self.config.host.path,
+            headers=self.config.headers,
+            params=self.config.params,
+            data=payload,
+        )
@@ -0,0 +1,227 @@
+"""Look up network information from a local IP-to-ASN table.
+
+Supports tab-separated bulk dumps in the iptoasn.com (`ip2asn-combined.tsv`) format, where each
+line contains `range_start`, `range_end`, `AS_number`, `country_code` & `AS_description` columns.
+
+The dump is converted to a binary index of fixed-size records sorted by range start, which is
+memory-mapped and binary searched. Because the index is a file, it is shared by every worker
+process that maps it.
+"""
+
+# Standard Library
+import os
+import mmap
+import struct
+import typing as t
+import asyncio
+import tempfile
+import threading
+from pathlib import Path
+from ipaddress import IPv4Address, IPv6Address, ip_address, summarize_address_range
+
+# Project
+from hyperglass.log import log
+from hyperglass.exceptions.private import ExternalError
+
+if t.TYPE_CHECKING:
+    # Local
+    from .bgptools import TargetData, TargetDetail
+
+MAGIC = b"HGIP2ASN1"
+HEADER = struct.Struct(f">{len(MAGIC)}sQI")
+# Range start, range end, ASN, metadata offset, metadata length.
+RECORD = struct.Struct(">16s16sIIH")
+
+# IPv4 addresses are stored as IPv4-mapped IPv6 addresses so both families share one index.
+_V4_MAPPED = 0xFFFF << 32
+
+_INDEXES: t.Dict[Path, "NetworkIndex"] = {}
+_LOCK = threading.Lock()
+
+
+def _to_int(address: t.Union[IPv4Address, IPv6Address]) -> int:
+    if address.version == 4:
+        return _V4_MAPPED | int(address)
+    return int(address)
+
+
+def _from_int(value: int) -> t.Union[IPv4Address, IPv6Address]:
+    if value >> 32 == 0xFFFF:
+        return IPv4Address(value & 0xFFFFFFFF)
+    return IPv6Address(value)
+
+
+def index_path(source: Path, mtime: int) -> Path:
+    """Get the location of the binary index for a source file."""
+    name = f".{source.name}.{mtime}.idx"
+    if os.access(source.parent, os.W_OK):
+        return source.parent / name
+    return Path(tempfile.gettempdir()) / name
+
+
+def build_index(source: Path, target: Path) -> int:
+    """Convert a tab-separated IP-to-ASN dump to a binary index file.
+
+    The index is written to a temporary file and moved into place, so readers never see a
+    partially written index.
+    """
+    records = []
+    meta = bytearray()
+    with source.open("r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            fields = line.rstrip("\r\n").split("\t")
+            if len(fields) < 5:
+                continue
+            start, end, asn, country, org = fields[:5]
+            try:
+                asn = int(asn)
+                start, end = _to_int(ip_address(start)), _to_int(ip_address(end))
+            except ValueError:
+                continue
+            # AS0 marks unrouted space.
+            if asn == 0 or end < start:
+                continue
+            encoded = f"{country}\t{org}".encode()[:0xFFFF]
+            records.append((start, end, asn, len(meta), len(encoded)))
+            meta.extend(encoded)
+
+    records.sort()
+
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=target.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(records), RECORD.size))
+            for start, end, *rest in records:
+                f.write(RECORD.pack(start.to_bytes(16, "big"), end.to_bytes(16, "big"), *rest))
+            f.write(meta)
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return len(records)
+
+
+class NetworkIndex:
+    """Memory-mapped, binary-searchable IP-to-ASN index."""
+
+    def __init__(self, path: Path, mtime: int) -> None:
+        """Map an index file built by `build_index`."""
+        self.path = path
+        self.mtime = mtime
+        with path.open("rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or size != RECORD.size:
+            self._map.close()
+            raise ValueError(f"'{path!s}' is not a valid network index")
+        self._meta = HEADER.size + self.count * RECORD.size
+
+    def _start(self, idx: int) -> bytes:
+        offset = HEADER.size + idx * RECORD.size
+        return self._map[offset : offset + 16]
+
+    def lookup(self, target: str) -> t.Optional["TargetDetail"]:
+        """Get network information for an IP address, if it is in the index."""
+        try:
+            address = ip_address(target)
+        except ValueError:
+            return None
+        key = _to_int(address).to_bytes(16, "big")
+
+        # Find the last range starting at or before the address.
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._start(mid) <= key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            return None
+
+        start, end, asn, offset, length = RECORD.unpack_from(
+            self._map, HEADER.size + (lo - 1) * RECORD.size
+        )
+        if key > end:
+            return None
+
+        meta = self._map[self._meta + offset : self._meta + offset + length].decode()
+        country, _, org = meta.partition("\t")
+        first, last = _from_int(int.from_bytes(start, "big")), _from_int(int.from_bytes(end, "big"))
+        prefix = next(n for n in summarize_address_range(first, last) if address in n)
+        return {
+            "asn": str(asn),
+            "ip": str(address),
+            "prefix": str(prefix),
+            "country": country,
+            "rir": "",
+            "allocated": "",
+            "org": org,
+        }
+
+
+def network_index(path: Path) -> NetworkIndex:
+    """Get the network index for `path`, rebuilding it if the file has changed.
+
+    A new index is built and mapped completely before it replaces the current one. If the file
+    can't be read or parsed, the previously loaded index remains in use.
+    """
+    current = _INDEXES.get(path)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError as err:
+        if current is not None:
+            log.bind(path=path, error=str(err)).warning(
+                "Network file is unavailable, using last load"
+            )
+            return current
+        raise ExternalError(
+            message="Network file '{p}' is unavailable", level="danger", p=path
+        ) from err
+
+    if current is not None and current.mtime == mtime:
+        return current
+
+    with _LOCK:
+        current = _INDEXES.get(path)
+        if current is not None and current.mtime == mtime:
+            return current
+        target = index_path(path, mtime)
+        try:
+            # Another worker may have already built the index for this version of the file.
+            if not target.exists():
+                build_index(path, target)
+            index = NetworkIndex(target, mtime)
+        except (OSError, ValueError) as err:
+            if current is not None:
+                log.bind(path=path, error=str(err)).error("Failed to reload network file")
+                return current
+            raise ExternalError(
+                message="Failed to load network file '{p}': {e}",
+                level="danger",
+                p=path,
+                e=str(err),
+            ) from err
+        _INDEXES[path] = index
+
+    if current is not None and current.path != index.path:
+        # Mappings of the previous index stay valid after its file is removed.
+        current.path.unlink(missing_ok=True)
+
+    log.bind(path=path, networks=index.count).info("Loaded network file")
+    return index
+
+
+async def network_info(*targets: str, path: Path) -> "TargetData":
+    """Get network information for IP addresses from a local IP-to-ASN table.
+
+    Addresses not found in the table are omitted from the result.
+    """
+    # (Re)building a large index is done in a thread so it doesn't block the event loop.
+    index = await asyncio.to_thread(network_index, path)
+    data = {}
+    for target in dict.fromkeys(targets):
+        detail = index.lookup(target)
+        if detail is not None:
+            data[target] = detail
+    return data
@@ -2,11 +2,13 @@
 
 # Standard Library
 import typing as t
+import asyncio
 
 # Project
 from hyperglass.log import log
-from hyperglass.state import use_state
+from hyperglass.tracing import span
 from hyperglass.external._base import BaseExternal
+from hyperglass.external._cache import ExpiringCache
 
 if t.TYPE_CHECKING:
     # Standard Library
@@ -15,6 +17,9 @@ if t.TYPE_CHECKING:
 RPKI_STATE_MAP = {"Invalid": 0, "Valid": 1, "NotFound": 2, "DEFAULT": 3}
 RPKI_NAME_MAP = {v: k for k, v in RPKI_STATE_MAP.items()}
 CACHE_KEY = "hyperglass.external.rpki"
+BATCH_SIZE = 100
+
+RpkiTarget = t.Tuple[str, int]
 
 
 def rpki_state(prefix: t.Union["IPv4Address", "IPv6Address", str], asn: t.Union[int, str]) -> int:
@@ -22,12 +27,12 @@ def rpki_state(prefix: t.Union["IPv4Address", "IPv6Address", str], asn: t.Union[
     _log = log.bind(prefix=prefix, asn=asn)
     _log.debug("Validating RPKI State")
 
-    cache = use_state("cache")
+    cache = ExpiringCache(CACHE_KEY)
 
     state = 3
     ro = f"{prefix!s}@{asn!s}"
 
-    cached = cache.get_map(CACHE_KEY, ro)
+    cached = cache.get(ro)
 
     if cached is not None:
         state = cached
@@ -45,11 +50,12 @@ def rpki_state(prefix: t.Union["IPv4Address", "IPv6Address", str], asn: t.Union[
                 validation_state = 3
 
             state = RPKI_STATE_MAP[validation_state]
-            cache.set_map_item(CACHE_KEY, ro, state)
+            cache.set_many({ro: state})
         except Exception as err:
             log.error(err)
-            # Don't cache the state when an error produced it.
+            # Only briefly cache the state when an error produced it.
             state = 3
+            cache.set_many({ro: state}, negative=True)
 
     msg = "RPKI Validation State for {} via AS{} is {}".format(prefix, asn, RPKI_NAME_MAP[state])
     if cached is not None:
@@ -57,3 +63,84 @@ def rpki_state(prefix: t.Union["IPv4Address", "IPv6Address", str], asn: t.Union[
 
     log.debug(msg)
     return state
+
+
+async def _validate_batch(
+    client: BaseExternal, batch: t.Sequence[RpkiTarget]
+) -> t.Dict[RpkiTarget, int]:
+    """Validate a batch of prefix/ASN pairs in a single Cloudflare GraphQL request.
+
+    Each pair is requested as an aliased `validation` field, so one request returns every state.
+    Pairs missing from the response are omitted from the result.
+    """
+    fields = " ".join(
+        f'r{idx}: validation(prefix: "{prefix}", asn: {asn}) {{ state }}'
+        for idx, (prefix, asn) in enumerate(batch)
+    )
+    query = f"query GetValidation {{ {fields} }}"
+    log.bind(count=len(batch)).debug("Cloudflare RPKI GraphQL Batch Query")
+
+    response = await client._apost("/api/graphql", data={"query": query})
+    data = response.get("data") or {}
+
+    states = {}
+    for idx, target in enumerate(batch):
+        validation_state = (data.get(f"r{idx}") or {}).get("state")
+        if validation_state in RPKI_STATE_MAP:
+            states[target] = RPKI_STATE_MAP[validation_state]
+        else:
+            log.bind(prefix=target[0], asn=target[1]).error(
+                "Response from Cloudflare missing validation state"
+            )
+    return states
+
+
+async def rpki_states(*targets: RpkiTarget) -> t.Dict[RpkiTarget, int]:
+    """Get RPKI states for many prefix/ASN pairs at once.
+
+    Cached states are fetched in a single Redis call, and uncached pairs are validated
+    concurrently in batched GraphQL requests. States produced by errors are only cached for the
+    negative cache timeout.
+    """
+    unique: t.Tuple[RpkiTarget, ...] = tuple(
+        dict.fromkeys((str(prefix), int(asn)) for prefix, asn in targets)
+    )
+    if len(unique) == 0:
+        return {}
+
+    cache = ExpiringCache(CACHE_KEY)
+    fields = {target: "{!s}@{!s}".format(*target) for target in unique}
+    cached = cache.get_many(*fields.values())
+
+    states = {target: cached[field] for target, field in fields.items() if field in cached}
+    misses = [target for target in unique if target not in states]
+
+    log.bind(total=len(unique), cached=len(states), misses=len(misses)).debug(
+        "Validating RPKI States"
+    )
+
+    if len(misses) == 0:
+        return states
+
+    batches = [misses[i : i + BATCH_SIZE] for i in range(0, len(misses), BATCH_SIZE)]
+    resolved: t.Dict[RpkiTarget, int] = {}
+
+    try:
+        async with BaseExternal(base_url="https://rpki.cloudflare.com") as client:
+            with span("rpki", targets=len(misses)):
+                results = await asyncio.gather(
+                    *(_validate_batch(client, batch) for batch in batches), return_exceptions=True
+                )
+        for result in results:
+            if isinstance(result, BaseException):
+                log.error(result)
+                continue
+            resolved.update(result)
+    except Exception as err:
+        log.error(err)
+
+    failed = [target for target in misses if target not in resolved]
+    cache.set_many({fields[target]: state for target, state in resolved.items()})
+    cache.set_many({fields[target]: 3 for target in failed}, negative=True)
+
+    return {**states, **resolved, **{target: 3 for target in failed}}
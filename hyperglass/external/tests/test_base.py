@@ -10,7 +10,7 @@ from hyperglass.exceptions.private import ExternalError
 from hyperglass.models.config.logging import Http
 
 # Local
-from .._base import BaseExternal
+from .._base import _HEALTH, BaseExternal, close_sessions
 
 config = Http(provider="generic", host="https://httpbin.org")
 
@@ -47,3 +47,38 @@ async def _run_test_base_external_async():
 
 def test_base_external_async():
     asyncio.run(_run_test_base_external_async())
+
+
+def test_base_external_shared_sessions():
+    async def _sessions():
+        first = BaseExternal(base_url="https://example.com", config=config)
+        second = BaseExternal(base_url="https://example.com/", config=config)
+        other = BaseExternal(base_url="https://example.com", config=config, timeout=2)
+        assert first._asession is second._asession
+        assert first._asession is not other._asession
+        await close_sessions()
+
+    asyncio.run(_sessions())
+    first = BaseExternal(base_url="https://example.com", config=config)
+    second = BaseExternal(base_url="https://example.com", config=config)
+    assert first._session is second._session
+
+
+def test_base_external_check(monkeypatch):
+    def _refused(*args, **kwargs):
+        raise ConnectionRefusedError("Connection refused")
+
+    def _timeout(address, timeout):
+        assert timeout == 2
+        raise TimeoutError("timed out")
+
+    client = BaseExternal(base_url="https://192.0.2.1", config=config, timeout=2)
+    for connect in (_refused, _timeout):
+        monkeypatch.setattr("hyperglass.external._base.socket.create_connection", connect)
+        with pytest.raises(ExternalError):
+            client._test()
+        # Any connection failure is recorded, not raised.
+        _HEALTH.pop(client.base_url, None)
+        assert client._check() is False
+        assert _HEALTH[client.base_url][0] is False
+    _HEALTH.pop(client.base_url, None)
@@ -1,12 +1,14 @@
 """Test bgp.tools interactions."""
 
 # Standard Library
+import gc
 import asyncio
 
 # Third Party
 import pytest
 
 # Local
+from .. import bgptools
 from ..bgptools import run_whois, parse_whois, network_info
 
 WHOIS_OUTPUT = """AS    | IP      | BGP Prefix | CC | Registry | Allocated  | AS Name
@@ -48,3 +50,53 @@ def test_whois_parser():
     assert result[addr]["asn"] == "13335"
     assert result[addr]["rir"] == "ARIN"
     assert result[addr]["org"] == "Cloudflare, Inc."
+
+
+def test_whois_batcher(monkeypatch):
+    queries = []
+    running = []
+
+    async def _run_whois(targets):
+        # The running send must survive garbage collection.
+        gc.collect()
+        running.append(len(bgptools.whois_batcher()._tasks))
+        queries.append(targets)
+        return WHOIS_OUTPUT
+
+    monkeypatch.setattr(bgptools, "run_whois", _run_whois)
+
+    async def _lookup():
+        batcher = bgptools.whois_batcher()
+        results = await asyncio.gather(
+            batcher.lookup("1.1.1.1"), batcher.lookup("1.1.1.1", "198.51.100.1")
+        )
+        await asyncio.sleep(0)
+        assert len(batcher._tasks) == 0, "Finished send was not released"
+        return results
+
+    first, second = asyncio.run(_lookup())
+    assert running == [1]
+    assert len(queries) == 1, "Concurrent lookups were not batched"
+    assert set(queries[0]) == {"1.1.1.1", "198.51.100.1"}
+    assert first["1.1.1.1"]["asn"] == "13335"
+    assert second["1.1.1.1"]["org"] == "Cloudflare, Inc."
+    assert "198.51.100.1" not in second
+
+
+def test_whois_batch_size(monkeypatch):
+    queries = []
+
+    async def _run_whois(targets):
+        queries.append(targets)
+        return WHOIS_OUTPUT
+
+    monkeypatch.setattr(bgptools, "run_whois", _run_whois)
+    monkeypatch.setattr(bgptools, "BATCH_SIZE", 2)
+
+    async def _lookup():
+        batcher = bgptools.whois_batcher()
+        return await batcher.lookup("1.1.1.1", *(f"198.51.100.{i}" for i in range(1, 5)))
+
+    result = asyncio.run(_lookup())
+    assert [len(query) for query in queries] == [2, 2, 1]
+    assert result["1.1.1.1"]["asn"] == "13335"
@@ -0,0 +1,58 @@
+"""Test the expiring external data cache."""
+
+# Standard Library
+import typing as t
+from types import SimpleNamespace
+
+# Third Party
+import pytest
+
+# Project
+from hyperglass.models.config.cache import ExternalCache
+
+# Local
+from .._cache import ExpiringCache
+
+
+@pytest.fixture
+def cache(monkeypatch) -> t.Generator[ExpiringCache, None, None]:
+    config = ExternalCache(timeout=300, negative_timeout=10, max_entries=2)
+    monkeypatch.setattr(ExpiringCache, "config", property(lambda self: config))
+    _cache = ExpiringCache("hyperglass.test.external")
+    _cache.clear()
+    yield _cache
+    _cache.clear()
+
+
+def test_set_get(cache):
+    cache.set_many({"192.0.2.0/24@65000": 1, "198.51.100.0/24@65000": 2})
+    assert cache.get("192.0.2.0/24@65000") == 1
+    assert cache.get_many("192.0.2.0/24@65000", "203.0.113.0/24@65000") == {"192.0.2.0/24@65000": 1}
+    assert cache.get("203.0.113.0/24@65000") is None
+
+
+def test_timeouts(cache):
+    cache.set_many({"positive": 1})
+    cache.set_many({"negative": 3}, negative=True)
+    assert 290 < cache._redis.ttl(cache._name("positive")) <= 300
+    assert 0 < cache._redis.ttl(cache._name("negative")) <= 10
+
+
+def test_eviction(cache, monkeypatch):
+    # Entries are indexed by insertion time, so each is inserted a second after the last.
+    now = iter((1000.0, 1001.0, 1002.0))
+    monkeypatch.setattr("hyperglass.external._cache.time", SimpleNamespace(time=lambda: next(now)))
+    for item in ("first", "second", "third"):
+        cache.set_many({item: item})
+
+    assert cache.get_many("first", "second", "third") == {"second": "second", "third": "third"}
+    assert cache._redis.exists(cache._name("first")) == 0
+    index = [item.decode() for item in cache._redis.zrange(cache._index, 0, -1)]
+    assert index == ["second", "third"]
+
+
+def test_clear(cache):
+    cache.set_many({"first": 1, "second": 2})
+    cache.clear()
+    assert cache.get_many("first", "second") == {}
+    assert cache._redis.exists(cache._index) == 0
@@ -0,0 +1,45 @@
+"""Test local IP-to-ASN lookups."""
+
+# Standard Library
+import os
+import asyncio
+
+# Local
+from ..ip2asn import network_info, network_index
+
+TABLE = """1.0.0.0\t1.0.0.255\t13335\tUS\tCLOUDFLARENET
+1.0.1.0\t1.0.3.255\t0\tNone\tNot routed
+8.8.8.0\t8.8.8.255\t15169\tUS\tGOOGLE
+2001:4860::\t2001:4860:ffff:ffff:ffff:ffff:ffff:ffff\t15169\tUS\tGOOGLE
+"""
+
+
+def test_ip2asn_lookup(tmp_path):
+    path = tmp_path / "ip2asn.tsv"
+    path.write_text(TABLE)
+
+    data = asyncio.run(network_info("1.0.0.1", "8.8.8.8", "2001:4860::8888", "1.0.2.1", path=path))
+    assert data["1.0.0.1"]["asn"] == "13335"
+    assert data["1.0.0.1"]["prefix"] == "1.0.0.0/24"
+    assert data["8.8.8.8"]["org"] == "GOOGLE"
+    assert data["2001:4860::8888"]["prefix"] == "2001:4860::/32"
+    assert data["2001:4860::8888"]["country"] == "US"
+    assert "1.0.2.1" not in data, "Unrouted address was matched"
+
+
+def test_ip2asn_reload(tmp_path):
+    path = tmp_path / "ip2asn.tsv"
+    path.write_text(TABLE)
+    first = network_index(path)
+    assert first.lookup("9.9.9.9") is None
+
+    path.write_text(TABLE + "9.9.9.0\t9.9.9.255\t19281\tUS\tQUAD9-1\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    second = network_index(path)
+    assert second is not first
+    assert second.lookup("9.9.9.9")["asn"] == "19281"
+    # The previous index remains usable by anything still holding it.
+    assert first.lookup("8.8.8.8")["asn"] == "15169"
+    assert not first.path.exists()
@@ -1,9 +1,12 @@
 """Test RPKI data fetching."""
+# Standard Library
+import asyncio
+
 # Third Party
 import pytest
 
 # Local
-from ..rpki import RPKI_NAME_MAP, rpki_state
+from ..rpki import RPKI_NAME_MAP, rpki_state, rpki_states
 
 TEST_STATES = (
     ("103.21.244.0/24", 13335, 0),
@@ -23,3 +26,12 @@ def test_rpki():
         ), "RPKI State for '{}' via AS{!s} '{}' ({}) instead of '{}' ({})".format(
             prefix, asn, result, result_name, expected, expected_name
         )
+
+
+def test_rpki_batch():
+    targets = [(prefix, asn) for prefix, asn, _ in TEST_STATES]
+    # Duplicate pairs should only be validated once.
+    result = asyncio.run(rpki_states(*targets, *targets))
+    assert len(result) == len(TEST_STATES)
+    for prefix, asn, expected in TEST_STATES:
+        assert result[(prefix, asn)] == expected, f"Invalid RPKI State for '{prefix}' via AS{asn}"
@@ -0,0 +1,83 @@
+"""Test local VRP file validation."""
+
+# Standard Library
+import os
+import json
+import asyncio
+from pathlib import Path
+from ipaddress import ip_network
+
+# Local
+from ..vrp import VRPTable, PrefixIndex, vrp_table, vrp_states
+
+ROAS = {
+    "roas": [
+        {"prefix": "1.1.1.0/24", "maxLength": 24, "asn": 13335, "ta": "apnic"},
+        {"prefix": "103.21.244.0/23", "maxLength": 23, "asn": "AS13335", "ta": "apnic"},
+        {"prefix": "2606:4700::/32", "maxLength": 48, "asn": "AS13335", "ta": "arin"},
+        {"prefix": "198.51.100.0/24", "maxLength": 24, "asn": 0, "ta": "arin"},
+    ]
+}
+
+CHECKS = (
+    ("1.1.1.0/24", 13335, 1),
+    ("1.1.1.0/24", 65000, 0),
+    ("103.21.244.0/24", 13335, 0),
+    ("2606:4700:10::/48", 13335, 1),
+    ("2606:4700:10::/64", 13335, 0),
+    ("198.51.100.0/24", 0, 0),
+    ("192.0.2.0/24", 65000, 2),
+    ("not a prefix", 65000, 3),
+)
+
+
+def _write(path: Path, data: dict) -> Path:
+    with path.open("w") as file:
+        json.dump(data, file)
+    return path
+
+
+def test_vrp_table(tmp_path: Path):
+    table = VRPTable.load(_write(tmp_path / "vrps.json", ROAS))
+    assert table.count == len(ROAS["roas"])
+    for prefix, asn, expected in CHECKS:
+        assert table.state(prefix, asn) == expected, f"Invalid state for '{prefix}' via AS{asn}"
+
+
+def test_prefix_index():
+    index = PrefixIndex(32)
+    for prefix, vrp in (
+        ("10.0.0.0/8", (24, 1)),
+        ("10.1.0.0/16", (24, 2)),
+        ("10.1.2.0/24", (24, 3)),
+    ):
+        net = ip_network(prefix)
+        index.insert(int(net.network_address), net.prefixlen, vrp)
+
+    target = ip_network("10.1.2.0/24")
+    assert list(index.covering(int(target.network_address), 24)) == [(24, 1), (24, 2), (24, 3)]
+    # More specific VRPs don't cover a less specific prefix.
+    assert list(index.covering(int(target.network_address), 16)) == [(24, 1), (24, 2)]
+    other = ip_network("11.0.0.0/8")
+    assert list(index.covering(int(other.network_address), 8)) == []
+
+
+def test_vrp_reload(tmp_path: Path):
+    path = _write(tmp_path / "vrps.json", ROAS)
+    first = vrp_table(path)
+    assert vrp_table(path) is first
+
+    updated = {"roas": [*ROAS["roas"], {"prefix": "192.0.2.0/24", "maxLength": 24, "asn": 65000}]}
+    _write(path, updated)
+    os.utime(path, ns=(first.mtime + 1_000_000_000, first.mtime + 1_000_000_000))
+    second = vrp_table(path)
+    assert second is not first
+    assert second.state("192.0.2.0/24", 65000) == 1
+
+    # A broken file keeps the last good table.
+    path.write_text("{")
+    os.utime(path, ns=(second.mtime + 1_000_000_000, second.mtime + 1_000_000_000))
+    assert vrp_table(path) is second
+
+    states = asyncio.run(vrp_states(("1.1.1.0/24", 13335), ("1.1.1.0/24", 13335), path=path))
+    assert states == {("1.1.1.0/24", 13335): 1}
@@ -0,0 +1,101 @@
+"""Test webhook delivery from the webhook queue."""
+
+# Standard Library
+import asyncio
+
+# Project
+from hyperglass.models.config.logging import Http
+
+# Local
+from .. import webhook_queue
+from ..webhook_queue import WebhookWorker
+
+
+class FakeQueue:
+    def __init__(self):
+        self.acked = []
+        self.claimed = []
+
+    def claim(self, *event_ids):
+        self.claimed.append(event_ids)
+
+    def ack(self, *event_ids):
+        self.acked.extend(event_ids)
+
+
+def _events(count):
+    return [(f"{1000 + idx}-0", {"source": "192.0.2.1"}) for idx in range(count)]
+
+
+def test_webhook_retry(monkeypatch):
+    async def _sleep(_):
+        pass
+
+    monkeypatch.setattr(webhook_queue.asyncio, "sleep", _sleep)
+
+    worker = WebhookWorker(Http(provider="generic", host="https://example.com/hook", retries=2))
+    worker.queue = FakeQueue()
+    sent = []
+
+    async def _send_many(queries):
+        sent.append(len(queries))
+        if len(sent) == 1:
+            raise RuntimeError("Unavailable")
+
+    monkeypatch.setattr(worker.hook, "send_many", _send_many)
+
+    asyncio.run(worker._deliver_with_retry(_events(3)))
+    assert sent == [3, 3], "Events were not sent as one batch and retried"
+    assert worker.queue.acked == ["1000-0", "1001-0", "1002-0"]
+    # Unacknowledged events are claimed again before each attempt.
+    assert worker.queue.claimed == [("1000-0", "1001-0", "1002-0")] * 2
+
+
+def test_webhook_claim(monkeypatch):
+    async def _sleep(_):
+        pass
+
+    monkeypatch.setattr(webhook_queue.asyncio, "sleep", _sleep)
+
+    worker = WebhookWorker(Http(provider="slack", host="https://example.com/hook", retries=1))
+    worker.queue = FakeQueue()
+    sent = []
+
+    async def _send(query):
+        sent.append(query)
+        if len(sent) == 1:
+            raise RuntimeError("Unavailable")
+
+    monkeypatch.setattr(worker.hook, "send", _send)
+
+    asyncio.run(worker._deliver_with_retry(_events(3)))
+    # Events are sent one at a time, and every undelivered event is claimed before each send.
+    assert worker.queue.claimed == [
+        ("1000-0", "1001-0", "1002-0"),
+        ("1000-0", "1001-0", "1002-0"),
+        ("1000-0", "1002-0"),
+        ("1000-0",),
+    ]
+    assert worker.queue.acked == ["1001-0", "1002-0", "1000-0"]
+
+
+def test_webhook_drop(monkeypatch):
+    async def _sleep(_):
+        pass
+
+    monkeypatch.setattr(webhook_queue.asyncio, "sleep", _sleep)
+
+    worker = WebhookWorker(Http(provider="generic", host="https://example.com/hook", retries=1))
+    worker.queue = FakeQueue()
+    sent = []
+
+    async def _send_many(queries):
+        sent.append(len(queries))
+        raise RuntimeError("Unavailable")
+
+    monkeypatch.setattr(worker.hook, "send_many", _send_many)
+
+    asyncio.run(worker._deliver_with_retry(_events(2)))
+    assert sent == [2, 2]
+    # Undeliverable events are removed from the queue once retries are exhausted.
+    assert worker.queue.acked == ["1000-0", "1001-0"]
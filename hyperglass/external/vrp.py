@@ -0,0 +1,177 @@
+"""Validate RPKI state locally from a Validated ROA Payload (VRP) export.
+
+Supports JSON exports from rpki-client (`json` output) and Routinator (`json`/`jsonext` output),
+both of which contain a top-level `roas` array of objects with `prefix`, `asn` & `maxLength` keys.
+"""
+
+# Standard Library
+import json
+import typing as t
+import asyncio
+import threading
+from pathlib import Path
+from ipaddress import ip_network
+
+# Project
+from hyperglass.log import log
+from hyperglass.exceptions.private import ExternalError
+
+# Local
+from .rpki import RPKI_STATE_MAP, RpkiTarget
+
+# (maxLength, ASN)
+VRP = t.Tuple[int, int]
+
+_TABLES: t.Dict[Path, "VRPTable"] = {}
+_LOCK = threading.Lock()
+
+
+class PrefixIndex:
+    """VRPs of a single address family, indexed by prefix length & network.
+
+    Covering VRPs are found with one lookup per prefix length present in the index, and each VRP
+    is stored once, so memory use grows with the number of VRPs rather than their prefix lengths.
+    """
+
+    __slots__ = ("bits", "networks", "count", "_masks")
+
+    def __init__(self, bits: int) -> None:
+        """Create an empty index for addresses of `bits` length."""
+        self.bits = bits
+        # VRPs by network & prefix length, packed into one integer key to save memory.
+        self.networks: t.Dict[int, t.Tuple[VRP, ...]] = {}
+        self.count = 0
+        # Each prefix length present & its network mask, shortest first.
+        self._masks: t.Optional[t.Tuple[t.Tuple[int, int], ...]] = None
+
+    @property
+    def masks(self) -> t.Tuple[t.Tuple[int, int], ...]:
+        """Get each prefix length present & its network mask, shortest first."""
+        if self._masks is None:
+            lengths = sorted({key & 0xFF for key in self.networks})
+            self._masks = tuple(
+                (length, ((1 << length) - 1) << (self.bits - length)) for length in lengths
+            )
+        return self._masks
+
+    def insert(self, network: int, length: int, vrp: VRP) -> None:
+        """Add a VRP for `network/length`."""
+        key = network << 8 | length
+        self.networks[key] = (*self.networks.get(key, ()), vrp)
+        self.count += 1
+        self._masks = None
+
+    def covering(self, network: int, length: int) -> t.Generator[VRP, None, None]:
+        """Get all VRPs whose prefix covers `network/length`, least specific first."""
+        for vrp_length, mask in self.masks:
+            if vrp_length > length:
+                return
+            yield from self.networks.get((network & mask) << 8 | vrp_length, ())
+
+
+def _parse_asn(value: t.Union[str, int]) -> int:
+    """Convert `AS65000` or `65000` to an integer."""
+    if isinstance(value, str):
+        return int(value.upper().removeprefix("AS"))
+    return int(value)
+
+
+class VRPTable:
+    """In-memory VRP table loaded from a file."""
+
+    path: Path
+    mtime: int
+    indexes: t.Dict[int, PrefixIndex]
+
+    def __init__(self, *, path: Path, mtime: int, indexes: t.Dict[int, PrefixIndex]) -> None:
+        """Create a VRP table from pre-built indexes."""
+        self.path = path
+        self.mtime = mtime
+        self.indexes = indexes
+
+    @property
+    def count(self) -> int:
+        """Number of loaded VRPs."""
+        return sum(index.count for index in self.indexes.values())
+
+    @classmethod
+    def load(cls, path: Path) -> "VRPTable":
+        """Load a VRP JSON export into per-family prefix indexes."""
+        mtime = path.stat().st_mtime_ns
+        with path.open("rb") as file:
+            data = json.load(file)
+
+        indexes = {4: PrefixIndex(32), 6: PrefixIndex(128)}
+        for roa in data["roas"]:
+            net = ip_network(roa["prefix"], strict=False)
+            vrp = (int(roa.get("maxLength", net.prefixlen)), _parse_asn(roa["asn"]))
+            indexes[net.version].insert(int(net.network_address), net.prefixlen, vrp)
+
+        return cls(path=path, mtime=mtime, indexes=indexes)
+
+    def state(self, prefix: str, asn: t.Union[int, str]) -> int:
+        """Get the RFC 6811 origin validation state of a prefix & origin ASN."""
+        try:
+            net = ip_network(prefix, strict=False)
+        except ValueError:
+            return RPKI_STATE_MAP["DEFAULT"]
+
+        origin = int(asn)
+        covered = False
+        for max_length, vrp_asn in self.indexes[net.version].covering(
+            int(net.network_address), net.prefixlen
+        ):
+            covered = True
+            # AS0 VRPs never validate a route.
+            if vrp_asn == origin and vrp_asn != 0 and net.prefixlen <= max_length:
+                return RPKI_STATE_MAP["Valid"]
+
+        if covered:
+            return RPKI_STATE_MAP["Invalid"]
+        return RPKI_STATE_MAP["NotFound"]
+
+
+def vrp_table(path: Path) -> VRPTable:
+    """Get the loaded VRP table for `path`, reloading it if the file has changed.
+
+    A new table is built completely before it replaces the current one. If the file can't be
+    read or parsed, the previously loaded table remains in use.
+    """
+    current = _TABLES.get(path)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError as err:
+        if current is not None:
+            log.bind(path=path, error=str(err)).warning("VRP file is unavailable, using last load")
+            return current
+        raise ExternalError(
+            message="VRP file '{p}' is unavailable", level="danger", p=path
+        ) from err
+
+    if current is not None and current.mtime == mtime:
+        return current
+
+    with _LOCK:
+        current = _TABLES.get(path)
+        if current is not None and current.mtime == mtime:
+            return current
+        try:
+            table = VRPTable.load(path)
+        except (OSError, ValueError, KeyError, TypeError) as err:
+            if current is not None:
+                log.bind(path=path, error=str(err)).error("Failed to reload VRP file")
+                return current
+            raise ExternalError(
+                message="Failed to load VRP file '{p}': {e}", level="danger", p=path, e=str(err)
+            ) from err
+        _TABLES[path] = table
+
+    log.bind(path=path, vrps=table.count).info("Loaded VRP file")
+    return table
+
+
+async def vrp_states(*targets: RpkiTarget, path: Path) -> t.Dict[RpkiTarget, int]:
+    """Get RPKI states for many prefix/ASN pairs from a local VRP file."""
+    # (Re)loading a large file is done in a thread so it doesn't block the event loop.
+    table = await asyncio.to_thread(vrp_table, path)
+    return {target: table.state(*target) for target in dict.fromkeys(targets)}
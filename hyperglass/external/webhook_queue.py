@@ -0,0 +1,270 @@
+"""Durable, batched webhook delivery.
+
+Webhook events are added to a Redis stream when a query completes, and are delivered by a
+background worker in each API worker process. Workers share a consumer group, so each event is
+delivered by exactly one worker, and events left unacknowledged by a worker that exited are
+claimed by another.
+"""
+
+# Standard Library
+import os
+import time
+import pickle
+import socket
+import typing as t
+import asyncio
+
+# Third Party
+from redis.exceptions import ResponseError
+
+# Project
+from hyperglass.log import log
+from hyperglass.state import use_state
+
+# Local
+from . import ip2asn, bgptools
+from .generic import GenericHook
+from .webhooks import Webhook
+
+if t.TYPE_CHECKING:
+    # Third Party
+    from redis import Redis
+
+    # Project
+    from hyperglass.models.config.logging import Http
+
+    # Local
+    from ._base import BaseExternal
+
+STREAM_KEY = "webhooks"
+GROUP = "hyperglass"
+
+# Time to wait for new events in each read, in milliseconds.
+READ_BLOCK = 1000
+
+# Events unacknowledged for this long, in milliseconds, are claimed by another worker. Workers
+# refresh their claim on undelivered events before each delivery, so only the longest single
+# delivery & retry backoff, not the whole retry schedule, must be shorter than this.
+CLAIM_IDLE = 60000
+
+# Lag, in seconds, above which queue lag is logged as a warning.
+LAG_WARNING = 60
+
+MAX_BACKOFF = 30
+
+Event = t.Tuple[str, t.Dict[str, t.Any]]
+
+
+def _event_time(event_id: str) -> float:
+    """Get the time an event was added to the stream from its ID."""
+    return int(event_id.split("-", 1)[0]) / 1000
+
+
+class WebhookQueue:
+    """Redis stream of pending webhook events."""
+
+    _redis: "Redis"
+    stream: str
+    consumer: str
+
+    def __init__(self) -> None:
+        """Set up stream key and consumer name for this process."""
+        cache = use_state("cache")
+        self._redis = cache.instance
+        self.stream = cache.key(STREAM_KEY)
+        self.consumer = f"{socket.gethostname()}:{os.getpid()}"
+
+    def publish(self, event: t.Dict[str, t.Any], max_length: int) -> str:
+        """Add an event to the stream, trimming the stream to approximately `max_length`."""
+        event_id = self._redis.xadd(
+            self.stream, {"event": pickle.dumps(event)}, maxlen=max_length, approximate=True
+        )
+        return event_id.decode() if isinstance(event_id, bytes) else event_id
+
+    def create_group(self) -> None:
+        """Create the consumer group and stream if they don't exist."""
+        try:
+            self._redis.xgroup_create(self.stream, GROUP, id="0", mkstream=True)
+        except ResponseError as err:
+            if "BUSYGROUP" not in str(err):
+                raise
+
+    def _decode(self, messages: t.List[t.Tuple[bytes, t.Dict[bytes, bytes]]]) -> t.List[Event]:
+        events = []
+        for event_id, fields in messages:
+            event_id = event_id.decode() if isinstance(event_id, bytes) else event_id
+            try:
+                events.append((event_id, pickle.loads(fields[b"event"])))  # noqa
+            except (KeyError, TypeError, pickle.UnpicklingError):
+                log.bind(id=event_id).error("Discarding malformed webhook event")
+                self.ack(event_id)
+        return events
+
+    def read(self, count: int) -> t.List[Event]:
+        """Get up to `count` events, preferring events abandoned by other workers."""
+        _, claimed, *_ = self._redis.xautoclaim(
+            self.stream, GROUP, self.consumer, min_idle_time=CLAIM_IDLE, count=count
+        )
+        if claimed:
+            return self._decode(claimed)
+
+        response = self._redis.xreadgroup(
+            GROUP, self.consumer, {self.stream: ">"}, count=count, block=READ_BLOCK
+        )
+        if not response:
+            return []
+        _, messages = response[0]
+        return self._decode(messages)
+
+    def claim(self, *event_ids: str) -> None:
+        """Reset the idle time of in-flight events, so they aren't claimed by another worker."""
+        if event_ids:
+            self._redis.xclaim(
+                self.stream,
+                GROUP,
+                self.consumer,
+                min_idle_time=0,
+                message_ids=list(event_ids),
+                justid=True,
+            )
+
+    def ack(self, *event_ids: str) -> None:
+        """Acknowledge & remove delivered events."""
+        if event_ids:
+            with self._redis.pipeline() as pipeline:
+                pipeline.xack(self.stream, GROUP, *event_ids)
+                pipeline.xdel(self.stream, *event_ids)
+                pipeline.execute()
+
+    def status(self) -> t.Dict[str, t.Any]:
+        """Get the number of queued & in-flight events, and the age of the oldest event."""
+        with self._redis.pipeline() as pipeline:
+            pipeline.xlen(self.stream)
+            pipeline.xpending(self.stream, GROUP)
+            pipeline.xrange(self.stream, count=1)
+            length, pending, oldest = pipeline.execute()
+        lag = 0.0
+        if oldest:
+            oldest_id = oldest[0][0]
+            oldest_id = oldest_id.decode() if isinstance(oldest_id, bytes) else oldest_id
+            lag = max(time.time() - _event_time(oldest_id), 0.0)
+        return {"length": length, "pending": pending["pending"], "lag": round(lag, 3)}
+
+
+async def network_info(config: "Http", *hosts: str) -> bgptools.TargetData:
+    """Get network information for event sources, preferring the local IP-to-ASN table."""
+    data = {}
+    if config.network_file is not None:
+        data = await ip2asn.network_info(*hosts, path=config.network_file)
+    missing = [host for host in hosts if host not in data]
+    if missing:
+        data.update(await bgptools.network_info(*missing))
+    return data
+
+
+class WebhookWorker:
+    """Deliver queued webhook events with a persistent client."""
+
+    def __init__(self, config: "Http") -> None:
+        """Set up the queue and webhook client for the configured provider."""
+        self.config = config
+        self.queue = WebhookQueue()
+        self.hook: "BaseExternal" = Webhook(config)
+        self._task: t.Optional[asyncio.Task] = None
+
+    async def _deliver(self, queries: t.List[t.Dict[str, t.Any]]) -> None:
+        if isinstance(self.hook, GenericHook):
+            # Generic endpoints receive a JSON array of events.
+            await self.hook.send_many(queries)
+        else:
+            for query in queries:
+                await self.hook.send(query)
+
+    async def _deliver_with_retry(self, events: t.List[Event]) -> None:
+        """Deliver events, retrying with exponential backoff, and acknowledge them."""
+        pending = list(events)
+        for attempt in range(self.config.retries + 1):
+            if attempt > 0:
+                await asyncio.sleep(min(2 ** (attempt - 1), MAX_BACKOFF))
+            if isinstance(self.hook, GenericHook):
+                batches = [pending]
+            else:
+                # Providers without batch support are retried per event, so delivered events
+                # aren't sent again.
+                batches = [[event] for event in pending]
+            failed = []
+            for idx, batch in enumerate(batches):
+                # Events are only acknowledged once delivered, so undelivered events are claimed
+                # again before each delivery to keep other workers from taking them.
+                undelivered = [*failed, *(event for b in batches[idx:] for event in b)]
+                await asyncio.to_thread(
+                    self.queue.claim, *(event_id for event_id, _ in undelivered)
+                )
+                try:
+                    await self._deliver([query for _, query in batch])
+                    await asyncio.to_thread(self.queue.ack, *(event_id for event_id, _ in batch))
+                except Exception as err:
+                    log.bind(
+                        destination=self.config.provider,
+                        attempt=attempt + 1,
+                        count=len(batch),
+                        error=str(err),
+                    ).warning("Failed to send webhook")
+                    failed.extend(batch)
+            if not failed:
+                return
+            pending = failed
+
+        log.bind(destination=self.config.provider, count=len(pending)).error(
+            "Dropping webhook events after {} retries", self.config.retries
+        )
+        await asyncio.to_thread(self.queue.ack, *(event_id for event_id, _ in pending))
+
+    async def process(self, events: t.List[Event]) -> None:
+        """Add network information to a batch of events and deliver them."""
+        hosts = list(dict.fromkeys(event["source"] for _, event in events))
+        try:
+            networks = await network_info(self.config, *hosts)
+        except Exception as err:
+            log.bind(error=str(err)).error("Failed to get webhook source network information")
+            networks = {}
+        for _, event in events:
+            event["network"] = networks.get(event["source"], {})
+
+        lag = time.time() - _event_time(events[0][0])
+        log.bind(count=len(events), lag=round(lag, 3)).debug("Delivering webhook events")
+        if lag > LAG_WARNING:
+            status = await asyncio.to_thread(self.queue.status)
+            log.bind(**status).warning("Webhook queue is lagging")
+
+        await self._deliver_with_retry(events)
+
+    async def run(self) -> None:
+        """Deliver events until cancelled."""
+        await asyncio.to_thread(self.queue.create_group)
+        log.bind(consumer=self.queue.consumer).debug("Started webhook worker")
+        while True:
+            try:
+                events = await asyncio.to_thread(self.queue.read, self.config.batch_size)
+                if events:
+                    await self.process(events)
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                log.bind(error=str(err)).error("Webhook worker error")
+                await asyncio.sleep(1)
+
+    def start(self) -> None:
+        """Run the worker in the background."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the worker."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -1,10 +1,16 @@
 """Logging instance setup & configuration."""
 
 # Standard Library
+import os
 import sys
+import queue
+import fcntl
+import random
 import typing as t
 import logging
+import threading
 from datetime import datetime
+from contextvars import ContextVar
 
 # Third Party
 from loguru import logger as _loguru_logger
@@ -46,6 +52,23 @@ _LOG_LEVELS = [
     {"name": "CRITICAL", "color": "<r>"},
 ]
 
+# Maximum number of records waiting to be written by each file & syslog sink. Further records
+# are dropped & counted until the sink catches up.
+_SINK_QUEUE_SIZE = 10000
+
+# Maximum number of records written by each file & syslog sink at once.
+_SINK_BATCH_SIZE = 500
+
+# File & syslog sinks added in this process, by destination.
+_SINKS: t.Dict[str, int] = {}
+
+# Minimum level of each sink, by Loguru sink ID. Loguru's default stderr sink (ID 0) emits debug
+# records until it's removed.
+_SINK_LEVELS: t.Dict[int, int] = {0: logging.DEBUG}
+
+# Written records: (level name, formatted record).
+LogBatch = t.List[t.Tuple[str, str]]
+
 _EXCLUDE_MODULES = (
     "PIL",
     "svglib",
@@ -72,6 +95,80 @@ HyperglassConsole = Console(
 
 log = _loguru_logger
 
+# Whether debug records are emitted for the current query. Set per query by `sample_debug()`.
+_DEBUG_SAMPLED: ContextVar[bool] = ContextVar("debug_sampled", default=True)
+
+
+class Lazy:
+    """Log value that is only computed if a record containing it is emitted.
+
+    Example: `log.bind(response=Lazy(repr, table)).debug("Serialized response")` only calls
+    `repr(table)` if debug records are emitted.
+    """
+
+    __slots__ = ("_func", "_args", "_value")
+
+    def __init__(self, func: t.Callable[..., t.Any], *args: t.Any) -> None:
+        """Store the function & arguments that compute the value."""
+        self._func = func
+        self._args = args
+        self._value = None
+
+    @property
+    def value(self) -> t.Any:
+        """Compute the value once, when it's first used."""
+        if self._func is not None:
+            self._value = self._func(*self._args)
+            self._func = None
+            self._args = ()
+        return self._value
+
+    def __str__(self) -> str:
+        """Format the computed value."""
+        return str(self.value)
+
+    def __repr__(self) -> str:
+        """Format the computed value."""
+        return repr(self.value)
+
+    def __reduce__(self) -> t.Tuple[t.Callable[[t.Any], t.Any], t.Tuple[t.Any]]:
+        """Send the computed value to enqueued sinks, which pickle records."""
+        return (_computed, (self.value,))
+
+
+def _computed(value: t.Any) -> t.Any:
+    return value
+
+
+def debug_enabled() -> bool:
+    """Determine if debug records are emitted for the current query.
+
+    Use this to skip building debug log payloads that can't be deferred with `Lazy`.
+    """
+    min_level = min(_SINK_LEVELS.values(), default=logging.CRITICAL + 1)
+    return min_level <= logging.DEBUG and _DEBUG_SAMPLED.get()
+
+
+def add_log_sink(sink: t.Any, *, level: t.Union[str, int], **kwargs: t.Any) -> int:
+    """Add a Loguru sink & track its minimum level, which Loguru doesn't expose publicly."""
+    sink_id = _loguru_logger.add(sink=sink, level=level, **kwargs)
+    _SINK_LEVELS[sink_id] = level if isinstance(level, int) else _loguru_logger.level(level).no
+    return sink_id
+
+
+def remove_log_sinks() -> None:
+    """Remove all Loguru sinks."""
+    _loguru_logger.remove()
+    _SINK_LEVELS.clear()
+    _SINKS.clear()
+
+
+def sample_debug(rate: float) -> bool:
+    """Decide whether debug records are emitted for the current query, at a sampling rate."""
+    sampled = rate >= 1 or random.random() < rate  # noqa: S311 (Not used for security)
+    _DEBUG_SAMPLED.set(sampled)
+    return sampled
+
 
 def formatter(record: "Record") -> str:
     """Format log messages with extra data as kwargs string."""
@@ -81,6 +178,16 @@ def formatter(record: "Record") -> str:
     return " ".join((msg, extra_str))
 
 
+def filter_sampled(record: "Record") -> bool:
+    """Drop debug records of queries that weren't sampled."""
+    return record["level"].no > logging.DEBUG or _DEBUG_SAMPLED.get()
+
+
+def filter_records(record: "Record") -> bool:
+    """Drop noisy uvicorn messages & debug records of queries that weren't sampled."""
+    return filter_sampled(record) and filter_uvicorn_values(record)
+
+
 def filter_uvicorn_values(record: "Record") -> bool:
     """Drop noisy uvicorn messages."""
     drop = (
@@ -122,6 +229,169 @@ class LibInterceptHandler(logging.Handler):
         _loguru_logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
 
 
+class QueueSink:
+    """Sink that hands records to a background thread, which writes them in batches.
+
+    Logging only adds a record to a bounded queue, so a slow destination never blocks the caller.
+    If the queue is full, records are dropped, and the number of dropped records is written to
+    the destination once it catches up.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        writer: t.Callable[[LogBatch], None],
+        *,
+        name: str,
+        close: t.Optional[t.Callable[[], None]] = None,
+        max_size: int = _SINK_QUEUE_SIZE,
+        batch_size: int = _SINK_BATCH_SIZE,
+        report_dropped: bool = True,
+    ) -> None:
+        """Start the writer thread."""
+        self.name = name
+        self.dropped = 0
+        self._reported = 0
+        self._report_dropped = report_dropped
+        self._writer = writer
+        self._close = close
+        self._batch_size = batch_size
+        self._max_size = max_size
+        self._start()
+        # Threads don't survive a fork, so a forked process starts its own.
+        os.register_at_fork(after_in_child=self._start)
+
+    def _start(self) -> None:
+        self._queue: queue.Queue = queue.Queue(self._max_size)
+        self._thread = threading.Thread(target=self._run, name=f"log-{self.name}", daemon=True)
+        self._thread.start()
+
+    def write(self, message: str) -> None:
+        """Queue a formatted record, or drop it if the queue is full."""
+        record = getattr(message, "record", None)
+        level = record["level"].name if record is not None else "INFO"
+        try:
+            self._queue.put_nowait((level, str(message)))
+        except queue.Full:
+            self.dropped += 1
+
+    def _batch(self) -> t.Tuple[LogBatch, bool]:
+        """Wait for a record, then take any others already queued, up to the batch size."""
+        batch, stop = [], False
+        item = self._queue.get()
+        while True:
+            if item is self._STOP:
+                stop = True
+            else:
+                batch.append(item)
+            if stop or len(batch) >= self._batch_size:
+                break
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+        return batch, stop
+
+    def _run(self) -> None:
+        while True:
+            batch, stop = self._batch()
+            dropped = self.dropped
+            if self._report_dropped and dropped > self._reported:
+                message = f"{dropped - self._reported} log records dropped, the queue was full\n"
+                batch.append(("WARNING", message))
+                self._reported = dropped
+            if batch:
+                try:
+                    self._writer(batch)
+                except Exception as err:
+                    # The sink can't log its own errors without risking a loop.
+                    sys.stderr.write(f"Failed to write to {self.name} log: {err!s}\n")
+            if stop:
+                return
+
+    def stop(self) -> None:
+        """Write queued records & stop the writer thread."""
+        self._queue.put(self._STOP)
+        self._thread.join(timeout=5)
+        if self._close is not None:
+            self._close()
+
+
+class RotatingFileWriter:
+    """Append records to a file shared by multiple processes, rotating it by size.
+
+    Each batch is appended with a single write. The process that first sees the file reach
+    `max_size` renames it while holding a lock, and other processes reopen the file when they see
+    that it was replaced.
+    """
+
+    def __init__(self, path: "Path", *, max_size: int) -> None:
+        """Open the log file."""
+        self.path = path
+        self.max_size = max_size
+        self._lock_path = path.with_name(f".{path.name}.lock")
+        self._file = self.path.open("a", encoding="utf8")
+
+    def _replaced(self) -> bool:
+        """Determine if another process rotated the file since it was opened."""
+        try:
+            return os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino
+        except FileNotFoundError:
+            return True
+
+    def _reopen(self) -> None:
+        self._file.close()
+        self._file = self.path.open("a", encoding="utf8")
+
+    def _rotate(self) -> None:
+        with self._lock_path.open("a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                # Another process may have rotated the file while this one waited for the lock.
+                if not self._replaced():
+                    stamp = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
+                    name, _, suffix = self.path.name.partition(".")
+                    self.path.rename(self.path.with_name(f"{name}.{stamp}.{suffix}"))
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        self._reopen()
+
+    def __call__(self, batch: LogBatch) -> None:
+        """Append a batch of records."""
+        if self._replaced():
+            self._reopen()
+        self._file.write("".join(text for _, text in batch))
+        self._file.flush()
+        if os.fstat(self._file.fileno()).st_size >= self.max_size:
+            self._rotate()
+
+    def close(self) -> None:
+        """Close the log file."""
+        self._file.close()
+
+
+class SyslogWriter:
+    """Send records to a syslog server."""
+
+    def __init__(self, host: str, port: int) -> None:
+        """Create the syslog handler."""
+        # Standard Library
+        from logging.handlers import SysLogHandler
+
+        self.handler = SysLogHandler(address=(host, port))
+
+    def __call__(self, batch: LogBatch) -> None:
+        """Send a batch of records."""
+        for level, text in batch:
+            record = logging.makeLogRecord({"msg": text.rstrip("\n"), "levelname": level})
+            self.handler.emit(record)
+
+    def close(self) -> None:
+        """Close the syslog handler."""
+        self.handler.close()
+
+
 def init_logger(level: t.Union[int, str] = logging.INFO):
     """Initialize hyperglass logging instance."""
 
@@ -129,13 +399,13 @@ def init_logger(level: t.Union[int, str] = logging.INFO):
         logging.getLogger(mod).propagate = False
 
     # Reset built-in Loguru configurations.
-    _loguru_logger.remove()
+    remove_log_sinks()
 
     if sys.stdout.isatty():
         # Use Rich for logging if hyperglass started from a TTY.
 
-        _loguru_logger.add(
-            sink=RichHandler(
+        add_log_sink(
+            RichHandler(
                 console=HyperglassConsole,
                 rich_tracebacks=True,
                 tracebacks_show_locals=level == logging.DEBUG,
@@ -144,18 +414,18 @@ def init_logger(level: t.Union[int, str] = logging.INFO):
             format=formatter,
             colorize=False,
             level=level,
-            filter=filter_uvicorn_values,
+            filter=filter_records,
             enqueue=True,
         )
     else:
         # Otherwise, use regular format.
-        _loguru_logger.add(
-            sink=sys.stdout,
+        add_log_sink(
+            sys.stdout,
             enqueue=True,
             format=_FMT if level == logging.INFO else _FMT_DEBUG,
             level=level,
             colorize=False,
-            filter=filter_uvicorn_values,
+            filter=filter_records,
         )
 
     _loguru_logger.configure(levels=_LOG_LEVELS)
@@ -169,8 +439,13 @@ def enable_file_logging(
     log_format: "LogFormat",
     max_size: "ByteSize",
     level: t.Union[str, int],
+    header: bool = True,
 ) -> None:
-    """Set up file-based logging from configuration parameters."""
+    """Set up file-based logging from configuration parameters, once per process.
+
+    Records are written by a background thread, and the file is shared & rotated safely by all
+    processes logging to it.
+    """
 
     if log_format == "json":
         log_file_name = "hyperglass.log.json"
@@ -181,7 +456,10 @@ def enable_file_logging(
 
     log_file = directory / log_file_name
 
-    if log_format == "text":
+    if f"file:{log_file!s}" in _SINKS:
+        return
+
+    if header and log_format == "text":
         now_str = datetime.utcnow().strftime("%B %d, %Y beginning at %H:%M:%S UTC")
         header_lines = (
             f"# {line}"
@@ -196,29 +474,35 @@ def enable_file_logging(
         with log_file.open("a+") as lf:
             lf.write(header)
 
-    _loguru_logger.add(
-        enqueue=True,
-        sink=log_file,
+    writer = RotatingFileWriter(log_file, max_size=int(max_size))
+    _SINKS[f"file:{log_file!s}"] = add_log_sink(
+        QueueSink(writer, name="file", close=writer.close),
         format=_FMT_FILE,
         serialize=structured,
         level=level,
-        encoding="utf8",
         colorize=False,
-        rotation=max_size.human_readable(),
+        filter=filter_sampled,
     )
     _loguru_logger.bind(path=log_file).debug("Logging to file")
 
 
-def enable_syslog_logging(*, host: str, port: int) -> None:
-    """Set up syslog logging from configuration parameters."""
+def enable_syslog_logging(
+    *, host: str, port: int, level: t.Union[str, int] = logging.DEBUG
+) -> None:
+    """Set up syslog logging from configuration parameters, once per process.
 
-    # Standard Library
-    from logging.handlers import SysLogHandler
+    Records are sent by a background thread.
+    """
 
-    _loguru_logger.add(
-        SysLogHandler(address=(str(host), port)),
+    if f"syslog:{host!s}:{port!s}" in _SINKS:
+        return
+
+    writer = SyslogWriter(str(host), port)
+    _SINKS[f"syslog:{host!s}:{port!s}"] = add_log_sink(
+        QueueSink(writer, name="syslog", close=writer.close),
         format=_FMT_BASIC,
-        enqueue=True,
         colorize=False,
+        level=level,
+        filter=filter_sampled,
     )
     _loguru_logger.bind(host=host, port=port).debug("Logging to syslog target")
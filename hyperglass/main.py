@@ -1,7 +1,9 @@
 """Start hyperglass."""
 
 # Standard Library
+import os
 import sys
+import shutil
 import typing as t
 import asyncio
 import logging
@@ -126,8 +128,22 @@ def start(*, log_level: t.Union[str, int], workers: int) -> None:
     )
 
 
+def init_metrics() -> None:
+    """Create an empty metrics directory shared by all worker processes.
+
+    `prometheus_client` reads the directory from the environment when it's imported, so this must
+    run before anything imports `hyperglass.metrics`.
+    """
+    directory = Settings.app_path / ".metrics"
+    shutil.rmtree(directory, ignore_errors=True)
+    directory.mkdir(parents=True)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(directory)
+
+
 def run(workers: int = None):
     """Run hyperglass."""
+    init_metrics()
+
     # Local
     from .configuration import init_user_config
 
@@ -150,6 +166,7 @@ def run(workers: int = None):
             enable_syslog_logging(
                 host=state.params.logging.syslog.host,
                 port=state.params.logging.syslog.port,
+                level=LOG_LEVEL,
             )
         _workers = workers
 
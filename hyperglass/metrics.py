@@ -0,0 +1,104 @@
+"""Prometheus metrics for the query pipeline.
+
+When hyperglass is started, `PROMETHEUS_MULTIPROC_DIR` is set to a directory shared by all worker
+processes, so the metrics exported by any worker include every worker's measurements. Otherwise,
+e.g. when the API is run in-process by tests or the load test harness, only the current process's
+metrics are exported.
+"""
+
+# Standard Library
+import os
+import time
+import typing as t
+from contextlib import contextmanager
+
+# Third Party
+from prometheus_client import (
+    REGISTRY,
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Histogram,
+    CollectorRegistry,
+    multiprocess,
+    generate_latest,
+)
+
+MULTIPROCESS_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# Query durations, in seconds, which include device response time.
+QUERY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 90.0)
+
+# Plugin & parsing durations, in seconds.
+PROCESSING_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+REQUESTS = Counter(
+    "hyperglass_requests",
+    "Query requests by directive, device & result.",
+    ("directive", "device", "status"),
+)
+REQUEST_DURATION = Histogram(
+    "hyperglass_request_duration_seconds",
+    "Query request duration by directive & device.",
+    ("directive", "device"),
+    buckets=QUERY_BUCKETS,
+)
+CACHE_OPERATIONS = Counter(
+    "hyperglass_cache_operations",
+    "Query response cache hits, misses & expiration updates.",
+    ("operation",),
+)
+DEVICE_DURATION = Histogram(
+    "hyperglass_device_duration_seconds",
+    "Device connection, command & output parsing duration by device.",
+    ("device", "stage"),
+    buckets=QUERY_BUCKETS,
+)
+PLUGIN_DURATION = Histogram(
+    "hyperglass_plugin_duration_seconds",
+    "Input & output plugin duration by plugin.",
+    ("plugin", "type"),
+    buckets=PROCESSING_BUCKETS,
+)
+ERRORS = Counter(
+    "hyperglass_errors",
+    "Errors handled by the API, by exception class.",
+    ("error",),
+)
+
+
+@contextmanager
+def timer(histogram: Histogram, **labels: str) -> t.Generator[None, None, None]:
+    """Observe the duration of a block, whether or not it raises an exception."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def track_request(*, directive: str, device: str) -> t.Generator[None, None, None]:
+    """Count a query request by result & observe its duration."""
+    status = "success"
+    try:
+        with timer(REQUEST_DURATION, directive=directive, device=device):
+            yield
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        REQUESTS.labels(directive=directive, device=device, status=status).inc()
+
+
+def count_error(error: BaseException) -> None:
+    """Count an error by its exception class."""
+    ERRORS.labels(error=error.__class__.__name__).inc()
+
+
+def export() -> t.Tuple[bytes, str]:
+    """Get metrics in the Prometheus text format, and the format's content type."""
+    registry = REGISTRY
+    if MULTIPROCESS_ENV in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -10,14 +10,17 @@ from datetime import datetime
 from pydantic import Field, BaseModel, ConfigDict, field_validator
 
 # Project
-from hyperglass.log import log
+from hyperglass.log import Lazy, log, sample_debug
 from hyperglass.util import snake_to_camel, repr_from_attrs
 from hyperglass.state import use_state
+from hyperglass.tracing import Trace
+from hyperglass.settings import Settings
 from hyperglass.plugins import InputPluginManager
 from hyperglass.exceptions.public import InputInvalid, QueryTypeNotFound, QueryLocationNotFound
 from hyperglass.exceptions.private import InputValidationError
 
 # Local
+from ..directive import RuleMatch
 from ..config.devices import Device
 
 
@@ -46,29 +49,37 @@ class Query(BaseModel):
     # Directive `id` field
     query_type: str = Field(strict=True, min_length=1, strip_whitespace=True)
     _kwargs: t.Dict[str, t.Any]
+    _validation: RuleMatch
+    _trace: Trace
 
     def __init__(self, **data) -> None:
         """Initialize the query with a UTC timestamp at initialization time."""
+        # Decide whether this query's debug records are emitted before any are logged.
+        sample_debug(Settings.debug_sample_rate)
         super().__init__(**data)
+        self._trace = Trace()
         self._kwargs = data
         self.timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
 
         state = use_state()
         self._state = state
 
-        query_directives = self.device.directives.matching(self.query_type)
+        # Devices are read from the process-wide state once per query, rather than on each
+        # access, and directives are looked up by ID from the device's index.
+        self._device = use_state("devices")[self.query_location]
+        self.directive = self.device.directives.get(self.query_type)
 
-        if len(query_directives) < 1:
+        if self.directive is None:
             raise QueryTypeNotFound(query_type=self.query_type)
 
-        self.directive = query_directives[0]
-
         self._input_plugin_manager = InputPluginManager()
 
-        self.query_target = self.transform_query_target()
+        with self._trace.span("transform"):
+            self.query_target = self.transform_query_target()
 
         try:
-            self.validate_query_target()
+            with self._trace.span("validate"):
+                self.validate_query_target()
         except InputValidationError as err:
             raise InputInvalid(**err.kwargs) from err
 
@@ -101,10 +112,10 @@ class Query(BaseModel):
     def validate_query_target(self) -> None:
         """Validate a query target after all fields/relationships have been initialized."""
         # Run config/rule-based validations.
-        self.directive.validate_target(self.query_target)
+        self._validation = self.directive.validate_target(self.query_target)
         # Run plugin-based validations.
         self._input_plugin_manager.validate(query=self)
-        log.bind(query=self.summary()).debug("Validation passed")
+        log.bind(query=Lazy(self.summary)).debug("Validation passed")
 
     def transform_query_target(self) -> t.Union[t.List[str], str]:
         """Transform a query target based on defined plugins."""
@@ -117,7 +128,17 @@ class Query(BaseModel):
     @property
     def device(self) -> Device:
         """Get this query's device object by query_location."""
-        return self._state.devices[self.query_location]
+        return self._device
+
+    @property
+    def validation(self) -> RuleMatch:
+        """Get the rules matched by this query's target."""
+        return self._validation
+
+    @property
+    def trace(self) -> Trace:
+        """Get the spans recorded while handling this query."""
+        return self._trace
 
     @field_validator("query_location")
     def validate_query_location(cls, value):
@@ -134,7 +155,7 @@ class Query(BaseModel):
     def validate_query_type(cls, value: t.Any):
         """Ensure a requested query type exists."""
         devices = use_state("devices")
-        if any((device.has_directives(value) for device in devices)):
+        if devices.has_directives(value):
             return value
 
         raise QueryTypeNotFound(query_type=value)
@@ -48,6 +48,18 @@ schema_query_runtime = {
     "example": 6,
 }
 
+schema_query_timing = {
+    "title": "Timing",
+    "description": "Time spent in each stage of the request, and in total, in milliseconds. Stages may overlap.",
+    "example": {
+        "validate": 0.412,
+        "cache": 1.05,
+        "collect": 1830.2,
+        "parse": 12.7,
+        "total": 1846.9,
+    },
+}
+
 schema_query_keywords = {
     "title": "Keywords",
     "description": "Relevant keyword values contained in the `output` field, which can be used for formatting.",
@@ -149,6 +161,7 @@ class QueryResponse(BaseModel):
     keywords: t.List[str] = Field([], json_schema_extra=schema_query_keywords)
     timestamp: str = Field(json_schema_extra=schema_query_timestamp)
     format: ResponseFormat = Field("text/plain", json_schema_extra=schema_query_format)
+    timing: t.Dict[str, float] = Field({}, json_schema_extra=schema_query_timing)
 
 
 class RoutersResponse(BaseModel):
@@ -5,8 +5,22 @@
 from ..main import HyperglassModel
 
 
-class Cache(HyperglassModel):
+class ExternalCache(HyperglassModel):
+    """Cache parameters for external data, such as RPKI states & bgp.tools network info."""
+
+    timeout: int = 86400
+    negative_timeout: int = 60
+    max_entries: int = 100000
+
+
+class CachePublic(HyperglassModel):
     """Public cache parameters."""
 
     timeout: int = 120
     show_text: bool = True
+
+
+class Cache(CachePublic):
+    """Cache parameters."""
+
+    external: ExternalCache = ExternalCache()
@@ -7,12 +7,12 @@ from pathlib import Path
 from ipaddress import IPv4Address, IPv6Address
 
 # Third Party
-from pydantic import FilePath, ValidationInfo, field_validator
+from pydantic import FilePath, PrivateAttr, ValidationInfo, field_validator
 from netmiko.ssh_dispatcher import CLASS_MAPPER  # type: ignore
 
 # Project
 from hyperglass.log import log
-from hyperglass.util import get_driver, get_fmt_keys, resolve_hostname
+from hyperglass.util import get_driver, resolve_hostname
 from hyperglass.state import use_state
 from hyperglass.settings import Settings
 from hyperglass.constants import (
@@ -28,7 +28,7 @@ from ..main import MultiModel, HyperglassModel, HyperglassModelWithId
 from ..util import check_legacy_fields
 from .proxy import Proxy
 from ..fields import SupportedDriver
-from ..directive import Directives
+from ..directive import Directives, CommandTemplate
 from .credential import Credential
 from .http_client import HttpConfiguration
 
@@ -52,6 +52,7 @@ class DirectiveOptions(HyperglassModel, extra="ignore"):
 class Device(HyperglassModelWithId, extra="allow"):
     """Validation model for per-router config in devices.yaml."""
 
+    _commands: t.Dict[str, t.Tuple[t.Tuple[CommandTemplate, ...], ...]] = PrivateAttr({})
     id: str
     name: str
     description: t.Optional[str] = None
@@ -76,7 +77,7 @@ class Device(HyperglassModelWithId, extra="allow"):
         if "id" not in kw:
             kw = self._with_id(kw)
         super().__init__(**kw)
-        self._validate_directive_attrs()
+        self._compile_commands()
 
     @property
     def _target(self):
@@ -130,10 +131,7 @@ class Device(HyperglassModelWithId, extra="allow"):
 
     def has_directives(self, *directive_ids: str) -> bool:
         """Determine if a directive is used on this device."""
-        for directive_id in directive_ids:
-            if directive_id in self.directive_ids:
-                return True
-        return False
+        return any(directive_id in self.directives for directive_id in directive_ids)
 
     def get_device_type(self) -> str:
         """Get the `device_type` field for use by Netmiko.
@@ -148,25 +146,33 @@ class Device(HyperglassModelWithId, extra="allow"):
             return "linux_ssh"
         return self.platform
 
-    def _validate_directive_attrs(self) -> None:
-        # Set of all keys except for built-in key `target`.
-        keys = {
-            key
-            for group in [get_fmt_keys(command) for command in self.directive_commands]
-            for key in group
-            if key != "target"
-        }
-
-        attrs = {k: v for k, v in self.attrs.items() if k in keys}
-
-        # Verify all keys in associated commands contain values in device's `attrs`.
-        for key in keys:
-            if key not in attrs:
+    def command_templates(
+        self, directive_id: str, indexes: t.Sequence[int]
+    ) -> t.Tuple[CommandTemplate, ...]:
+        """Get the command templates of a directive's rules, by rule position."""
+        rules = self._commands[directive_id]
+        return tuple(template for index in indexes for template in rules[index])
+
+    def _compile_commands(self) -> None:
+        """Substitute the device's attributes in each directive's rule commands."""
+        commands = {}
+        for directive in self.directives:
+            # Directives are looked up by ID, where the first directive with an ID is used.
+            if directive.id in commands:
+                continue
+            try:
+                commands[directive.id] = tuple(
+                    tuple(CommandTemplate(command, self.attrs) for command in rule.commands)
+                    for rule in directive.rules
+                )
+            except KeyError as err:
+                # Verify all keys in associated commands contain values in device's `attrs`.
                 raise ConfigError(
                     "Device '{d}' has a command that references attribute '{a}', but '{a}' is missing from device attributes",
                     d=self.name,
-                    a=key,
-                )
+                    a=err.args[0],
+                ) from err
+        self._commands = commands
 
     @field_validator("address")
     def validate_address(
@@ -309,21 +315,33 @@ class Device(HyperglassModelWithId, extra="allow"):
 class Devices(MultiModel, model=Device, unique_by="id"):
     """Container for all devices."""
 
+    _names: t.FrozenSet[str] = PrivateAttr(frozenset())
+    _directive_ids: t.FrozenSet[str] = PrivateAttr(frozenset())
+
     def __init__(self: "Devices", *items: t.Dict[str, t.Any]) -> None:
         """Generate IDs prior to validation."""
         with_id = (Device._with_id(item) for item in items)
         super().__init__(*with_id)
 
+    def _build_index(self: "Devices") -> None:
+        """Index devices by ID, and collect all device names & directive IDs."""
+        super()._build_index()
+        self._names = frozenset(device.name for device in self)
+        self._directive_ids = frozenset(
+            directive.id for device in self for directive in device.directives
+        )
+
     def export_api(self: "Devices") -> t.List[APIDevice]:
         """Export API-facing device fields."""
         return [d.export_api() for d in self]
 
     def valid_id_or_name(self: "Devices", value: str) -> bool:
         """Determine if a value is a valid device name or ID."""
-        for device in self:
-            if value == device.id or value == device.name:
-                return True
-        return False
+        return value in self._index or value in self._names
+
+    def has_directives(self: "Devices", *directive_ids: str) -> bool:
+        """Determine if a directive is used on any device."""
+        return any(directive_id in self._directive_ids for directive_id in directive_ids)
 
     def directive_plugins(self: "Devices") -> t.Dict[Path, t.Tuple[str]]:
         """Get a mapping of plugin paths to associated directive IDs."""
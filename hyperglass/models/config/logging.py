@@ -5,7 +5,7 @@ import typing as t
 from pathlib import Path
 
 # Third Party
-from pydantic import ByteSize, SecretStr, AnyHttpUrl, DirectoryPath, field_validator
+from pydantic import FilePath, ByteSize, SecretStr, AnyHttpUrl, DirectoryPath, field_validator
 
 # Project
 from hyperglass.constants import __version__
@@ -51,6 +51,10 @@ class Http(HyperglassModel, extra="allow"):
     params: t.Dict[str, t.Union[str, int, bool, None]] = {}
     verify_ssl: bool = True
     timeout: t.Union[float, int] = 5.0
+    network_file: t.Optional[FilePath] = None
+    batch_size: int = 50
+    retries: int = 5
+    queue_size: int = 10000
 
     @field_validator("headers", "params")
     def stringify_headers_params(cls, value):
@@ -84,5 +88,6 @@ class Logging(HyperglassModel):
     directory: DirectoryPath = Path("/tmp")  # noqa: S108
     format: LogFormat = "text"
     max_size: ByteSize = "50MB"
+    traces: bool = False
     syslog: t.Optional[Syslog] = None
     http: t.Optional[Http] = None
@@ -19,6 +19,7 @@ from ..main import HyperglassModel
 from .cache import Cache
 from .logging import Logging
 from .messages import Messages
+from .profiling import Profiling
 from .structured import Structured
 
 Localhost = t.Literal["localhost"]
@@ -87,6 +88,7 @@ class Params(ParamsPublic, HyperglassModel):
     docs: Docs = Docs()
     logging: Logging = Logging()
     messages: Messages = Messages()
+    profiling: Profiling = Profiling()
     structured: Structured = Structured()
     web: Web = Web()
 
@@ -0,0 +1,28 @@
+"""Validation model for query profiling config."""
+
+# Standard Library
+import typing as t
+
+# Third Party
+from pydantic import Field, SecretStr, model_validator
+
+# Local
+from ..main import HyperglassModel
+
+
+class Profiling(HyperglassModel):
+    """Validation model for query profiling configuration."""
+
+    enable: bool = False
+    key: t.Optional[SecretStr] = None
+    sample_rate: float = Field(0.0, ge=0, le=1)
+    interval: float = Field(0.005, gt=0, le=1)
+    timeout: int = 86400
+    max_profiles: int = Field(100, ge=1)
+
+    @model_validator(mode="after")
+    def validate_enable(self) -> "Profiling":
+        """Ensure profiling can be triggered if it's enabled."""
+        if self.enable and self.key is None and self.sample_rate == 0:
+            raise ValueError("Profiling is enabled, but neither 'key' nor 'sample_rate' is set")
+        return self
@@ -1,26 +1,102 @@
 """Structured data configuration variables."""
 
 # Standard Library
+import re
 import typing as t
 
+# Third Party
+from pydantic import FilePath, PrivateAttr, ValidationInfo, field_validator
+
 # Local
 from ..main import HyperglassModel
 
 StructuredCommunityMode = t.Literal["permit", "deny"]
-StructuredRPKIMode = t.Literal["router", "external"]
+StructuredRPKIMode = t.Literal["router", "external", "file"]
+
+# Inline flags apply to a whole expression, so patterns containing them can't be combined.
+GLOBAL_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")
 
 
 class StructuredCommunities(HyperglassModel):
     """Control structured data response for BGP communities."""
 
+    _exact: t.FrozenSet[str] = PrivateAttr(frozenset())
+    _patterns: t.Tuple[t.Pattern, ...] = PrivateAttr(())
     mode: StructuredCommunityMode = "deny"
     items: t.List[str] = []
 
+    @field_validator("items")
+    def validate_items(cls, value: t.List[str]) -> t.List[str]:
+        """Ensure all community patterns are valid regular expressions."""
+        for item in value:
+            try:
+                re.compile(item)
+            except re.error as err:
+                raise ValueError(f"Invalid community pattern '{item}': {err!s}") from err
+        return value
+
+    def __init__(self, **data: t.Any) -> None:
+        """Compile community patterns."""
+        super().__init__(**data)
+        self._compile()
+
+    def _compile(self) -> None:
+        """Compile community patterns into a single matcher.
+
+        Patterns without regular expression syntax match a community exactly and are looked up
+        in a set. The remaining patterns are combined into one regular expression, matched from
+        the start of the community.
+        """
+        exact, patterns = set(), []
+        for item in self.items:
+            if re.escape(item) == item:
+                exact.add(item)
+            else:
+                patterns.append(item)
+
+        if any(GLOBAL_FLAGS.search(p) for p in patterns):
+            compiled = tuple(re.compile(p) for p in patterns)
+        elif patterns:
+            compiled = (re.compile("|".join(f"(?:{p})" for p in patterns)),)
+        else:
+            compiled = ()
+
+        self._exact = frozenset(exact)
+        self._patterns = compiled
+
+    def matches(self, community: str) -> bool:
+        """Determine if a community matches any configured pattern."""
+        return community in self._exact or any(
+            p.match(community) is not None for p in self._patterns
+        )
+
+    def filter(self, communities: t.Iterable[str]) -> t.List[str]:
+        """Filter communities against configured policy.
+
+        Actions:
+            permit: only permit matches
+            deny: only deny matches
+        """
+        if len(self.items) == 0:
+            return [] if self.mode == "permit" else list(communities)
+        permit = self.mode == "permit"
+        return [c for c in communities if self.matches(c) is permit]
+
 
 class StructuredRpki(HyperglassModel):
     """Control structured data response for RPKI state."""
 
     mode: StructuredRPKIMode = "router"
+    vrp_file: t.Optional[FilePath] = None
+
+    @field_validator("vrp_file")
+    def validate_vrp_file(
+        cls, value: t.Optional[FilePath], info: ValidationInfo
+    ) -> t.Optional[FilePath]:
+        """Ensure a VRP file is set when file-based validation is enabled."""
+        if info.data.get("mode") == "file" and value is None:
+            raise ValueError("'vrp_file' is required when RPKI mode is 'file'")
+        return value
 
 
 class Structured(HyperglassModel):
@@ -28,3 +104,4 @@ class Structured(HyperglassModel):
 
     communities: StructuredCommunities = StructuredCommunities()
     rpki: StructuredRpki = StructuredRpki()
+    strict_parsing: bool = False
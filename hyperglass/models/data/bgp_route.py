@@ -1,26 +1,65 @@
 """Device-Agnostic Parsed Response Data Model."""
 
 # Standard Library
-import re
+import heapq
 import typing as t
 from ipaddress import ip_network
+from operator import attrgetter
 
 # Third Party
-from pydantic import field_validator, ValidationInfo
+from pydantic import PrivateAttr, ValidationInfo, field_validator
 
 # Project
 from hyperglass.state import use_state
-from hyperglass.external.rpki import rpki_state
+from hyperglass.external.vrp import vrp_states
+from hyperglass.external.rpki import RpkiTarget, rpki_states
 
 # Local
 from ..main import HyperglassModel
 
 WinningWeight = t.Literal["low", "high"]
 
+# (Address family, network address, prefix length)
+RouteSortKey = t.Tuple[int, int, int]
+
+# Routes with a prefix that isn't an IP network are sorted last.
+_INVALID_SORT_KEY: RouteSortKey = (255, 0, 0)
+
+_sort_key = attrgetter("sort_key")
+
+
+def route_sort_key(prefix: str) -> RouteSortKey:
+    """Get the numeric sort key for a route's prefix."""
+    try:
+        net = ip_network(prefix, strict=False)
+    except ValueError:
+        return _INVALID_SORT_KEY
+    return (net.version, int(net.network_address), net.prefixlen)
+
+
+def default_rpki_state(mode: str, state: int, as_path: t.Sequence[int], prefix: str) -> int:
+    """If external RPKI validation is enabled, get a default state for ineligible routes."""
+    if mode == "router":
+        # If router validation is enabled, return the value as-is.
+        return state
+
+    if len(as_path) == 0:
+        # If the AS_PATH length is 0, i.e. for an internal route,
+        # return RPKI Unknown state.
+        return 3
+
+    try:
+        ip_network(prefix)
+    except ValueError:
+        return 3
+
+    return state
+
 
 class BGPRoute(HyperglassModel):
     """Post-parsed BGP route."""
 
+    _sort_key: RouteSortKey = PrivateAttr(_INVALID_SORT_KEY)
     prefix: str
     active: bool
     age: int
@@ -35,72 +74,45 @@ class BGPRoute(HyperglassModel):
     peer_rid: str
     rpki_state: int
 
-    @field_validator("communities")
-    def validate_communities(cls, value):
-        """Filter returned communities against configured policy.
+    def __init__(self, **data: t.Any) -> None:
+        """Compute the route's sort key."""
+        super().__init__(**data)
+        self._sort_key = route_sort_key(self.prefix)
 
-        Actions:
-            permit: only permit matches
-            deny: only deny matches
-        """
-
-        (structured := use_state("params").structured)
-
-        def _permit(comm):
-            """Only allow matching patterns."""
-            valid = False
-            for pattern in structured.communities.items:
-                if re.match(pattern, comm):
-                    valid = True
-                    break
-            return valid
-
-        def _deny(comm):
-            """Allow any except matching patterns."""
-            valid = True
-            for pattern in structured.communities.items:
-                if re.match(pattern, comm):
-                    valid = False
-                    break
-            return valid
-
-        func_map = {"permit": _permit, "deny": _deny}
-        func = func_map[structured.communities.mode]
-
-        return [c for c in value if func(c)]
+    @property
+    def sort_key(self) -> RouteSortKey:
+        """Sort routes numerically by address family, network address & prefix length."""
+        return self._sort_key
 
     @field_validator("rpki_state")
     def validate_rpki_state(cls, value, info: ValidationInfo):
-        """If external RPKI validation is enabled, get validation state."""
-
-        (structured := use_state("params").structured)
+        """If external RPKI validation is enabled, set a default state for ineligible routes.
 
-        if structured.rpki.mode == "router":
-            # If router validation is enabled, return the value as-is.
-            return value
-
-        if structured.rpki.mode == "external":
-            # If external validation is enabled, validate the prefix
-            # & asn with Cloudflare's RPKI API.
-            as_path = info.data.get("as_path", [])
+        The external state itself is resolved for the whole table by `BGPRouteTable.validate_rpki`.
+        """
 
-            if len(as_path) == 0:
-                # If the AS_PATH length is 0, i.e. for an internal route,
-                # return RPKI Unknown state.
-                return 3
-            # Get last ASN in path
-            asn = as_path[-1]
+        (structured := use_state("params").structured)
 
+        return default_rpki_state(
+            structured.rpki.mode,
+            value,
+            info.data.get("as_path", []),
+            info.data.get("prefix", ""),
+        )
+
+    def rpki_target(self) -> t.Optional[RpkiTarget]:
+        """Get the prefix & origin ASN to validate externally, if this route is eligible."""
+        if len(self.as_path) == 0:
+            return None
         try:
-            net = ip_network(info.data["prefix"])
+            net = ip_network(self.prefix)
         except ValueError:
-            return 3
-
+            return None
         # Only do external RPKI lookups for global prefixes.
         if net.is_global:
-            return rpki_state(prefix=info.data["prefix"], asn=asn)
-
-        return value
+            # Get last ASN in path
+            return (self.prefix, self.as_path[-1])
+        return None
 
 
 class BGPRouteTable(HyperglassModel):
@@ -111,14 +123,100 @@ class BGPRouteTable(HyperglassModel):
     routes: t.List[BGPRoute]
     winning_weight: WinningWeight
 
-    def __init__(self, **kwargs):
+    @field_validator("routes", mode="before")
+    def validate_communities(cls, value: t.Any) -> t.Any:
+        """Filter each route's communities against configured policy in one pass over the table.
+
+        Routes that are already validated were filtered when their table was created.
+        """
+        if not isinstance(value, (list, tuple)):
+            return value
+
+        (communities := use_state("params").structured.communities)
+
+        routes = []
+        for route in value:
+            if isinstance(route, t.Mapping) and route.get("communities"):
+                route = {**route, "communities": communities.filter(route["communities"])}
+            routes.append(route)
+        return routes
+
+    @field_validator("routes")
+    def sort_routes(cls, value: t.List[BGPRoute]) -> t.List[BGPRoute]:
         """Sort routes by prefix after validation."""
-        super().__init__(**kwargs)
-        self.routes = sorted(self.routes, key=lambda r: r.prefix)
+        return sorted(value, key=_sort_key)
+
+    @classmethod
+    def from_parsed(
+        cls,
+        *,
+        vrf: str,
+        count: int,
+        routes: t.Iterable[t.Dict[str, t.Any]],
+        winning_weight: WinningWeight,
+    ) -> "BGPRouteTable":
+        """Create a table from route data already validated by a platform's parsing model.
+
+        Field types are not validated again; only community filtering, default RPKI states and
+        sorting are applied, which is equivalent to validating the table.
+        """
+        (structured := use_state("params").structured)
+
+        built = []
+        for data in routes:
+            data["communities"] = structured.communities.filter(data["communities"])
+            data["rpki_state"] = default_rpki_state(
+                structured.rpki.mode, data["rpki_state"], data["as_path"], data["prefix"]
+            )
+            route = BGPRoute.model_construct(**data)
+            route._sort_key = route_sort_key(route.prefix)
+            built.append(route)
+
+        built.sort(key=_sort_key)
+        return cls.model_construct(
+            vrf=vrf, count=count, routes=built, winning_weight=winning_weight
+        )
+
+    @classmethod
+    def merge(cls, *tables: "BGPRouteTable") -> "BGPRouteTable":
+        """Merge multiple tables into one table.
+
+        Each table's routes are already sorted, so they're merged in a single pass without
+        re-sorting or re-validating them.
+        """
+        first, *_ = tables
+        routes = list(heapq.merge(*(table.routes for table in tables), key=_sort_key))
+        return cls.model_construct(
+            vrf=first.vrf,
+            count=len(routes),
+            routes=routes,
+            winning_weight=first.winning_weight,
+        )
 
     def __add__(self: "BGPRouteTable", other: "BGPRouteTable") -> "BGPRouteTable":
         """Merge another BGP table instance with this instance."""
         if isinstance(other, BGPRouteTable):
-            self.routes = sorted([*self.routes, *other.routes], key=lambda r: r.prefix)
-            self.count = len(self.routes)
+            return self.merge(self, other)
+        return self
+
+    async def validate_rpki(self: "BGPRouteTable") -> "BGPRouteTable":
+        """If external or file RPKI validation is enabled, resolve RPKI states for all routes."""
+
+        (structured := use_state("params").structured)
+
+        if structured.rpki.mode == "router":
+            return self
+
+        targets = [(route, route.rpki_target()) for route in self.routes]
+        to_validate = (target for _, target in targets if target is not None)
+
+        if structured.rpki.mode == "file":
+            states = await vrp_states(*to_validate, path=structured.rpki.vrp_file)
+        else:
+            states = await rpki_states(*to_validate)
+
+        for route, target in targets:
+            if target is not None:
+                route.rpki_state = states[target]
+
         return self
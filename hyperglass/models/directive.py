@@ -2,6 +2,7 @@
 
 # Standard Library
 import re
+import string
 import typing as t
 from ipaddress import IPv4Network, IPv6Network, ip_network
 
@@ -9,7 +10,6 @@ from ipaddress import IPv4Network, IPv6Network, ip_network
 from pydantic import Field, FilePath, PrivateAttr, IPvAnyNetwork, field_validator
 
 # Project
-from hyperglass.log import log
 from hyperglass.types import Series
 from hyperglass.settings import Settings
 from hyperglass.exceptions.private import InputValidationError
@@ -21,7 +21,6 @@ from .fields import Action
 StringOrArray = t.Union[str, t.List[str]]
 Condition = t.Union[IPvAnyNetwork, str]
 RuleValidation = t.Union[t.Literal["ipv4", "ipv6", "pattern"], None]
-PassedValidation = t.Union[bool, None]
 IPFamily = t.Literal["ipv4", "ipv6"]
 RuleTypeAttr = t.Literal["ipv4", "ipv6", "pattern", "none"]
 
@@ -69,7 +68,6 @@ class Rule(HyperglassModel):
     """Base rule."""
 
     _type: RuleTypeAttr = "none"
-    _passed: PassedValidation = PrivateAttr(None)
     condition: Condition
     action: Action = "permit"
     commands: t.List[str] = Field([], alias="command")
@@ -107,32 +105,38 @@ class RuleWithIP(Rule):
 
     def membership(self, target: IPvAnyNetwork, network: IPvAnyNetwork) -> bool:
         """Check if IP address belongs to network."""
-        _log = log.bind(target=str(target), network=str(network))
-        _log.debug("Checking target membership")
-        if (
+        return (
             network.network_address <= target.network_address
             and network.broadcast_address >= target.broadcast_address
-        ):
-            _log.debug("Target membership verified")
-            return True
-        return False
+        )
 
     def in_range(self, target: IPvAnyNetwork) -> bool:
         """Verify if target prefix length is within ge/le threshold."""
-        if target.prefixlen <= self.le and target.prefixlen >= self.ge:
-            log.bind(target=str(target), range=f"{self.ge!s}-{self.le!s}").debug(
-                "Target is in range"
-            )
+        return self.ge <= target.prefixlen <= self.le
+
+    def decide(self, target: IPvAnyNetwork, value: str) -> t.Literal[True]:
+        """Permit or deny a target that is a member of this rule's network."""
+        if self.in_range(target) and self.action == "permit":
             return True
 
-        return False
+        if not self.in_range(target):
+            raise InputValidationError(
+                error="Prefix-length is not within range {ge}-{le}",
+                target=value,
+                ge=self.ge,
+                le=self.le,
+            )
+        raise InputValidationError(
+            error="Member of denied network '{network}'",
+            target=value,
+            network=str(self.condition),
+        )
 
     def validate_target(self, target: str, *, multiple: bool) -> bool:
         """Validate an IP address target against this rule's conditions."""
 
         if isinstance(target, t.List):
             if len(target) > 1:
-                self._passed = False
                 raise InputValidationError(error="Target must be a single value", target=target)
             target = target[0]
 
@@ -144,34 +148,10 @@ class RuleWithIP(Rule):
             raise InputValidationError(error=str(err), target=target) from err
 
         if valid_target.version != self.condition.version:
-            log.bind(target=str(target), condition=str(self.condition)).debug(
-                "Mismatching IP version"
-            )
             return False
 
-        is_member = self.membership(valid_target, self.condition)
-        in_range = self.in_range(valid_target)
-
-        if all((is_member, in_range, self.action == "permit")):
-            self._passed = True
-            return True
-
-        if is_member and not in_range:
-            self._passed = False
-            raise InputValidationError(
-                error="Prefix-length is not within range {ge}-{le}",
-                target=target,
-                ge=self.ge,
-                le=self.le,
-            )
-
-        if is_member and self.action == "deny":
-            self._passed = False
-            raise InputValidationError(
-                error="Member of denied network '{network}'",
-                target=target,
-                network=str(self.condition),
-            )
+        if self.membership(valid_target, self.condition):
+            return self.decide(valid_target, target)
 
         return False
 
@@ -198,17 +178,29 @@ class RuleWithPattern(Rule):
     """A rule validated by a regular expression pattern."""
 
     _type: RuleTypeAttr = "pattern"
+    _pattern: t.Pattern = PrivateAttr()
     condition: str
 
+    def __init__(self, **kw) -> None:
+        """Compile the rule's pattern."""
+        super().__init__(**kw)
+        self._pattern = re.compile(".+" if self.condition == "*" else self.condition, re.IGNORECASE)
+
+    @field_validator("condition")
+    def validate_condition(cls, value: str) -> str:
+        """Ensure the condition is a valid regular expression."""
+        if value != "*":
+            try:
+                re.compile(value)
+            except re.error as err:
+                raise ValueError(f"Invalid pattern '{value}': {err!s}") from err
+        return value
+
     def validate_target(self, target: str, *, multiple: bool) -> str:  # noqa: C901
         """Validate a string target against configured regex patterns."""
 
         def validate_single_value(value: str) -> t.Union[bool, BaseException]:
-            if self.condition == "*":
-                pattern = re.compile(".+", re.IGNORECASE)
-            else:
-                pattern = re.compile(self.condition, re.IGNORECASE)
-            is_match = pattern.match(value)
+            is_match = self._pattern.match(value)
 
             if is_match and self.action == "permit":
                 return True
@@ -219,20 +211,15 @@ class RuleWithPattern(Rule):
         if isinstance(target, t.List):
             for result in (validate_single_value(v) for v in target):
                 if isinstance(result, BaseException):
-                    self._passed = False
                     raise result
                 if result is False:
-                    self._passed = False
                     return result
-            self._passed = True
             return True
 
         result = validate_single_value(target)
 
         if isinstance(result, BaseException):
-            self._passed = False
             raise result
-        self._passed = result
         return result
 
 
@@ -244,7 +231,6 @@ class RuleWithoutValidation(Rule):
 
     def validate_target(self, target: str, *, multiple: bool) -> t.Literal[True]:
         """Don't validate a target. Always returns `True`."""
-        self._passed = True
         return True
 
 
@@ -256,10 +242,162 @@ RuleType = t.Union[
 ]
 
 
+class CommandTemplate:
+    """A rule command with a device's attributes substituted.
+
+    Only the built-in `target` & `mask` keys are left to be substituted when a query is run.
+    """
+
+    # Keys substituted for each query rather than from device attributes.
+    QUERY_KEYS = ("target", "mask")
+
+    def __init__(self, command: str, attrs: t.Dict[str, str]) -> None:
+        """Substitute device attributes, raising `KeyError` if an attribute is missing."""
+        formatter = string.Formatter()
+        template = []
+        keys = set()
+        for literal, key, spec, conversion in formatter.parse(command):
+            template.append(literal.replace("{", "{{").replace("}", "}}"))
+            if key is None:
+                continue
+            if key in self.QUERY_KEYS:
+                keys.add(key)
+                conversion = "" if conversion is None else f"!{conversion}"
+                spec = f":{spec}" if spec else ""
+                template.append(f"{{{key}{conversion}{spec}}}")
+                continue
+            value = formatter.format_field(formatter.convert_field(attrs[key], conversion), spec)
+            template.append(value.replace("{", "{{").replace("}", "}}"))
+        self.command = command
+        self.template = "".join(template)
+        self.uses_mask = "mask" in keys
+
+    def __repr__(self) -> str:
+        """Represent the template by its command."""
+        return f"CommandTemplate({self.command!r})"
+
+    def render(self, target: t.Any, mask: t.Any = None) -> str:
+        """Substitute a query's target & mask."""
+        return self.template.format(target=target, mask=mask)
+
+
+class RuleMatch(t.NamedTuple):
+    """Result of validating a query target against a directive's rules.
+
+    Rules are shared by all queries for a directive, so the result is returned to the query
+    rather than recorded on the rules.
+    """
+
+    # Rules whose commands are run for the target.
+    rules: t.Tuple[Rule, ...]
+    # Target as validated, i.e. a single IP prefix is unwrapped from a list.
+    target: StringOrArray
+    # Positions of the matched rules in the directive's rules.
+    indexes: t.Tuple[int, ...]
+
+
+class RuleMatcher:
+    """A directive's rules, compiled for target validation.
+
+    Rules are evaluated in order, and the first rule to permit or deny a target decides the
+    result. IP rules are indexed per address family by prefix length & network, so the first IP
+    rule containing a target is found with one lookup per configured prefix length, and only
+    non-IP rules configured before it are evaluated individually.
+    """
+
+    def __init__(self, rules: t.Sequence[Rule]) -> None:
+        """Index IP rules by family, prefix length & network."""
+        self.rules = tuple(rules)
+        # Index of the first IP rule, which rejects targets that aren't a single IP prefix.
+        self.first_ip: t.Optional[int] = None
+        # Indexes of non-IP rules, in order.
+        self.others: t.Tuple[int, ...] = ()
+        # Per family, each configured prefix length & its network mask.
+        self.masks: t.Dict[int, t.Tuple[t.Tuple[int, int], ...]] = {4: (), 6: ()}
+        # Per family, the index of the first rule for each (prefix length, network).
+        self.networks: t.Dict[int, t.Dict[t.Tuple[int, int], int]] = {4: {}, 6: {}}
+
+        others = []
+        lengths: t.Dict[int, t.Set[int]] = {4: set(), 6: set()}
+        for idx, rule in enumerate(self.rules):
+            if not isinstance(rule, RuleWithIP):
+                others.append(idx)
+                continue
+            if self.first_ip is None:
+                self.first_ip = idx
+            network = rule.condition
+            lengths[network.version].add(network.prefixlen)
+            key = (network.prefixlen, int(network.network_address))
+            self.networks[network.version].setdefault(key, idx)
+
+        self.others = tuple(others)
+        for version, bits in ((4, 32), (6, 128)):
+            self.masks[version] = tuple(
+                (length, ((1 << length) - 1) << (bits - length))
+                for length in sorted(lengths[version])
+            )
+
+    def _first_member(self, target: IPvAnyNetwork) -> t.Optional[int]:
+        """Get the index of the first IP rule whose network contains the target."""
+        networks = self.networks[target.version]
+        address = int(target.network_address)
+        first = None
+        for length, mask in self.masks[target.version]:
+            if length > target.prefixlen:
+                break
+            idx = networks.get((length, address & mask))
+            if idx is not None and (first is None or idx < first):
+                first = idx
+        return first
+
+    def _ip_boundary(
+        self, target: StringOrArray
+    ) -> t.Tuple[t.Optional[int], t.Union[t.Tuple[IPvAnyNetwork, str], InputValidationError]]:
+        """Get the index of the IP rule that decides the target's result, if any.
+
+        The target is parsed once. If it's not a single IP prefix, the first IP rule rejects it.
+        """
+        if self.first_ip is None:
+            return None, None
+
+        values = target if isinstance(target, t.List) else [target]
+        if len(values) > 1:
+            error = InputValidationError(error="Target must be a single value", target=target)
+            return self.first_ip, error
+
+        try:
+            network = ip_network(values[0])
+        except ValueError as err:
+            return self.first_ip, InputValidationError(error=str(err), target=values[0])
+
+        return self._first_member(network), (network, values[0])
+
+    def validate(self, target: StringOrArray, *, multiple: bool) -> RuleMatch:
+        """Get the rule that permits a target, or raise an error if it's denied or unmatched."""
+        boundary, outcome = self._ip_boundary(target)
+
+        for idx in self.others:
+            if boundary is not None and idx > boundary:
+                break
+            rule = self.rules[idx]
+            if rule.validate_target(target, multiple=multiple) is True:
+                return RuleMatch((rule,), target, (idx,))
+
+        if boundary is None:
+            raise InputValidationError(error="No matched validation rules", target=target)
+        if isinstance(outcome, InputValidationError):
+            raise outcome
+
+        rule = self.rules[boundary]
+        rule.decide(*outcome)
+        return RuleMatch((rule,), outcome[1], (boundary,))
+
+
 class Directive(HyperglassUniqueModel, unique_by=("id", "table_output")):
     """A directive contains commands that can be run on a device, as long as defined rules are met."""
 
     _hyperglass_builtin: bool = PrivateAttr(False)
+    _matcher: RuleMatcher = PrivateAttr()
 
     id: str
     name: str
@@ -272,6 +410,11 @@ class Directive(HyperglassUniqueModel, unique_by=("id", "table_output")):
     multiple: bool = False
     multiple_separator: str = " "
 
+    def __init__(self, **kw: t.Any) -> None:
+        """Compile the directive's rules."""
+        super().__init__(**kw)
+        self._matcher = RuleMatcher(self.rules)
+
     @field_validator("rules", mode="before")
     @classmethod
     def validate_rules(cls, rules: t.List[t.Dict[str, t.Any]]):
@@ -294,14 +437,9 @@ class Directive(HyperglassUniqueModel, unique_by=("id", "table_output")):
                 out_rules.append(rule)
         return out_rules
 
-    def validate_target(self, target: str) -> bool:
+    def validate_target(self, target: StringOrArray) -> RuleMatch:
         """Validate a target against all configured rules."""
-        for rule in self.rules:
-            valid = rule.validate_target(target, multiple=self.multiple)
-            if valid is True:
-                return True
-            continue
-        raise InputValidationError(error="No matched validation rules", target=target)
+        return self._matcher.validate(target, multiple=self.multiple)
 
     @property
     def field_type(self) -> t.Literal["text", "select", None]:
@@ -194,6 +194,7 @@ class MultiModel(RootModel[MultiModelT]):
 
     root: t.List[MultiModelT] = []
     _count: int = PrivateAttr()
+    _index: t.Dict[t.Any, MultiModelT] = PrivateAttr(default_factory=dict)
 
     def __init__(self, *items: t.Union[MultiModelT, t.Dict[str, t.Any]]) -> None:
         """Validate items."""
@@ -203,6 +204,7 @@ class MultiModel(RootModel[MultiModelT]):
         valid = self._valid_items(*items)
         super().__init__(root=valid)
         self._count = len(self.root)
+        self._build_index()
 
     def __init_subclass__(cls, **kw: t.Any) -> None:
         """Add class variables from keyword arguments."""
@@ -220,6 +222,12 @@ class MultiModel(RootModel[MultiModelT]):
         """Iterate items."""
         return iter(self.root)
 
+    def __contains__(self, value: t.Any) -> bool:
+        """Determine if an item, or an item with a `unique_by` property of `value`, exists."""
+        if isinstance(value, str):
+            return value in self._index
+        return value in self.root
+
     def __getitem__(self, value: t.Union[int, str]) -> MultiModelT:
         """Get an item by its `unique_by` property."""
         if not isinstance(value, (str, int)):
@@ -231,9 +239,9 @@ class MultiModel(RootModel[MultiModelT]):
         if isinstance(value, int):
             return self.root[value]
 
-        for item in self:
-            if hasattr(item, self.unique_by) and getattr(item, self.unique_by) == value:
-                return item
+        item = self._index.get(value)
+        if item is not None:
+            return item
         raise IndexError(
             "No match found for {!s}.{!s}={!r}".format(
                 self.model.__class__.__name__, self.unique_by, value
@@ -287,6 +295,22 @@ class MultiModel(RootModel[MultiModelT]):
         new._model_name = getattr(model, "__name__", "MultiModel")
         return new
 
+    def _build_index(self) -> None:
+        """Index items by their `unique_by` property.
+
+        If multiple items have the same value, the first is indexed, as it would be found first
+        when iterating.
+        """
+        index = {}
+        for item in self.root:
+            index.setdefault(getattr(item, self.unique_by, None), item)
+        index.pop(None, None)
+        self._index = index
+
+    def get(self, value: t.Any, default: t.Optional[MultiModelT] = None) -> t.Optional[MultiModelT]:
+        """Get an item by its `unique_by` property, or `default` if there is no match."""
+        return self._index.get(value, default)
+
     def _valid_items(
         self, *to_validate: t.List[t.Union[MultiModelT, t.Dict[str, t.Any]]]
     ) -> t.List[MultiModelT]:
@@ -348,6 +372,7 @@ class MultiModel(RootModel[MultiModelT]):
         new = self._merge_with(*items, unique_by=unique_by)
         self.root = new
         self._count = len(self.root)
+        self._build_index()
         for item in new:
             log.debug(
                 "Added {} '{!s}' to {}".format(
@@ -8,7 +8,7 @@ from datetime import datetime
 from pydantic import ConfigDict
 
 # Project
-from hyperglass.log import log
+from hyperglass.log import Lazy, log
 from hyperglass.models.data import BGPRouteTable
 
 # Local
@@ -115,8 +115,11 @@ class AristaBGPTable(_AristaBase):
             return []
         return [int(p) for p in as_path.split() if p.isdecimal()]
 
-    def bgp_table(self: "AristaBGPTable") -> "BGPRouteTable":
-        """Convert the Arista-formatted fields to standard parsed data model."""
+    def bgp_table(self: "AristaBGPTable", strict: bool = True) -> "BGPRouteTable":
+        """Convert the Arista-formatted fields to standard parsed data model.
+
+        If `strict` is false, the route data is not validated a second time.
+        """
         routes = []
         count = 0
         for prefix, entries in self.bgp_route_entries.items():
@@ -156,12 +159,27 @@ class AristaBGPTable(_AristaBase):
                     }
                 )
 
-        serialized = BGPRouteTable(
+        table = BGPRouteTable if strict else BGPRouteTable.from_parsed
+        serialized = table(
             vrf=self.vrf,
             count=count,
             routes=routes,
             winning_weight=WINNING_WEIGHT,
         )
 
-        log.bind(platform="arista_eos", response=repr(serialized)).debug("Serialized response")
+        log.bind(platform="arista_eos", response=Lazy(repr, serialized)).debug(
+            "Serialized response"
+        )
         return serialized
+
+
+class AristaBGPResponse(_AristaBase):
+    """Validation model for a complete Arista `show ip bgp` JSON response."""
+
+    vrfs: t.Dict[str, AristaBGPTable]
+
+    def bgp_table(self: "AristaBGPResponse", strict: bool = True) -> "BGPRouteTable":
+        """Convert the first VRF's table to standard parsed data model."""
+        for table in self.vrfs.values():
+            return table.bgp_table(strict=strict)
+        raise ValueError("Response contains no VRFs")
@@ -8,7 +8,7 @@ from datetime import datetime
 from pydantic import ConfigDict, model_validator
 
 # Project
-from hyperglass.log import log
+from hyperglass.log import Lazy, log
 from hyperglass.models.data import BGPRouteTable
 
 # Local
@@ -60,7 +60,7 @@ class FRRPath(_FRRBase):
     nexthops: t.List[FRRNextHop]
     peer: FRRPeer
 
-    @model_validator(pre=True)
+    @model_validator(mode="before")
     def validate_path(cls, values):
         """Extract meaningful data from FRR response."""
         new = values.copy()
@@ -78,8 +78,12 @@ class FRRRoute(_FRRBase):
     prefix: str
     paths: t.List[FRRPath] = []
 
-    def serialize(self):
-        """Convert the FRR-specific fields to standard parsed data model."""
+    def serialize(self, strict: bool = True):
+        """Convert the FRR-specific fields to standard parsed data model.
+
+        If `strict` is false, the route data is not validated a second time. Use
+        `FRRRoute.model_validate_json()` to validate a raw response without decoding it first.
+        """
 
         # TODO: somehow, get the actual VRF
         vrf = "default"
@@ -108,12 +112,13 @@ class FRRRoute(_FRRBase):
                 }
             )
 
-        serialized = BGPRouteTable(
+        table = BGPRouteTable if strict else BGPRouteTable.from_parsed
+        serialized = table(
             vrf=vrf,
             count=len(routes),
             routes=routes,
             winning_weight="high",
         )
 
-        log.bind(platform="frr", response=repr(serialized)).debug("Serialized response")
+        log.bind(platform="frr", response=Lazy(repr, serialized)).debug("Serialized response")
         return serialized
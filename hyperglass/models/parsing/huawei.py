@@ -1,18 +1,8 @@
-"""Data Models for Parsing Huawei Response."""
+"""Parse Huawei route responses."""
 
 # Standard Library
+import re
 import typing as t
-from datetime import datetime
-
-# Third Party
-from pydantic import ConfigDict
-
-# Project
-from hyperglass.log import log
-from hyperglass.models.data import BGPRouteTable
-
-# Local
-from ..main import HyperglassModel
 
 RPKI_STATE_MAP = {
     "invalid": 0,
@@ -22,108 +12,84 @@ RPKI_STATE_MAP = {
 }
 
 
-def _alias_generator(field: str) -> str:
-    caps = "".join(x for x in field.title() if x.isalnum())
-    return caps[0].lower() + caps[1:]
-
-
-class _HuaweiBase(HyperglassModel):
-    """Base Model for Huawei validation."""
-
-    model_config = ConfigDict(extra="ignore", alias_generator=_alias_generator)
-
-
-class HuaweiRoutePath(_HuaweiBase):
-    """Validation model for Huawei bgpRoutePaths."""
-
-    available: int
-    best: int
-    select: int
-    best_external: int
-    add_path: int
-
-
-class HuaweiRouteEntry(_HuaweiBase):
-    """Validation model for Huawei bgpRouteEntries."""
-
-    prefix: str
-    from_addr: str
-    duration: int
-    direct_out_interface: str
-    original_next_hop: str
-    relay_ip_next_hop: str
-    relay_ip_out_interface: str
-    qos: str
-    communities: t.List[str] = []
-    ext_communities: t.List[str] = []
-    large_communities: t.List[str] = []
-    as_path: t.List[int] = []
-    origin: str
-    metric: int = 0  # med
-    local_preference: int
-    preference_value: int
-    is_valid: bool
-    is_external: bool
-    is_backup: bool
-    is_best: bool
-    is_selected: bool
-    preference: int
-
-
-class HuaweiBGPTable(_HuaweiBase):
-    """Validation model for Huawei bgpRouteEntries data."""
-
-    local_router_id: str
-    local_as_number: int
-    paths: HuaweiRoutePath
-    routes: t.List[HuaweiRouteEntry] = []
-
-    @staticmethod
-    def _get_route_age(timestamp: int) -> int:
-        now = datetime.utcnow()
-        now_timestamp = int(now.timestamp())
-        return now_timestamp - timestamp
-
-    @staticmethod
-    def _get_as_path(as_path: str) -> t.List[str]:
-        if as_path == "":
-            return []
-        return [int(p) for p in as_path.split() if p.isdecimal()]
-
-    def bgp_table(self: "HuaweiBGPTable") -> "BGPRouteTable":
-        """Convert the Huawei-formatted fields to standard parsed data model."""
-        routes = []
-        count = 0
-        for route in self.routes:
-            count += 1
-            routes.append(
-                {
-                    "prefix": route.prefix,
-                    "active": route.is_selected,
-                    "age": route.duration,
-                    "weight": route.preference,
-                    "med": route.metric,
-                    "local_preference": route.local_preference,
-                    "as_path": route.as_path,
-                    "communities": route.communities + route.ext_communities + route.large_communities,
-                    "next_hop": route.original_next_hop,
-                    "source_as": 0,
-                    "source_rid": "",
-                    "peer_rid": route.from_addr,
-                    "rpki_state": RPKI_STATE_MAP.get("valid")
-                    if route.is_valid
-                    else RPKI_STATE_MAP.get("unknown"),
-                }
-            )
-
-            print(routes)
-
-        serialized = BGPRouteTable(
-            vrf="default",
-            count=count,
-            routes=routes,
-            winning_weight="high",
-        )
-
-        log.bind(platform="huawei", response=repr(serialized)).debug("Serialized response")
-        return serialized
+# Each line of `display bgp routing-table <prefix>` output that's used, by field.
+HUAWEI_LINE = re.compile(
+    r"^[ \t]*(?:"
+    r"BGP routing table entry information of (?P<prefix>\S+?):"
+    r"|From: (?P<peer_rid>\S+).*"
+    r"|Route Duration: (?P<age>\S+)"
+    r"|Original nexthop: (?P<next_hop>\S+)"
+    r"|Community: (?P<communities>.+)"
+    r"|Ext-Community: (?P<ext_communities>.+)"
+    r"|Large-Community: (?P<large_communities>.+)"
+    r"|AS-path (?P<attributes>.+)"
+    r")[ \t]*\r?$",
+    re.MULTILINE,
+)
+HUAWEI_DURATION = re.compile(r"(?:(\d+)d)?(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?")
+HUAWEI_COMMUNITY = re.compile(r"<([^>]+)>")
+HUAWEI_AS_NUMBER = re.compile(r"\d+")
+
+# Numeric path attributes, by their name in the `AS-path` line.
+HUAWEI_ATTRIBUTES = {"MED": "med", "localpref": "local_preference", "pre": "weight"}
+
+
+def _huawei_duration(value: str) -> int:
+    """Convert a Huawei duration such as `9d22h50m28s` to seconds."""
+    days, hours, minutes, seconds = (int(v or 0) for v in HUAWEI_DURATION.fullmatch(value).groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+def _huawei_attributes(route: t.Dict[str, t.Any], value: str) -> None:
+    """Parse a line such as `AS-path 65001 65002, origin igp, MED 0, localpref 100, ...`."""
+    as_path, *attributes = value.split(",")
+    if as_path.strip() != "Nil":
+        route["as_path"] = [int(asn) for asn in HUAWEI_AS_NUMBER.findall(as_path)]
+    for attribute in attributes:
+        name, _, number = attribute.strip().partition(" ")
+        if name in HUAWEI_ATTRIBUTES and number.isdecimal():
+            route[HUAWEI_ATTRIBUTES[name]] = int(number)
+        elif name == "select":
+            route["active"] = True
+        elif name == "valid":
+            route["rpki_state"] = RPKI_STATE_MAP["valid"]
+
+
+def iter_huawei_routes(output: str) -> t.Generator[t.Dict[str, t.Any], None, None]:
+    """Parse Huawei BGP route detail output, yielding each route as soon as it has been read.
+
+    Only lines matching `HUAWEI_LINE` are visited; each entry header starts a new route.
+    """
+    route = None
+    for match in HUAWEI_LINE.finditer(output):
+        field, value = match.lastgroup, match.group(match.lastgroup)
+        if field == "prefix":
+            if route is not None:
+                yield route
+            route = {
+                "prefix": value,
+                "active": False,
+                "age": 0,
+                "weight": 0,
+                "med": 0,
+                "local_preference": 0,
+                "as_path": [],
+                "communities": [],
+                "next_hop": "",
+                "source_as": 0,
+                "source_rid": "",
+                "peer_rid": "",
+                "rpki_state": 3,
+            }
+        elif route is None:
+            continue
+        elif field == "attributes":
+            _huawei_attributes(route, value)
+        elif field == "age":
+            route["age"] = _huawei_duration(value)
+        elif field in ("communities", "ext_communities", "large_communities"):
+            route["communities"].extend(HUAWEI_COMMUNITY.findall(value))
+        else:
+            route[field] = value
+    if route is not None:
+        yield route
@@ -1,18 +1,11 @@
-"""Data Models for Parsing Juniper XML Response."""
+"""Parse Juniper XML route responses."""
 
 # Standard Library
 import typing as t
-
-# Third Party
-from pydantic import ConfigDict, field_validator, model_validator
+from xml.parsers import expat
 
 # Project
-from hyperglass.log import log
-from hyperglass.util import deep_convert_keys
-from hyperglass.models.data.bgp_route import BGPRouteTable
-
-# Local
-from ..main import HyperglassModel
+from hyperglass.exceptions.private import ParsingError
 
 RPKI_STATE_MAP = {
     "invalid": 0,
@@ -21,179 +14,183 @@ RPKI_STATE_MAP = {
     "unverified": 3,
 }
 
+AS_PATH_ORIGIN_FLAGS = ("E", "I", "?")
+
+# rt-entry child elements whose text is kept, mapped to their route field.
+ENTRY_FIELDS = {
+    "active-tag": "active",
+    "preference": "weight",
+    "local-preference": "local_preference",
+    "metric": "med",
+    "age": "age",
+    "validation-state": "rpki_state",
+    "peer-id": "peer_rid",
+}
 
-class JuniperBase(HyperglassModel, extra="ignore"):
-    """Base Juniper model."""
-
-    def __init__(self, **kwargs: t.Any) -> None:
-        """Convert all `-` keys to `_`.
-
-        Default camelCase alias generator will still be used.
-        """
-        rebuilt = deep_convert_keys(kwargs, lambda k: k.replace("-", "_"))
-        super().__init__(**rebuilt)
-
-
-class JuniperRouteTableEntry(JuniperBase):
-    """Parse Juniper rt-entry data."""
-
-    model_config = ConfigDict(validate_assignment=False)
-
-    active_tag: bool
-    preference: int
-    age: int
-    local_preference: int
-    metric: int = 0
-    as_path: t.List[int] = []
-    validation_state: int = 3
-    next_hop: str
-    peer_rid: str
-    peer_as: int
-    source_as: int
-    source_rid: str
-    communities: t.List[str] = None
-
-    @model_validator(mode="before")
-    def validate_optional_flags(cls, values: t.Dict[str, t.Any]):
-        """Flatten & rename keys prior to validation."""
-        next_hops = []
-        nh = None
-
-        # Handle Juniper's 'Router' Next Hop Type
-        if "nh" in values:
-            nh = values.pop("nh")
-
-        # Handle Juniper's 'Indirect' Next Hop Type
-        if "protocol_nh" in values:
-            nh = values.pop("protocol_nh")
-
-        # Force the next hops to be a list
-        if isinstance(nh, t.Dict):
-            nh = [nh]
-
-        if nh is not None:
-            next_hops.extend(nh)
-
-        # Extract the 'to:' value from the next-hop
-        selected_next_hop = ""
-        for hop in next_hops:
-            if "selected_next_hop" in hop:
-                selected_next_hop = hop.get("to", "")
-                break
-            if hop.get("to") is not None:
-                selected_next_hop = hop["to"]
-                break
-
-        values["next_hop"] = selected_next_hop
-
-        _path_attr = values.get("bgp_path_attributes", {})
-        _path_attr_agg = _path_attr.get("attr_aggregator", {}).get("attr_value", {})
-        values["as_path"] = _path_attr.get("attr_as_path_effective", {}).get("attr_value", "")
-        values["source_as"] = _path_attr_agg.get("aggr_as_number", 0)
-        values["source_rid"] = _path_attr_agg.get("aggr_router_id", "")
-        values["peer_rid"] = values.get("peer_id", "")
-
-        return values
-
-    @field_validator("validation_state", mode="before")
-    def validate_rpki_state(cls, value):
-        """Convert string RPKI state to standard integer mapping."""
-        return RPKI_STATE_MAP.get(value, 3)
-
-    @field_validator("active_tag", mode="before")
-    def validate_active_tag(cls, value):
-        """Convert active-tag from string/null to boolean."""
-        if value == "*":
-            value = True
-        else:
-            value = False
-        return value
-
-    @field_validator("age", mode="before")
-    def validate_age(cls, value):
-        """Get age as seconds."""
-        if not isinstance(value, dict):
+NEXT_HOP_TAGS = ("nh", "protocol-nh")
+
+RouteData = t.Dict[str, t.Any]
+
+
+class JuniperRouteParser:
+    """Incrementally parse Juniper route XML into normalized route data.
+
+    Data is fed to an expat parser, and each `rt-entry` is converted to the fields of a
+    `BGPRoute` as soon as it has been read, so no document tree is built. Everything outside
+    the root element (e.g. a trailing CLI banner) is ignored.
+    """
+
+    def __init__(self) -> None:
+        """Create an expat parser & empty parse state."""
+        self._parser = expat.ParserCreate()
+        self._parser.buffer_text = True
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+        self._parser.CharacterDataHandler = self._text
+        self._stack: t.List[str] = []
+        self._text_parts: t.List[str] = []
+        self._started = False
+        self._done = False
+        self._rt: t.Dict[str, str] = {}
+        self._entry: t.Optional[RouteData] = None
+        self._hop: t.Optional[t.Dict[str, t.Any]] = None
+        self._routes: t.List[RouteData] = []
+        self.vrf = "default"
+        self.count = 0
+        self.has_routes = False
+        self.error: t.Optional[str] = None
+
+    def _start(self, name: str, attrs: t.Dict[str, str]) -> None:
+        parent = self._stack[-1] if self._stack else None
+        self._stack.append(name)
+        self._text_parts = []
+
+        if name == "rt-entry":
+            try:
+                prefix = f"{self._rt['rt-destination']}/{self._rt['rt-prefix-length']}"
+            except KeyError as err:
+                raise ParsingError("{key} was not found in the response", key=str(err)) from err
+            self._entry = {
+                "prefix": prefix,
+                "communities": [],
+                "as_path": "",
+                "source_as": 0,
+                "source_rid": "",
+                "peer_rid": "",
+                "med": 0,
+                "rpki_state": 3,
+                "next_hops": {tag: [] for tag in NEXT_HOP_TAGS},
+            }
+        elif self._entry is None:
+            if name == "rt":
+                self.has_routes = True
+                self._rt = {}
+        elif name in NEXT_HOP_TAGS and parent == "rt-entry":
+            self._hop = {}
+        elif name == "selected-next-hop" and self._hop is not None:
+            self._hop["selected"] = True
+        elif name == "age" and parent == "rt-entry" and "junos:seconds" in attrs:
+            self._entry["age"] = attrs["junos:seconds"]
+
+    def _text(self, data: str) -> None:
+        self._text_parts.append(data)
+
+    def _end(self, name: str) -> None:  # noqa: C901
+        self._stack.pop()
+        parent = self._stack[-1] if self._stack else None
+        text = "".join(self._text_parts).strip()
+        self._text_parts = []
+
+        if parent is None:
+            self._done = True
+            return
+
+        entry = self._entry
+        if entry is None:
+            if parent == "rt":
+                if name in ("rt-destination", "rt-prefix-length"):
+                    self._rt[name] = text
+                elif name == "rt-entry-count":
+                    self.count += int(text)
+            elif name == "table-name" and parent == "route-table":
+                vrf_parts = text.split(".")
+                if len(vrf_parts) != 2:
+                    self.vrf = vrf_parts[0]
+            elif name == "message" and parent == "xnm:error":
+                self.error = text
+            return
+
+        if name == "rt-entry":
+            self._routes.append(self._route(entry))
+            self._entry = None
+        elif parent == "rt-entry":
+            if name in NEXT_HOP_TAGS:
+                entry["next_hops"][name].append(self._hop)
+                self._hop = None
+            # Age in seconds is taken from the element's attribute, when present.
+            elif name in ENTRY_FIELDS and not (name == "age" and "age" in entry):
+                entry[ENTRY_FIELDS[name]] = text
+        elif name == "to" and parent in NEXT_HOP_TAGS and self._hop is not None:
+            self._hop.setdefault("to", text)
+        elif name == "community" and parent == "communities":
+            entry["communities"].append(text)
+        elif name == "attr-value" and parent == "attr-as-path-effective":
+            entry["as_path"] = text
+        elif name == "aggr-as-number":
+            entry["source_as"] = text
+        elif name == "aggr-router-id":
+            entry["source_rid"] = text
+
+    def _route(self, entry: RouteData) -> RouteData:
+        """Convert raw rt-entry values to `BGPRoute` fields."""
+        # Indirect next hops take precedence over router next hops.
+        next_hops = entry.pop("next_hops")
+        hops = next_hops["protocol-nh"] or next_hops["nh"]
+        entry["next_hop"] = next(
+            (hop.get("to", "") for hop in hops if "selected" in hop or "to" in hop), ""
+        )
+        try:
+            entry["active"] = entry.get("active") == "*"
+            entry["rpki_state"] = RPKI_STATE_MAP.get(entry["rpki_state"], 3)
+            entry["as_path"] = [
+                int(a) for a in entry["as_path"].split() if a not in AS_PATH_ORIGIN_FLAGS
+            ]
+            for key in ("age", "weight", "local_preference", "med", "source_as"):
+                entry[key] = int(entry[key])
+        except KeyError as err:
+            raise ParsingError("{key} was not found in the response", key=str(err)) from err
+        except ValueError as err:
+            raise ParsingError("Error parsing response data: {e}", e=str(err)) from err
+        return entry
+
+    def feed(self, data: str) -> t.List[RouteData]:
+        """Parse the next chunk of XML, and get the routes completed by it."""
+        if self._done:
+            return []
+        if not self._started:
+            # Skip anything before the XML, e.g. a CLI prompt.
+            start = data.find("<")
+            if start == -1:
+                return []
+            data = data[start:]
+            self._started = True
+        try:
+            self._parser.Parse(data, False)
+        except ValueError as err:
+            raise ParsingError("Error parsing response data: {e}", e=str(err)) from err
+        except expat.ExpatError as err:
+            # Data after the root element is closed (e.g. '{master}') is ignored.
+            if not self._done:
+                raise ParsingError("Error parsing response data") from err
+        routes, self._routes = self._routes, []
+        return routes
+
+    def close(self) -> None:
+        """Ensure the whole document has been read, and that it isn't an error from the device."""
+        if not self._done:
             try:
-                value = int(value)
-            except ValueError as err:
-                raise ValueError(f"Age field is in an unexpected format. Got: {value}") from err
-        else:
-            value = value.get("@junos:seconds", 0)
-        return int(value)
-
-    @field_validator("as_path", mode="before")
-    def validate_as_path(cls, value):
-        """Remove origin flags from AS_PATH."""
-        disallowed = ("E", "I", "?")
-        return [int(a) for a in value.split() if a not in disallowed]
-
-    @field_validator("communities", mode="before")
-    def validate_communities(cls, value):
-        """Flatten community list."""
-        if value is not None:
-            flat = value.get("community", [])
-        else:
-            flat = []
-        return flat
-
-
-class JuniperRouteTable(JuniperBase):
-    """Validation model for Juniper rt data."""
-
-    rt_destination: str
-    rt_prefix_length: int
-    rt_entry_count: int
-    rt_announced_count: int
-    rt_entry: t.List[JuniperRouteTableEntry]
-
-    @field_validator("rt_entry_count", mode="before")
-    def validate_entry_count(cls, value):
-        """Flatten & convert entry-count to integer."""
-        return int(value.get("#text"))
-
-
-class JuniperBGPTable(JuniperBase):
-    """Validation model for route-table data."""
-
-    table_name: str
-    destination_count: int
-    total_route_count: int
-    active_route_count: int
-    hidden_route_count: int
-    rt: t.List[JuniperRouteTable]
-
-    def bgp_table(self: "JuniperBGPTable") -> "BGPRouteTable":
-        """Convert the Juniper-specific fields to standard parsed data model."""
-        vrf_parts = self.table_name.split(".")
-        if len(vrf_parts) == 2:
-            vrf = "default"
-        else:
-            vrf = vrf_parts[0]
-
-        routes = []
-        count = 0
-        for table in self.rt:
-            count += table.rt_entry_count
-            prefix = "/".join(str(i) for i in (table.rt_destination, table.rt_prefix_length))
-            for route in table.rt_entry:
-                routes.append(
-                    {
-                        "prefix": prefix,
-                        "active": route.active_tag,
-                        "age": route.age,
-                        "weight": route.preference,
-                        "med": route.metric,
-                        "local_preference": route.local_preference,
-                        "as_path": route.as_path,
-                        "communities": route.communities,
-                        "next_hop": route.next_hop,
-                        "source_as": route.source_as,
-                        "source_rid": route.source_rid,
-                        "peer_rid": route.peer_rid,
-                        "rpki_state": route.validation_state,
-                    }
-                )
-
-        serialized = BGPRouteTable(vrf=vrf, count=count, routes=routes, winning_weight="low")
-        log.bind(platform="juniper", response=repr(serialized)).debug("Serialized response")
-        return serialized
+                self._parser.Parse("", True)
+            except expat.ExpatError as err:
+                raise ParsingError("Error parsing response data") from err
+        if self.error is not None:
+            raise ParsingError('Error from device: "{error}"', error=self.error)
@@ -7,6 +7,7 @@ from ipaddress import ip_address
 
 # Third Party
 from pydantic import (
+    Field,
     FilePath,
     RedisDsn,
     SecretStr,
@@ -39,6 +40,8 @@ class HyperglassSettings(BaseSettings):
     original_app_path: Path = _default_app_path
 
     debug: bool = False
+    # Share of queries for which debug records are emitted, if debug logging is enabled.
+    debug_sample_rate: float = Field(1.0, ge=0, le=1)
     dev_mode: bool = False
     disable_ui: bool = False
     app_path: DirectoryPath = _default_app_path
@@ -71,6 +74,7 @@ class HyperglassSettings(BaseSettings):
         params = sorted(
             (
                 "debug",
+                "debug_sample_rate",
                 "dev_mode",
                 "app_path",
                 "redis_host",
@@ -0,0 +1,112 @@
+"""Test BGP route table sorting & merging."""
+
+# Standard Library
+import typing as t
+
+# Third Party
+import pytest
+
+# Project
+from hyperglass.state import use_state
+
+# Local
+from ..config.params import Params
+from ..data.bgp_route import BGPRoute, BGPRouteTable, route_sort_key
+
+if t.TYPE_CHECKING:
+    # Project
+    from hyperglass.state import HyperglassState
+
+ROUTE = {
+    "active": True,
+    "age": 100,
+    "weight": 100,
+    "med": 0,
+    "local_preference": 100,
+    "as_path": [65000],
+    "communities": [],
+    "next_hop": "192.0.2.1",
+    "source_as": 65000,
+    "source_rid": "192.0.2.1",
+    "peer_rid": "192.0.2.1",
+    "rpki_state": 3,
+}
+
+
+@pytest.fixture
+def state() -> t.Generator["HyperglassState", None, None]:
+    """Test fixture to initialize Redis store."""
+    _state = use_state()
+    with _state.cache.pipeline() as pipeline:
+        pipeline.set("params", Params())
+    yield _state
+    _state.clear()
+
+
+def _table(*prefixes: str) -> BGPRouteTable:
+    routes = [{**ROUTE, "prefix": prefix} for prefix in prefixes]
+    return BGPRouteTable(vrf="default", count=len(routes), routes=routes, winning_weight="high")
+
+
+def _prefixes(table: BGPRouteTable) -> t.List[str]:
+    return [route.prefix for route in table.routes]
+
+
+def test_route_sort_key():
+    prefixes = ["2001:db8::/32", "not-a-prefix", "10.0.0.0/8", "9.0.0.0/8", "10.0.0.0/16"]
+    assert sorted(prefixes, key=route_sort_key) == [
+        "9.0.0.0/8",
+        "10.0.0.0/8",
+        "10.0.0.0/16",
+        "2001:db8::/32",
+        "not-a-prefix",
+    ]
+
+
+def test_table_sorting(state):
+    table = _table("2001:db8::/48", "192.0.2.0/24", "2001:db8::/32", "10.0.0.0/8", "9.0.0.0/8")
+    # Prefixes are sorted numerically, not lexically ('9' > '1'), IPv4 before IPv6, and shorter
+    # prefixes of the same network first.
+    assert _prefixes(table) == [
+        "9.0.0.0/8",
+        "10.0.0.0/8",
+        "192.0.2.0/24",
+        "2001:db8::/32",
+        "2001:db8::/48",
+    ]
+
+
+def test_merge(state):
+    first = _table("10.0.0.0/8", "192.0.2.0/24", "2001:db8::/32")
+    second = _table("9.0.0.0/8", "10.0.0.0/16")
+    third = _table("198.51.100.0/24", "2001:db8::/48")
+
+    merged = BGPRouteTable.merge(first, second, third)
+    assert _prefixes(merged) == [
+        "9.0.0.0/8",
+        "10.0.0.0/8",
+        "10.0.0.0/16",
+        "192.0.2.0/24",
+        "198.51.100.0/24",
+        "2001:db8::/32",
+        "2001:db8::/48",
+    ]
+    assert merged.count == 7
+    assert merged.vrf == "default"
+    assert merged.winning_weight == "high"
+    assert all(isinstance(route, BGPRoute) for route in merged.routes)
+
+
+def test_add(state):
+    first = _table("192.0.2.0/24", "2001:db8::/32")
+    second = _table("10.0.0.0/8")
+
+    merged = first + second
+    assert _prefixes(merged) == ["10.0.0.0/8", "192.0.2.0/24", "2001:db8::/32"]
+    assert merged.count == 3
+    # Neither operand is changed.
+    assert _prefixes(first) == ["192.0.2.0/24", "2001:db8::/32"]
+    assert first.count == 2
+    assert _prefixes(second) == ["10.0.0.0/8"]
+    assert second.count == 1
+    assert merged is not first and merged is not second
@@ -0,0 +1,91 @@
+"""Test directive rule validation."""
+
+# Third Party
+import pytest
+
+# Project
+from hyperglass.exceptions.private import InputValidationError
+
+# Local
+from ..directive import Directive, CommandTemplate, RuleWithPattern
+
+FIELD = {"description": "Target"}
+
+
+def _directive(*rules, multiple=False):
+    return Directive(id="test", name="Test", rules=list(rules), field=FIELD, multiple=multiple)
+
+
+def _error(directive, target):
+    with pytest.raises(InputValidationError) as err:
+        directive.validate_target(target)
+    return err.value.kwargs["error"]
+
+
+def test_directive_ip_rules():
+    directive = _directive(
+        {"condition": "192.0.2.0/25", "action": "deny", "ge": 25, "le": 32},
+        {"condition": "192.0.2.0/24", "ge": 24, "le": 32},
+        {"condition": "10.0.0.0/8", "ge": 8, "le": 24},
+        {"condition": "2001:db8::/32", "ge": 32, "le": 128},
+    )
+    assert directive.validate_target("192.0.2.200").rules == (directive.rules[1],)
+    assert directive.validate_target("192.0.2.0/24").rules == (directive.rules[1],)
+    assert directive.validate_target("10.1.0.0/16").rules == (directive.rules[2],)
+    match = directive.validate_target(["2001:db8::1"])
+    assert match == ((directive.rules[3],), "2001:db8::1", (3,))
+    assert _error(directive, "192.0.2.1").startswith("Member of denied network")
+    assert _error(directive, "10.1.2.3").startswith("Prefix-length is not within range")
+    assert _error(directive, "198.51.100.1") == "No matched validation rules"
+    assert _error(directive, ["192.0.2.1", "10.1.2.3"]) == "Target must be a single value"
+    assert "does not appear to be" in _error(directive, "not-an-ip")
+
+
+def test_directive_rule_order():
+    directive = _directive(
+        {"condition": "^192\\.0\\.2\\.", "action": "deny"},
+        {"condition": "192.0.2.0/24", "ge": 24, "le": 32},
+        {"condition": "^target$"},
+    )
+    assert _error(directive, "192.0.2.1") == "Denied"
+    # The IP rule rejects targets that aren't an IP prefix before later rules are evaluated.
+    assert "does not appear to be" in _error(directive, "target")
+
+    directive = _directive(
+        {"condition": "192.0.2.0/24", "ge": 24, "le": 32},
+        {"condition": "*", "action": "deny"},
+    )
+    assert directive.validate_target("192.0.2.1").rules == (directive.rules[0],)
+
+
+def test_directive_pattern_rules():
+    directive = _directive(
+        {"condition": "^65000:", "action": "deny"},
+        {"condition": "^\\d+:\\d+$"},
+        multiple=True,
+    )
+    assert directive.validate_target("65001:1") == ((directive.rules[1],), "65001:1", (1,))
+    match = directive.validate_target(["65001:1", "65002:2"])
+    assert match == ((directive.rules[1],), ["65001:1", "65002:2"], (1,))
+    assert _error(directive, ["65000:1", "65001:1"]) == "Denied"
+    assert _error(directive, "abc") == "No matched validation rules"
+
+
+def test_invalid_pattern():
+    with pytest.raises(ValueError):
+        RuleWithPattern(condition="^(unclosed")
+
+
+def test_command_template():
+    attrs = {"source4": "192.0.2.1", "vrf": "{default}"}
+    template = CommandTemplate("ping {target} source {source4} vrf {vrf} {{raw}}", attrs)
+    assert template.uses_mask is False
+    expected = "ping 198.51.100.1 source 192.0.2.1 vrf {default} {raw}"
+    assert template.render("198.51.100.1") == expected
+
+    template = CommandTemplate("show ip route {target} {mask}", attrs)
+    assert template.uses_mask is True
+    assert template.render("10.0.0.0", "255.0.0.0") == "show ip route 10.0.0.0 255.0.0.0"
+
+    with pytest.raises(KeyError):
+        CommandTemplate("ping {target} source {source6}", attrs)
@@ -0,0 +1,64 @@
+"""Test FRRouting route parsing."""
+
+# Standard Library
+import json
+import typing as t
+from pathlib import Path
+from datetime import datetime
+
+# Third Party
+import pytest
+
+# Project
+from hyperglass.state import use_state
+
+# Local
+from ..parsing import frr
+from ..config.params import Params
+
+if t.TYPE_CHECKING:
+    # Project
+    from hyperglass.state import HyperglassState
+
+SAMPLE = Path(__file__).parent.parent.parent.parent / ".samples" / "frr_bgp_route.json"
+
+
+class _FrozenDatetime(datetime):
+    """Route ages are relative to the current time, so it's frozen to compare parsed results."""
+
+    @classmethod
+    def utcnow(cls):
+        return cls(2024, 1, 1)
+
+
+@pytest.fixture
+def state() -> t.Generator["HyperglassState", None, None]:
+    """Test fixture to initialize Redis store."""
+    _state = use_state()
+    with _state.cache.pipeline() as pipeline:
+        pipeline.set("params", Params())
+    yield _state
+    _state.clear()
+
+
+def test_frr_route(state, monkeypatch):
+    monkeypatch.setattr(frr, "datetime", _FrozenDatetime)
+    sample = SAMPLE.read_text()
+
+    route = frr.FRRRoute.model_validate_json(sample)
+    # Raw JSON & decoded data are both reshaped by the `before` validator.
+    assert route == frr.FRRRoute.model_validate(json.loads(sample))
+    assert route.prefix == "1.1.1.0/24"
+    assert len(route.paths) == 4
+
+    first, *_, last = route.paths
+    assert first.aspath == [174, 13335]
+    assert first.community[0] == "174:21001"
+    assert first.last_update == 1588417118
+    assert first.bestpath is False
+    assert last.bestpath is True
+
+    table = route.serialize()
+    assert table.count == 4
+    assert [r.active for r in table.routes] == [False, False, False, True]
+    assert table.model_dump() == route.serialize(strict=False).model_dump()
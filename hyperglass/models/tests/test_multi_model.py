@@ -46,3 +46,15 @@ def test_multi_model():
     model.add(*ITEMS_3, unique_by="id")
     assert model.count == 6
     assert model["item1"].name == "Item New One"
+
+
+def test_multi_model_index():
+    model = Items(*ITEMS_1)
+    assert "item2" in model
+    assert "item4" not in model
+    assert model.get("item3").name == "Item Three"
+    assert model.get("item4") is None
+    model.add(*ITEMS_3, unique_by="id")
+    assert model.get("item1").name == "Item New One"
+    assert model.get("item6").name == "Item Six"
+    assert model.filter("item2", "item6").ids == ("item2", "item6")
@@ -0,0 +1,27 @@
+"""Test structured data configuration."""
+
+# Local
+from ..config.structured import StructuredCommunities
+
+COMMUNITIES = ["65000:1234", "65000:4321", "65000:2345", "1234:1", "1234:10", "65001:100:1"]
+
+
+def test_community_deny():
+    communities = StructuredCommunities(mode="deny", items=[r"^65000:1\d+$", "65000:2345"])
+    assert communities.filter(COMMUNITIES) == ["65000:4321", "1234:1", "1234:10", "65001:100:1"]
+
+
+def test_community_permit():
+    communities = StructuredCommunities(mode="permit", items=["^65000:.*$", "1234:1"])
+    assert communities.filter(COMMUNITIES) == ["65000:1234", "65000:4321", "65000:2345", "1234:1"]
+
+
+def test_community_empty():
+    assert StructuredCommunities(mode="permit").filter(COMMUNITIES) == []
+    assert StructuredCommunities(mode="deny").filter(COMMUNITIES) == COMMUNITIES
+
+
+def test_community_uncombined():
+    # Inline global flags can't be combined with other patterns.
+    communities = StructuredCommunities(mode="permit", items=["(?i)^65001:", "65000:.+4$"])
+    assert communities.filter(COMMUNITIES) == ["65000:1234", "65001:100:1"]
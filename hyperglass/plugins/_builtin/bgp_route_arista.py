@@ -9,8 +9,10 @@ from pydantic import PrivateAttr, ValidationError
 
 # Project
 from hyperglass.log import log
+from hyperglass.state import use_state
 from hyperglass.exceptions.private import ParsingError
-from hyperglass.models.parsing.arista_eos import AristaBGPTable
+from hyperglass.models.data.bgp_route import BGPRouteTable
+from hyperglass.models.parsing.arista_eos import AristaBGPTable, AristaBGPResponse
 
 # Local
 from .._output import OutputPlugin
@@ -24,14 +26,23 @@ if t.TYPE_CHECKING:
     from .._output import OutputType
 
 
-def parse_arista(output: t.Sequence[str]) -> "OutputDataModel":
-    """Parse a Arista BGP JSON response."""
-    result = None
+def parse_arista(output: t.Sequence[str], strict: bool = False) -> "OutputDataModel":
+    """Parse a Arista BGP JSON response.
+
+    Unless `strict` is true, the raw JSON is validated directly into the parsing models, and the
+    resulting routes are not validated a second time.
+    """
+    tables = []
 
     _log = log.bind(plugin=BGPRoutePluginArista.__name__)
 
     for response in output:
         try:
+            if not strict:
+                validated = AristaBGPResponse.model_validate_json(response)
+                tables.append(validated.bgp_table(strict=False))
+                continue
+
             parsed: t.Dict = json.loads(response)
 
             _log.debug("Pre-parsed data", data=parsed)
@@ -42,10 +53,7 @@ def parse_arista(output: t.Sequence[str]) -> "OutputDataModel":
             validated = AristaBGPTable(**routes)
             bgp_table = validated.bgp_table()
 
-            if result is None:
-                result = bgp_table
-            else:
-                result += bgp_table
+            tables.append(bgp_table)
 
         except json.JSONDecodeError as err:
             _log.bind(error=str(err)).critical("Failed to decode JSON")
@@ -63,7 +71,15 @@ def parse_arista(output: t.Sequence[str]) -> "OutputDataModel":
             _log.critical(err)
             raise ParsingError(err.errors()) from err
 
-    return result
+        except ValueError as err:
+            _log.critical(err)
+            raise ParsingError("Error parsing response data") from err
+
+    if len(tables) == 0:
+        return None
+
+    # Tables from each command are merged once, after all responses are parsed.
+    return BGPRouteTable.merge(*tables)
 
 
 class BGPRoutePluginArista(OutputPlugin):
@@ -88,5 +104,6 @@ class BGPRoutePluginArista(OutputPlugin):
             )
         )
         if should_process:
-            return parse_arista(output)
+            strict = use_state("params").structured.strict_parsing
+            return parse_arista(output, strict=strict)
         return output
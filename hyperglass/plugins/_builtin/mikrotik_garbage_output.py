@@ -18,6 +18,44 @@ if t.TYPE_CHECKING:
     from hyperglass.models.api.query import Query
 
 
+# ANSI escapes that aren't caught by Netmiko, after whitespace is normalized.
+ANSI_ESCAPE = re.compile(r"\\x1b\[\S{2}\s")
+# ANSI escapes left in a repeated column row.
+COLUMN_ESCAPE = re.compile(r"\[\S{2}\s")
+# Mikrotik's unhelpful pager helpers.
+PAGER_PROMPT = "[Q quit|D dump|C-z pause]"
+# Last word of a column row with no rows.
+EMPTY_TABLE_COLUMNS = ("DISTANCE", "STATUS")
+
+
+def _normalize(line: str) -> str:
+    # Remove all the newline characters (which differ line to line) for comparison purposes.
+    return " ".join(line.split())
+
+
+def clean_mikrotik_output(output: str) -> str:
+    """Remove repeated column rows & pager helpers from Mikrotik output in a single pass."""
+    first, *lines = output.splitlines()
+    column_line = column_key = _normalize(first)
+    rows = []
+
+    for line in lines:
+        normalized = _normalize(line)
+        if "\\x1b" in normalized:
+            normalized = ANSI_ESCAPE.sub("", normalized)
+
+        if column_key in normalized:
+            # Mikrotik often re-inserts the column row in the output, effectively
+            # 'starting over'. In that case, use that column row & only the rows after it.
+            column_line = COLUMN_ESCAPE.sub("", line)
+            column_key = _normalize(column_line)
+            rows.clear()
+        elif PAGER_PROMPT not in normalized:
+            rows.append(line)
+
+    return "\n".join((column_line, *rows))
+
+
 class MikrotikGarbageOutput(OutputPlugin):
     """Parse Mikrotik output to remove garbage."""
 
@@ -37,46 +75,13 @@ class MikrotikGarbageOutput(OutputPlugin):
         result = ()
 
         for each_output in output:
-            if len(each_output) != 0:
-                if each_output.split()[-1] in ("DISTANCE", "STATUS"):
-                    # Mikrotik shows the columns with no rows if there is no data.
-                    # Rather than send back an empty table, send back an empty
-                    # response which is handled with a warning message.
-                    each_output = ""
-                else:
-                    remove_lines = ()
-                    all_lines = each_output.splitlines()
-                    # Starting index for rows (after the column row).
-                    start = 1
-                    # Extract the column row.
-                    column_line = " ".join(all_lines[0].split())
-
-                    for i, line in enumerate(all_lines[1:]):
-                        # Remove all the newline characters (which differ line to
-                        # line) for comparison purposes.
-                        normalized = " ".join(line.split())
-
-                        # Remove ansii characters that aren't caught by Netmiko.
-                        normalized = re.sub(r"\\x1b\[\S{2}\s", "", normalized)
-
-                        if column_line in normalized:
-                            # Mikrotik often re-inserts the column row in the output,
-                            # effectively 'starting over'. In that case, re-assign
-                            # the column row and starting index to that point.
-                            column_line = re.sub(r"\[\S{2}\s", "", line)
-                            start = i + 2
-
-                        if "[Q quit|D dump|C-z pause]" in normalized:
-                            # Remove Mikrotik's unhelpful helpers from the output.
-                            remove_lines += (i + 1,)
-
-                    # Combine the column row and the data rows from the starting
-                    # index onward.
-                    lines = [column_line, *all_lines[start:]]
-
-                    # Remove any lines marked for removal and re-join with a single
-                    # newline character.
-                    lines = [line for idx, line in enumerate(lines) if idx not in remove_lines]
-                    result += ("\n".join(lines),)
+            # Only the last word is needed, so the whole output isn't split.
+            last = each_output.rsplit(None, 1)[-1:]
+            if len(last) == 0 or last[0] in EMPTY_TABLE_COLUMNS:
+                # Mikrotik shows the columns with no rows if there is no data.
+                # Rather than send back an empty table, send back an empty
+                # response which is handled with a warning message.
+                continue
+            result += (clean_mikrotik_output(each_output),)
 
         return result
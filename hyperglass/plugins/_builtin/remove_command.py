@@ -17,6 +17,24 @@ if TYPE_CHECKING:
     from hyperglass.models.api.query import Query
 
 
+def remove_commands(output: str, commands: Sequence[str]) -> str:
+    """Remove everything up to & including the last line containing each command, in order.
+
+    Each command is searched for in the remaining output buffer, rather than line by line.
+    """
+    output = output.strip()
+    start = 0
+    for command in commands:
+        # Lines never contain a newline, so multi-line commands can't match a line.
+        if "\n" in command:
+            continue
+        found = output.rfind(command, start)
+        if found != -1:
+            end = output.find("\n", found + len(command))
+            start = len(output) if end == -1 else end + 1
+    return output[start:]
+
+
 class RemoveCommand(OutputPlugin):
     """Remove anything before the command if found in output."""
 
@@ -25,18 +43,8 @@ class RemoveCommand(OutputPlugin):
     def process(self, *, output: OutputType, query: "Query") -> Sequence[str]:
         """Remove anything before the command if found in output."""
 
-        def _remove_command(output_in: str) -> str:
-            output_out = output_in.strip().split("\n")
-
-            for command in query.device.directive_commands:
-                for line in output_out:
-                    if command in line:
-                        idx = output_out.index(line) + 1
-                        output_out = output_out[idx:]
-
-            return "\n".join(output_out)
-
         if is_series(output):
-            return tuple(_remove_command(o) for o in output)
+            commands = query.device.directive_commands
+            return tuple(remove_commands(o, commands) for o in output)
 
         return output
@@ -5,8 +5,10 @@ import typing as t
 from inspect import isclass
 
 # Project
-from hyperglass.log import log
 from hyperglass.state import use_state
+from hyperglass.log import Lazy, log, debug_enabled
+from hyperglass.tracing import span
+from hyperglass.metrics import PLUGIN_DURATION, timer
 from hyperglass.exceptions.private import PluginError, InputValidationError
 
 # Local
@@ -22,6 +24,10 @@ if t.TYPE_CHECKING:
 PluginT = t.TypeVar("PluginT", bound=HyperglassPlugin)
 
 
+PluginChain = t.Tuple[PluginT, ...]
+ChainKey = t.Tuple[str, ...]
+
+
 class PluginManager(t.Generic[PluginT]):
     """Manage all plugins."""
 
@@ -29,6 +35,7 @@ class PluginManager(t.Generic[PluginT]):
     _state: "HyperglassState"
     _index: int = 0
     _cache_key: str
+    _chains: t.ClassVar[t.Dict[ChainKey, PluginChain]]
 
     def __init__(self: "PluginManager") -> None:
         """Initialize plugin manager."""
@@ -41,6 +48,8 @@ class PluginManager(t.Generic[PluginT]):
         if _type is None:
             raise PluginError("Plugin '{}' is missing a 'type', keyword argument", repr(cls))
         cls._type = _type
+        # Each manager type keeps its own compiled plugin chains in process memory.
+        cls._chains = {}
         return super().__init_subclass__()
 
     def __iter__(self: "PluginManager") -> "PluginManager":
@@ -49,29 +58,56 @@ class PluginManager(t.Generic[PluginT]):
 
     def __next__(self: "PluginManager") -> PluginT:
         """Plugin manager iteration."""
-        if self._index <= len(self.plugins()):
-            result = self.plugins()[self._index - 1]
+        plugins = self._ordered()
+        if self._index < len(plugins):
+            result = plugins[self._index]
             self._index += 1
             return result
         self._index = 0
         raise StopIteration
 
+    def _ordered(self: "PluginManager") -> PluginChain:
+        """Get all plugins, sorted once and held in memory until registrations change."""
+        # The empty key never collides with a directive or platform chain key.
+        key = ()
+        ordered = self._chains.get(key)
+        if ordered is None:
+            # Sort plugins by their name attribute, which is the name of the class by default,
+            # with built-in plugins last.
+            ordered = tuple(
+                sorted(
+                    self._state.plugins(self._type),
+                    key=lambda p: (p._hyperglass_builtin, str(p)),
+                )
+            )
+            self._chains[key] = ordered
+        return ordered
+
+    def _compile(
+        self: "PluginManager", key: ChainKey, predicate: t.Callable[[PluginChain], PluginChain]
+    ) -> PluginChain:
+        """Get or build the plugin chain for `key` from all ordered plugins."""
+        chain = self._chains.get(key)
+        if chain is None:
+            chain = predicate(self._ordered())
+            self._chains[key] = chain
+            log.bind(type=self._type, key=key, plugins=[p.name for p in chain]).debug(
+                "Compiled plugin chain"
+            )
+        return chain
+
+    def _invalidate(self: "PluginManager") -> None:
+        """Drop all compiled plugin chains so they are rebuilt on next use."""
+        self._chains.clear()
+
     def plugins(self: "PluginManager", *, builtins: bool = True) -> t.List[PluginT]:
         """Get all plugins, with built-in plugins last."""
-        plugins = self._state.plugins(self._type)
+        plugins = self._ordered()
 
         if builtins is False:
-            plugins = [p for p in plugins if p._hyperglass_builtin is False]
-
-        # Sort plugins by their name attribute, which is the name of the class by default.
-        sorted_by_name = sorted(plugins, key=lambda p: str(p))
+            return [p for p in plugins if p._hyperglass_builtin is False]
 
-        # Sort with built-in plugins last.
-        return sorted(
-            sorted_by_name,
-            key=lambda p: -1 if p._hyperglass_builtin else 1,
-            reverse=True,
-        )
+        return list(plugins)
 
     @property
     def name(self: PluginT) -> str:
@@ -94,13 +130,14 @@ class PluginManager(t.Generic[PluginT]):
         """Remove all plugins."""
         self._index = 0
         self._state.reset_plugins(self._type)
+        self._invalidate()
 
     def unregister(self: "PluginManager", plugin: PluginT) -> None:
         """Remove a plugin from currently active plugins."""
         if isclass(plugin):
             if issubclass(plugin, HyperglassPlugin):
                 self._state.remove_plugin(self._type, plugin)
-
+                self._invalidate()
                 return
         raise PluginError("Plugin '{}' is not a valid hyperglass plugin", repr(plugin))
 
@@ -111,6 +148,7 @@ class PluginManager(t.Generic[PluginT]):
             if issubclass(plugin, HyperglassPlugin):
                 instance = plugin(*args, **kwargs)
                 self._state.add_plugin(self._type, instance)
+                self._invalidate()
                 _log = log.bind(type=self._type, name=instance.name)
                 if instance._hyperglass_builtin is True:
                     _log.debug("Registered built-in plugin")
@@ -129,16 +167,21 @@ class PluginManager(t.Generic[PluginT]):
 class InputPluginManager(PluginManager[InputPlugin], type="input"):
     """Manage Input Validation Plugins."""
 
-    def _gather_plugins(
-        self: "InputPluginManager", query: "Query"
-    ) -> t.Generator[InputPlugin, None, None]:
-        for plugin in self.plugins(builtins=True):
-            if plugin.directives and query.directive.id in plugin.directives:
-                yield plugin
-            if plugin.ref in query.directive.plugins:
-                yield plugin
-            if plugin.common is True:
-                yield plugin
+    def _gather_plugins(self: "InputPluginManager", query: "Query") -> PluginChain:
+        directive = query.directive
+
+        def gather(plugins: PluginChain) -> PluginChain:
+            chain = ()
+            for plugin in plugins:
+                if plugin.directives and directive.id in plugin.directives:
+                    chain += (plugin,)
+                if plugin.ref in directive.plugins:
+                    chain += (plugin,)
+                if plugin.common is True:
+                    chain += (plugin,)
+            return chain
+
+        return self._compile((directive.id,), gather)
 
     def validate(self: "InputPluginManager", query: "Query") -> InputPluginValidationReturn:
         """Execute all input validation plugins.
@@ -147,7 +190,8 @@ class InputPluginManager(PluginManager[InputPlugin], type="input"):
         """
         result = None
         for plugin in self._gather_plugins(query):
-            result = plugin.validate(query)
+            with timer(PLUGIN_DURATION, plugin=plugin.name, type=self._type):
+                result = plugin.validate(query)
             result_test = "valid" if result is True else "invalid" if result is False else "none"
             log.bind(name=plugin.name, result=result_test).debug("Input Plugin Validation")
             if result is False:
@@ -162,8 +206,9 @@ class InputPluginManager(PluginManager[InputPlugin], type="input"):
         """Execute all input transformation plugins."""
         result = query.query_target
         for plugin in self._gather_plugins(query):
-            result = plugin.transform(query=query.summary())
-            log.bind(name=plugin.name, result=repr(result)).debug("Input Plugin Transform")
+            with timer(PLUGIN_DURATION, plugin=plugin.name, type=self._type):
+                result = plugin.transform(query=query.summary())
+            log.bind(name=plugin.name, result=Lazy(repr, result)).debug("Input Plugin Transform")
         return result
 
 
@@ -176,16 +221,30 @@ class OutputPluginManager(PluginManager[OutputPlugin], type="output"):
         The result of each plugin is passed to the next plugin.
         """
         result = output
-        directives = (
-            plugin
-            for plugin in self.plugins()
-            if query.directive.id in plugin.directives and query.device.platform in plugin.platforms
-        )
-        common = (plugin for plugin in self.plugins() if plugin.common is True)
-        for plugin in (*directives, *common):
-            log.bind(plugin=plugin.name, value=result).debug("Output Plugin Starting Value")
-            result = plugin.process(output=result, query=query)
-            log.bind(plugin=plugin.name, value=result).debug("Output Plugin Ending Value")
+        directive_id = query.directive.id
+        platform = query.device.platform
+
+        def gather(plugins: PluginChain) -> PluginChain:
+            directives = tuple(
+                plugin
+                for plugin in plugins
+                if directive_id in plugin.directives and platform in plugin.platforms
+            )
+            common = tuple(plugin for plugin in plugins if plugin.common is True)
+            return (*directives, *common)
+
+        # Outputs can be large, so they're only bound to debug records that are emitted.
+        debug = debug_enabled()
+        for plugin in self._compile((directive_id, platform), gather):
+            if debug:
+                log.bind(plugin=plugin.name, value=result).debug("Output Plugin Starting Value")
+            with (
+                timer(PLUGIN_DURATION, plugin=plugin.name, type=self._type),
+                span("plugins", plugin=plugin.name),
+            ):
+                result = plugin.process(output=result, query=query)
+            if debug:
+                log.bind(plugin=plugin.name, value=result).debug("Output Plugin Ending Value")
 
             if result is False:
                 return result
@@ -0,0 +1,254 @@
+"""Parser & output plugin benchmark cases.
+
+Each case generates realistic device output of a given number of routes (or table rows) from the
+samples in `.samples`, and runs a structured parser or built-in output plugin over it.
+"""
+
+# Standard Library
+import gc
+import re
+import sys
+import json
+import time
+import typing as t
+import platform
+import tracemalloc
+from pathlib import Path
+from ipaddress import IPv4Address
+
+# Project
+from hyperglass.models.parsing.frr import FRRRoute
+
+# Local
+from .._builtin.remove_command import RemoveCommand
+from .._builtin.bgp_route_arista import parse_arista
+from .._builtin.bgp_route_huawei import parse_huawei
+from .._builtin.bgp_route_juniper import parse_juniper
+from .._builtin.mikrotik_garbage_output import MikrotikGarbageOutput
+
+SAMPLES = Path(__file__).parent.parent.parent.parent / ".samples"
+BASELINE = Path(__file__).parent / "benchmarks.json"
+
+# Number of routes (or table rows) in each generated output.
+SIZES = {"small": 10, "medium": 500, "huge": 5000}
+
+# Factor by which a result may be worse than its baseline before it's reported.
+TOLERANCE = 1.5
+
+JUNIPER_RT = re.compile(r'<rt junos:style="detail">.*?</rt>', re.DOTALL)
+JUNIPER_DESTINATION = re.compile(r"(<rt-destination>\s*)[^<\s]+")
+JUNIPER_PREFIX_LENGTH = re.compile(r"(<rt-prefix-length>\s*)\d+")
+HUAWEI_ENTRY = " BGP routing table entry information of "
+MIKROTIK_COLUMNS = "Flags: X - disabled, A - active  DST-ADDRESS  GATEWAY  DISTANCE"
+MIKROTIK_PAGER = "-- [Q quit|D dump|C-z pause]"
+COMMAND = "show route 10.0.0.0/8"
+# A device's other commands, which don't match the output but are still searched for.
+OTHER_COMMANDS = tuple(f"show command {idx}" for idx in range(50))
+
+Output = t.Tuple[str, ...]
+
+
+class BenchmarkCase(t.NamedTuple):
+    """Output generator & parser or plugin to benchmark."""
+
+    name: str
+    unit: str
+    generate: t.Callable[[int], Output]
+    run: t.Callable[[Output], t.Any]
+    count: t.Callable[[t.Any], int]
+
+
+def _address(idx: int) -> str:
+    return str(IPv4Address(0x0A000000 + (idx << 8)))
+
+
+def _sample(name: str) -> str:
+    return (SAMPLES / name).read_text()
+
+
+def juniper_output(size: int) -> Output:
+    """Generate a Juniper route XML response with `size` destinations."""
+    sample = _sample("juniper_route_aspath.xml")
+    blocks = JUNIPER_RT.findall(sample)
+    first, *_, last = JUNIPER_RT.finditer(sample)
+    routes = []
+    for idx in range(size):
+        block = JUNIPER_DESTINATION.sub(rf"\g<1>{_address(idx)}", blocks[idx % len(blocks)], 1)
+        routes.append(JUNIPER_PREFIX_LENGTH.sub(r"\g<1>24", block, 1))
+    return (sample[: first.start()] + "\n".join(routes) + sample[last.end() :],)
+
+
+def arista_output(size: int) -> Output:
+    """Generate an Arista route JSON response with `size` prefixes."""
+    sample = json.loads(_sample("arista_route.json"))
+    vrf = sample["vrfs"]["default"]
+    entry = next(iter(vrf["bgpRouteEntries"].values()))
+    vrf["bgpRouteEntries"] = {f"{_address(idx)}/24": entry for idx in range(size)}
+    return (json.dumps(sample),)
+
+
+def frr_output(size: int) -> Output:
+    """Generate `size` FRR route JSON responses, one per prefix."""
+    sample = json.loads(_sample("frr_bgp_route.json"))
+    return tuple(json.dumps({**sample, "prefix": f"{_address(idx)}/24"}) for idx in range(size))
+
+
+def huawei_output(size: int) -> Output:
+    """Generate a Huawei route detail response with `size` routes."""
+    header, *entries = _sample("huawei_route.txt").split(HUAWEI_ENTRY)
+    routes = []
+    for idx in range(size):
+        _, rest = entries[idx % len(entries)].split(":", 1)
+        routes.append(f"{HUAWEI_ENTRY}{_address(idx)}/24:{rest}")
+    return (header + "".join(routes),)
+
+
+def mikrotik_output(size: int) -> Output:
+    """Generate a Mikrotik route table with `size` rows, paged every 100 rows."""
+    lines = [MIKROTIK_COLUMNS]
+    for idx in range(size):
+        lines.append(f" {idx} A {_address(idx)}/24  198.51.100.1  1")
+        if idx % 100 == 99:
+            lines.append(MIKROTIK_PAGER)
+    return ("\n".join(lines),)
+
+
+def command_output(size: int) -> Output:
+    """Generate CLI output with `size` rows, preceded by the echoed command."""
+    rows = (f"{_address(idx)}/24 via 198.51.100.1, 10d12h, metric 0" for idx in range(size))
+    return ("\n".join((f"router> {COMMAND}", *rows)),)
+
+
+def _frr(output: Output) -> int:
+    return sum(FRRRoute.model_validate_json(o).serialize(strict=False).count for o in output)
+
+
+def _plugin_query(*commands: str) -> t.Any:
+    device = type("Device", (), {"directive_commands": list(commands)})
+    return type("Query", (), {"device": device})
+
+
+def _lines(output: Output) -> int:
+    return sum(o.count("\n") + 1 for o in output)
+
+
+CASES = (
+    BenchmarkCase("juniper", "routes", juniper_output, parse_juniper, lambda r: r.count),
+    BenchmarkCase("arista", "routes", arista_output, parse_arista, lambda r: r.count),
+    BenchmarkCase("frr", "routes", frr_output, _frr, lambda r: r),
+    BenchmarkCase("huawei", "routes", huawei_output, parse_huawei, lambda r: r.count),
+    BenchmarkCase(
+        "mikrotik_garbage_output",
+        "lines",
+        mikrotik_output,
+        lambda output: MikrotikGarbageOutput().process(output=output, query=None),
+        _lines,
+    ),
+    BenchmarkCase(
+        "remove_command",
+        "lines",
+        command_output,
+        lambda output: RemoveCommand().process(
+            output=output, query=_plugin_query(*OTHER_COMMANDS, COMMAND)
+        ),
+        _lines,
+    ),
+)
+
+
+def measure(case: BenchmarkCase, size: str, rounds: int = 3) -> t.Dict[str, t.Any]:
+    """Measure a case's throughput, peak memory & the memory blocks retained by its result.
+
+    Throughput is taken from the fastest of `rounds` runs. Peak memory is measured in a separate
+    run, since tracing allocations slows the run down. Retained blocks include allocator & cache
+    noise, so they're reported for information only.
+    """
+    output = case.generate(SIZES[size])
+    units = case.count(case.run(output))
+
+    elapsed = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        case.run(output)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    result = case.run(output)
+    retained = sys.getallocatedblocks() - blocks
+    del result
+
+    tracemalloc.start()
+    try:
+        case.run(output)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "unit": case.unit,
+        "units": units,
+        "input_bytes": sum(len(o) for o in output),
+        "per_second": round(units / elapsed),
+        "peak_memory": peak,
+        "retained_blocks": max(retained, 0),
+    }
+
+
+def python_version() -> str:
+    """Get the Python implementation & version results are comparable with."""
+    return f"{platform.python_implementation()} {sys.version_info.major}.{sys.version_info.minor}"
+
+
+def load_baseline() -> t.Dict[str, t.Any]:
+    """Get the committed baseline results."""
+    if not BASELINE.exists():
+        return {"python": python_version(), "cases": {}}
+    return json.loads(BASELINE.read_text())
+
+
+def save_baseline(results: t.Dict[str, t.Dict[str, t.Any]]) -> None:
+    """Update the committed baseline with new results."""
+    baseline = load_baseline()
+    if baseline["python"] != python_version():
+        # Results from another Python version aren't comparable, so they're replaced.
+        baseline = {"python": python_version(), "cases": {}}
+    baseline["cases"].update(results)
+    baseline["cases"] = dict(sorted(baseline["cases"].items()))
+    BASELINE.write_text(json.dumps(baseline, indent=2) + "\n")
+
+
+def regressions(
+    result: t.Dict[str, t.Any], baseline: t.Optional[t.Dict[str, t.Any]]
+) -> t.List[str]:
+    """Compare a result's peak memory with its baseline, if there is one.
+
+    Peak memory doesn't depend on the machine, so it's always compared. Retained blocks aren't
+    compared.
+    """
+    if baseline is None or baseline["units"] != result["units"]:
+        return []
+    errors = []
+    if result["peak_memory"] > baseline["peak_memory"] * TOLERANCE:
+        errors.append(
+            "peak_memory increased from {} to {}".format(
+                baseline["peak_memory"], result["peak_memory"]
+            )
+        )
+    return errors
+
+
+def slowdown(
+    result: t.Dict[str, t.Any], baseline: t.Optional[t.Dict[str, t.Any]]
+) -> t.Optional[str]:
+    """Describe a drop in throughput from the baseline, if there is one.
+
+    Throughput depends on the machine, so a drop is only reported, never treated as a regression.
+    """
+    if baseline is None or baseline["units"] != result["units"]:
+        return None
+    if result["per_second"] * TOLERANCE < baseline["per_second"]:
+        return "{} per second decreased from {} to {}".format(
+            result["unit"], baseline["per_second"], result["per_second"]
+        )
+    return None
@@ -0,0 +1,72 @@
+"""Parser & Output Plugin Benchmarks.
+
+Only small outputs are benchmarked by default. Set `HYPERGLASS_BENCHMARK=1` to benchmark every
+size, or `HYPERGLASS_BENCHMARK=save` to also update the baseline in `benchmarks.json` with the
+results. Peak memory above the baseline fails a case, while lower throughput than the baseline is
+only reported as a warning, since it depends on the machine.
+"""
+
+# flake8: noqa
+# Standard Library
+import os
+import warnings
+
+# Third Party
+import pytest
+
+# Project
+from hyperglass.state import use_state
+from hyperglass.models.config.params import Params
+
+# Local
+from ._benchmark import (
+    CASES,
+    SIZES,
+    measure,
+    slowdown,
+    regressions,
+    load_baseline,
+    save_baseline,
+    python_version,
+)
+
+BENCHMARK = os.environ.get("HYPERGLASS_BENCHMARK", "")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def state():
+    """Test fixture to initialize Redis store."""
+    _state = use_state()
+    with _state.cache.pipeline() as pipeline:
+        pipeline.set("params", Params())
+    yield _state
+    _state.clear()
+
+
+@pytest.fixture(scope="module")
+def results():
+    results = {}
+    yield results
+    if BENCHMARK == "save" and results:
+        save_baseline(results)
+
+
+@pytest.mark.parametrize("size", tuple(SIZES) if BENCHMARK else ("small",))
+@pytest.mark.parametrize("case", CASES, ids=[case.name for case in CASES])
+def test_benchmark(case, size, results, record_property):
+    name = f"{case.name}.{size}"
+    result = measure(case, size, rounds=1 if size == "huge" else 3)
+    results[name] = result
+    for key, value in result.items():
+        record_property(key, value)
+
+    assert result["units"] > 0, f"{name} produced no {case.unit}"
+
+    baseline = load_baseline()
+    # Results from another Python version aren't comparable.
+    cases = baseline["cases"] if baseline["python"] == python_version() else {}
+    slower = slowdown(result, cases.get(name))
+    if slower is not None:
+        warnings.warn(f"{name} {slower}")
+    errors = regressions(result, cases.get(name))
+    assert not errors, f"{name} regressed: " + ", ".join(errors)
@@ -2,12 +2,18 @@
 
 # flake8: noqa
 # Standard Library
+import typing as t
 from pathlib import Path
+from datetime import datetime
 
 # Third Party
 import pytest
 
 # Project
+from hyperglass.state import use_state
+from hyperglass.models.parsing import arista_eos
+from hyperglass.defaults.directives import init_builtin_directives
+from hyperglass.models.config.params import Params
 from hyperglass.models.config.devices import Device
 from hyperglass.models.data.bgp_route import BGPRouteTable
 
@@ -15,6 +21,10 @@ from hyperglass.models.data.bgp_route import BGPRouteTable
 from ._fixtures import MockDevice
 from .._builtin.bgp_route_arista import BGPRoutePluginArista
 
+if t.TYPE_CHECKING:
+    # Project
+    from hyperglass.state import HyperglassState
+
 DEPENDS_KWARGS = {
     "depends": [
         "hyperglass/models/tests/test_util.py::test_check_legacy_fields",
@@ -26,7 +36,26 @@ DEPENDS_KWARGS = {
 SAMPLE = Path(__file__).parent.parent.parent.parent / ".samples" / "arista_route.json"
 
 
-def _tester(sample: str):
+class _FrozenDatetime(datetime):
+    """Route ages are relative to the current time, so it's frozen to compare parsed results."""
+
+    @classmethod
+    def utcnow(cls):
+        return cls(2024, 1, 1)
+
+
+@pytest.fixture
+def state() -> t.Generator["HyperglassState", None, None]:
+    """Test fixture to initialize Redis store."""
+    _state = use_state()
+    with _state.cache.pipeline() as pipeline:
+        pipeline.set("params", Params())
+        pipeline.set("directives", init_builtin_directives())
+    yield _state
+    _state.clear()
+
+
+def _process(sample: str) -> BGPRouteTable:
     plugin = BGPRoutePluginArista()
 
     device = MockDevice(
@@ -42,7 +71,11 @@ def _tester(sample: str):
 
     query = type("Query", (), {"device": device})
 
-    result = plugin.process(output=(sample,), query=query)
+    return plugin.process(output=(sample,), query=query)
+
+
+def _tester(sample: str):
+    result = _process(sample)
     assert isinstance(result, BGPRouteTable), "Invalid parsed result"
     assert hasattr(result, "count"), "BGP Table missing count"
     assert result.count > 0, "BGP Table count is 0"
@@ -53,3 +86,19 @@ def test_arista_route_sample():
     with SAMPLE.open("r") as file:
         sample = file.read()
     return _tester(sample)
+
+
+def test_arista_strict_parsing(state, monkeypatch):
+    monkeypatch.setattr(arista_eos, "datetime", _FrozenDatetime)
+    with SAMPLE.open("r") as file:
+        sample = file.read()
+
+    results = []
+    for strict in (False, True):
+        state.redis.set("params", Params(structured={"strict_parsing": strict}))
+        results.append(_process(sample))
+
+    fast, strict = results
+    assert fast.count > 0
+    # The fast path skips re-validating the routes, but the result must be identical.
+    assert fast.model_dump() == strict.model_dump()
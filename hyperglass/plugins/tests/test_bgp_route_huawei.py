@@ -1,4 +1,4 @@
-"""Arista BGP Route Parsing Tests."""
+"""Huawei BGP Route Parsing Tests."""
 
 # flake8: noqa
 # Standard Library
@@ -42,21 +42,23 @@ def _tester(sample: str):
 
     query = type("Query", (), {"device": device})
 
-    result = plugin.process(output=(sample), query=query)
-    print(type(result), isinstance(result, BGPRouteTable))
+    result = plugin.process(output=(sample,), query=query)
     assert isinstance(result, BGPRouteTable), "Invalid parsed result"
-    # print instance type
     assert hasattr(result, "count"), "BGP Table missing count"
     assert result.count > 0, "BGP Table count is 0"
+    return result
 
 
 @pytest.mark.dependency(**DEPENDS_KWARGS)
 def test_huawei_route_sample():
     with SAMPLE.open("r") as file:
         sample = file.read()
-    return _tester(sample)
-    #     result = parse_huawei(sample)
-    #     assert isinstance(result, BGPRouteTable), "Invalid parsed result"
-    #     assert hasattr(result, "count"), "BGP Table missing count"
-    #     assert result.count > 0, "BGP Table count is 0"
-    # return parse_huawei(sample)
+    result = _tester(sample)
+    active, backup = result.routes
+    assert active.active is True
+    assert active.age == 859828
+    assert active.as_path == [263444, 13335]
+    assert active.peer_rid == "192.0.2.10"
+    assert backup.active is False
+    assert backup.med == 10
+    assert backup.local_preference == 90
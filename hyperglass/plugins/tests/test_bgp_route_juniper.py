@@ -8,7 +8,9 @@ from pathlib import Path
 import pytest
 
 # Project
+from hyperglass.exceptions.private import ParsingError
 from hyperglass.models.data.bgp_route import BGPRouteTable
+from hyperglass.models.parsing.juniper import JuniperRouteParser
 
 # Local
 from ._fixtures import MockDevice
@@ -68,3 +70,32 @@ def test_juniper_bgp_route_aspath():
     with AS_PATH.open("r") as file:
         sample = file.read()
     return _tester(sample)
+
+
+def test_juniper_route_parser_stream():
+    with AS_PATH.open("r") as file:
+        sample = file.read() + "\n{master}\n"
+
+    parser = JuniperRouteParser()
+    routes = parser.feed(sample)
+    parser.close()
+
+    streamed = []
+    parser = JuniperRouteParser()
+    for i in range(0, len(sample), 1024):
+        streamed.extend(parser.feed(sample[i : i + 1024]))
+    parser.close()
+
+    assert len(routes) > 0, "No routes parsed"
+    assert streamed == routes, "Streamed routes differ from routes parsed at once"
+    assert all(isinstance(asn, int) for route in routes for asn in route["as_path"])
+
+
+def test_juniper_route_parser_error():
+    sample = (
+        "<rpc-reply><xnm:error><message>syntax error</message></xnm:error></rpc-reply>\n{master}"
+    )
+    parser = JuniperRouteParser()
+    parser.feed(sample)
+    with pytest.raises(ParsingError, match="syntax error"):
+        parser.close()
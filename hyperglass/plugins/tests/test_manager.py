@@ -0,0 +1,66 @@
+"""Test plugin manager chain compilation."""
+
+# Standard Library
+import typing as t
+
+# Third Party
+import pytest
+
+# Project
+from hyperglass.state import use_state
+
+# Local
+from .._manager import OutputPluginManager
+from .._builtin.remove_command import RemoveCommand
+from .._builtin.mikrotik_garbage_output import MikrotikGarbageOutput
+
+if t.TYPE_CHECKING:
+    # Project
+    from hyperglass.state import HyperglassState
+
+DIRECTIVE = "__hyperglass_mikrotik_bgp_route__"
+
+
+@pytest.fixture
+def state() -> t.Generator["HyperglassState", None, None]:
+    """Test fixture to initialize Redis store."""
+    _state = use_state()
+    manager = OutputPluginManager()
+    manager.reset()
+    yield _state
+    manager.reset()
+    _state.clear()
+
+
+def _query(platform: str) -> t.Any:
+    directive = type("Directive", (), {"id": DIRECTIVE})
+    device = type("Device", (), {"platform": platform, "directive_commands": ()})
+    return type("Query", (), {"directive": directive, "device": device})
+
+
+def test_output_chain(state):
+    manager = OutputPluginManager()
+    manager.register(MikrotikGarbageOutput)
+    manager.register(RemoveCommand, common=True)
+
+    gathered = []
+
+    def gather(plugins):
+        gathered.append(plugins)
+        return plugins
+
+    first = manager._compile((DIRECTIVE, "mikrotik_routeros"), gather)
+    second = manager._compile((DIRECTIVE, "mikrotik_routeros"), gather)
+    assert first is second, "Plugin chain was not reused"
+    assert len(gathered) == 1, "Plugin chain was compiled more than once"
+
+    # Mikrotik plugin only applies to its platform, RemoveCommand is common.
+    assert [p.name for p in manager.plugins()] == ["MikrotikGarbageOutput", "RemoveCommand"]
+    assert manager.execute(output=(), query=_query("mikrotik_routeros")) == ()
+    assert manager.execute(output=(), query=_query("juniper")) == ()
+    assert manager._chains[(DIRECTIVE, "juniper")] == (manager.plugins()[1],)
+
+    # Registration changes drop compiled chains.
+    manager.reset()
+    assert (DIRECTIVE, "mikrotik_routeros") not in manager._chains
+    assert manager.plugins() == []
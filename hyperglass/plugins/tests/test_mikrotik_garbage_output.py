@@ -0,0 +1,29 @@
+"""Mikrotik Garbage Output Plugin Tests."""
+
+# flake8: noqa
+# Local
+from .._builtin.mikrotik_garbage_output import clean_mikrotik_output
+
+COLUMNS = "Flags: X - disabled, A - active  DST-ADDRESS  GATEWAY  DISTANCE"
+PAGER = "-- [Q quit|D dump|C-z pause]"
+
+
+def test_mikrotik_garbage_output():
+    output = "\n".join(
+        (
+            COLUMNS,
+            " 0 A 192.0.2.0/24  198.51.100.1  1",
+            PAGER,
+            COLUMNS.replace("  ", "   "),
+            " 1 A 203.0.113.0/24  198.51.100.2  1",
+            PAGER,
+            " 2 A 198.18.0.0/15  198.51.100.3  1",
+        )
+    )
+    assert clean_mikrotik_output(output) == "\n".join(
+        (
+            COLUMNS.replace("  ", "   "),
+            " 1 A 203.0.113.0/24  198.51.100.2  1",
+            " 2 A 198.18.0.0/15  198.51.100.3  1",
+        )
+    )
@@ -0,0 +1,14 @@
+"""Remove Command Plugin Tests."""
+
+# flake8: noqa
+# Local
+from .._builtin.remove_command import remove_commands
+
+COMMAND = "show route 192.0.2.0/24"
+
+
+def test_remove_command():
+    output = f"\nrouter> {COMMAND}\nroute 1\nrouter> {COMMAND} detail\nroute 2\nroute 3\n"
+    assert remove_commands(output, [COMMAND]) == "route 2\nroute 3"
+    assert remove_commands(output, ["ping 192.0.2.1"]) == output.strip()
+    assert remove_commands(f"router> {COMMAND}", [COMMAND]) == ""
@@ -0,0 +1,205 @@
+"""Opt-in sampling profiler for the query pipeline.
+
+A query is profiled if profiling is enabled & either the request's profiling header matches the
+configured key, or the query is selected by the configured sample rate. While a query is profiled,
+a background thread periodically samples the stack of the thread handling it, which is the worker's
+event loop, so code run by other requests handled concurrently is sampled too.
+
+Profiles are stored in Redis as folded stacks, which can be rendered as a flame graph by tools
+such as `flamegraph.pl` or speedscope, and retrieved with `hyperglass profiles`.
+"""
+
+# Standard Library
+import sys
+import time
+import pickle
+import random
+import secrets
+import typing as t
+import threading
+from contextlib import contextmanager
+
+# Project
+from hyperglass.log import log
+from hyperglass.state import use_state
+
+if t.TYPE_CHECKING:
+    # Standard Library
+    from types import FrameType
+
+    # Project
+    from hyperglass.models.api import Query
+    from hyperglass.models.config.profiling import Profiling
+
+PROFILE_HEADER = "x-hyperglass-profile"
+PROFILE_ID_HEADER = "x-hyperglass-profile-id"
+CACHE_KEY = "hyperglass.profiles"
+
+# Deepest stack sampled, outermost frames are dropped.
+MAX_DEPTH = 128
+
+# Sampled stacks, as `;`-separated frames from outermost to innermost, & their sample counts.
+Stacks = t.Dict[str, int]
+
+
+def _frame_name(frame: "FrameType") -> str:
+    code = frame.f_code
+    return "{}:{}".format(frame.f_globals.get("__name__", "?"), code.co_qualname)
+
+
+def _folded(frame: t.Optional["FrameType"]) -> str:
+    """Fold a stack into a single string."""
+    names = []
+    while frame is not None and len(names) < MAX_DEPTH:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """Sample a thread's stack at an interval, from a background thread."""
+
+    def __init__(self, *, interval: float, thread_id: t.Optional[int] = None) -> None:
+        """Set up the profiler to sample `thread_id`, or the current thread."""
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks: Stacks = {}
+        self.samples = 0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        stack = _folded(frame)
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._start = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._start
+
+    def __enter__(self) -> "SamplingProfiler":
+        """Start sampling."""
+        self.start()
+        return self
+
+    def __exit__(self, *_: t.Any) -> None:
+        """Stop sampling."""
+        self.stop()
+
+
+def should_profile(config: "Profiling", key: t.Optional[str] = None) -> bool:
+    """Determine if a query should be profiled."""
+    if not config.enable:
+        return False
+    if key is not None and config.key is not None:
+        if secrets.compare_digest(key.encode(), config.key.get_secret_value().encode()):
+            return True
+        log.warning("Invalid profiling key")
+    return config.sample_rate > 0 and random.random() < config.sample_rate
+
+
+class Profile:
+    """Profile of a single query."""
+
+    def __init__(self, query: "Query", profiler: SamplingProfiler) -> None:
+        """Set up the profile of `query`, sampled by `profiler`."""
+        self.id = secrets.token_hex(8)
+        self.timestamp = time.time()
+        self.query = query.summary().model_dump()
+        self.profiler = profiler
+        self.error: t.Optional[str] = None
+
+    def export(self) -> t.Dict[str, t.Any]:
+        """Export the profile."""
+        return {
+            "id": self.id,
+            "timestamp": self.timestamp,
+            "query": self.query,
+            "error": self.error,
+            "interval": self.profiler.interval,
+            "duration": round(self.profiler.duration, 6),
+            "samples": self.profiler.samples,
+            "stacks": self.profiler.stacks,
+        }
+
+
+def _name(profile_id: str) -> str:
+    return "{}:{}".format(use_state("cache").key(CACHE_KEY), profile_id)
+
+
+def save_profile(profile: t.Dict[str, t.Any], config: "Profiling") -> None:
+    """Store a profile, & remove the oldest profiles, if there are more than `max_profiles`."""
+    cache = use_state("cache")
+    index = cache.key(CACHE_KEY)
+    with cache.instance.pipeline(transaction=False) as pipeline:
+        pipeline.set(_name(profile["id"]), pickle.dumps(profile), ex=config.timeout)
+        pipeline.zadd(index, {profile["id"]: profile["timestamp"]})
+        # Expired profiles are removed from the index, too.
+        pipeline.zremrangebyscore(index, "-inf", profile["timestamp"] - config.timeout)
+        pipeline.zremrangebyrank(index, 0, -config.max_profiles - 1)
+        pipeline.execute()
+
+
+def get_profiles() -> t.List[t.Dict[str, t.Any]]:
+    """Get all stored profiles, newest first."""
+    cache = use_state("cache")
+    ids = [i.decode() for i in cache.instance.zrevrange(cache.key(CACHE_KEY), 0, -1)]
+    if len(ids) == 0:
+        return []
+    values = cache.instance.mget([_name(i) for i in ids])
+    return [pickle.loads(value) for value in values if isinstance(value, bytes)]  # noqa
+
+
+def get_profile(profile_id: str) -> t.Optional[t.Dict[str, t.Any]]:
+    """Get a stored profile by ID, or `None` if it doesn't exist or expired."""
+    value = use_state("cache").instance.get(_name(profile_id))
+    if isinstance(value, bytes):
+        return pickle.loads(value)  # noqa
+    return None
+
+
+def folded_stacks(profile: t.Dict[str, t.Any]) -> str:
+    """Format a profile's stacks in the folded format used by flame graph tools."""
+    stacks = sorted(profile["stacks"].items(), key=lambda item: item[1], reverse=True)
+    return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+
+@contextmanager
+def profile_query(
+    query: "Query", config: "Profiling", key: t.Optional[str] = None
+) -> t.Generator[t.Optional[Profile], None, None]:
+    """Profile a query, if it should be, & store the profile, whether or not the query fails."""
+    if not should_profile(config, key):
+        yield None
+        return
+
+    profiler = SamplingProfiler(interval=config.interval)
+    profile = Profile(query, profiler)
+    profiler.start()
+    try:
+        yield profile
+    except BaseException as err:
+        profile.error = err.__class__.__name__
+        raise
+    finally:
+        profiler.stop()
+        try:
+            save_profile(profile.export(), config)
+            log.bind(profile=profile.id, samples=profiler.samples).debug("Stored query profile")
+        except Exception as err:
+            log.bind(profile=profile.id).error("Failed to store query profile: {!s}", err)
@@ -0,0 +1 @@
+"""hyperglass tests."""
@@ -0,0 +1,123 @@
+"""Test logging utilities."""
+
+# Standard Library
+import sys
+import time
+import pickle
+import logging
+import contextvars
+
+# Third Party
+import pytest
+
+# Project
+from hyperglass.log import (
+    Lazy,
+    QueueSink,
+    RotatingFileWriter,
+    log,
+    add_log_sink,
+    sample_debug,
+    debug_enabled,
+    filter_sampled,
+    remove_log_sinks,
+)
+
+
+@pytest.fixture
+def records():
+    records = []
+    remove_log_sinks()
+    yield records
+    remove_log_sinks()
+    add_log_sink(sys.stderr, level="DEBUG")
+
+
+def test_lazy(records):
+    add_log_sink(records.append, level="INFO", format="{message} {extra}")
+    calls = []
+
+    def compute():
+        calls.append(None)
+        return "computed"
+
+    value = Lazy(compute)
+    assert debug_enabled() is False
+    log.bind(value=value).debug("Not emitted")
+    assert len(calls) == 0
+
+    log.bind(value=value).info("Emitted")
+    log.bind(value=value).info("Emitted again")
+    assert len(calls) == 1
+    assert all("'computed'" in record for record in records)
+
+    # Enqueued sinks receive the computed value.
+    assert pickle.loads(pickle.dumps(Lazy(repr, [1, 2]))) == "[1, 2]"
+
+
+def test_sample_debug(records):
+    add_log_sink(records.append, level="DEBUG", format="{message}", filter=filter_sampled)
+
+    def query(rate):
+        sample_debug(rate)
+        log.debug("Query debug")
+        log.info("Query info")
+        return debug_enabled()
+
+    assert contextvars.copy_context().run(query, 0) is False
+    assert [str(record).strip() for record in records] == ["Query info"]
+
+    records.clear()
+    assert contextvars.copy_context().run(query, 1) is True
+    assert [str(record).strip() for record in records] == ["Query debug", "Query info"]
+
+    # Sampling applies only to the context it's decided in.
+    assert debug_enabled() is True
+
+
+def test_debug_enabled(records):
+    assert debug_enabled() is False
+    add_log_sink(records.append, level=logging.WARNING)
+    assert debug_enabled() is False
+    add_log_sink(records.append, level="TRACE")
+    assert debug_enabled() is True
+    remove_log_sinks()
+    assert debug_enabled() is False
+
+
+def test_queue_sink():
+    written = []
+
+    def slow_writer(batch):
+        time.sleep(0.01)
+        written.extend(batch)
+
+    sink = QueueSink(slow_writer, name="test", max_size=10, batch_size=5)
+    for idx in range(100):
+        sink.write(f"{idx}\n")
+    sink.stop()
+
+    records = [text for level, text in written if level == "INFO"]
+    reports = [int(text.split()[0]) for level, text in written if level == "WARNING"]
+    assert sink.dropped > 0
+    assert sum(reports) == sink.dropped
+    assert len(records) + sink.dropped == 100
+
+
+def test_rotating_file_writer(tmp_path):
+    path = tmp_path / "hyperglass.log"
+    # Writers in two processes logging to the same file.
+    first = RotatingFileWriter(path, max_size=100)
+    second = RotatingFileWriter(path, max_size=100)
+    lines = [f"line {idx}\n" for idx in range(40)]
+    for idx, line in enumerate(lines):
+        writer = first if idx % 2 == 0 else second
+        writer([("INFO", line)])
+    first.close()
+    second.close()
+
+    files = sorted(tmp_path.glob("hyperglass.*"))
+    assert len(files) > 1
+    assert all(file.stat().st_size < 100 + len(lines[-1]) for file in files)
+    written = [line for file in files for line in file.read_text().splitlines(keepends=True)]
+    assert sorted(written) == sorted(lines)
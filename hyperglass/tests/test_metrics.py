@@ -0,0 +1,42 @@
+"""Test query pipeline metrics."""
+
+# Third Party
+import pytest
+from prometheus_client import REGISTRY
+
+# Project
+from hyperglass.metrics import DEVICE_DURATION, timer, export, count_error, track_request
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_track_request():
+    labels = {"directive": "test_directive", "device": "test_device"}
+    success = _sample("hyperglass_requests_total", status="success", **labels)
+    error = _sample("hyperglass_requests_total", status="error", **labels)
+    observed = _sample("hyperglass_request_duration_seconds_count", **labels)
+
+    with track_request(**labels):
+        pass
+
+    with pytest.raises(RuntimeError):
+        with track_request(**labels):
+            raise RuntimeError("Device failed")
+
+    assert _sample("hyperglass_requests_total", status="success", **labels) == success + 1
+    assert _sample("hyperglass_requests_total", status="error", **labels) == error + 1
+    assert _sample("hyperglass_request_duration_seconds_count", **labels) == observed + 2
+
+
+def test_export():
+    with timer(DEVICE_DURATION, device="test_device", stage="connect"):
+        pass
+    count_error(ValueError())
+
+    content, content_type = export()
+    assert content_type.startswith("text/plain")
+    device = b'hyperglass_device_duration_seconds_count{device="test_device",stage="connect"}'
+    assert device in content
+    assert b'hyperglass_errors_total{error="ValueError"}' in content
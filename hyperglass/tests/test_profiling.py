@@ -0,0 +1,46 @@
+"""Test query profiling."""
+
+# Standard Library
+import time
+
+# Third Party
+import pytest
+
+# Project
+from hyperglass.profiling import SamplingProfiler, folded_stacks, should_profile
+from hyperglass.models.config.profiling import Profiling
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampling_profiler():
+    with SamplingProfiler(interval=0.001) as profiler:
+        _busy(0.1)
+
+    assert profiler.samples > 0
+    assert sum(profiler.stacks.values()) == profiler.samples
+    assert any(stack.endswith("test_profiling:_busy") for stack in profiler.stacks)
+    assert profiler.duration >= 0.1
+
+
+def test_should_profile():
+    assert should_profile(Profiling(), "key") is False
+
+    config = Profiling(enable=True, key="key")
+    assert should_profile(config, "key") is True
+    assert should_profile(config, "wrong") is False
+    assert should_profile(config) is False
+
+    assert should_profile(Profiling(enable=True, sample_rate=1)) is True
+
+    with pytest.raises(ValueError):
+        Profiling(enable=True)
+
+
+def test_folded_stacks():
+    profile = {"stacks": {"main;query": 1, "main;query;collect": 3}}
+    assert folded_stacks(profile) == "main;query;collect 3\nmain;query 1\n"
@@ -0,0 +1,66 @@
+"""Test per-query span tracing."""
+
+# Standard Library
+import json
+import asyncio
+
+# Third Party
+import pytest
+
+# Project
+from hyperglass import tracing
+from hyperglass.tracing import Trace, span, use_trace, enable_trace_export
+
+
+def test_span_without_trace():
+    with span("collect") as current:
+        pass
+    assert current is None
+
+
+def test_trace():
+    trace = Trace()
+
+    async def stage(name):
+        with span(name, device="test_device"):
+            # Sleeps can end slightly early, so each lasts well over the asserted timing.
+            await asyncio.sleep(0.02)
+
+    async def handle():
+        # Spans recorded by tasks started while the trace is current are recorded in the trace.
+        with use_trace(trace):
+            await asyncio.gather(stage("collect"), stage("collect"))
+            with span("parse"):
+                pass
+
+    asyncio.run(handle())
+
+    assert [s.name for s in trace.spans] == ["collect", "collect", "parse"]
+    assert trace.spans[0].export()["device"] == "test_device"
+    timings = trace.timings()
+    assert tuple(timings) == ("collect", "parse", "total")
+    assert timings["collect"] >= 20
+    assert timings["total"] >= 10
+    assert trace.server_timing().startswith("collect;dur=")
+
+    with span("parse") as current:
+        pass
+    assert current is None
+    assert len(trace.spans) == 3
+
+
+def test_export_trace(tmp_path, monkeypatch):
+    monkeypatch.setattr(tracing, "_EXPORTER", {})
+    enable_trace_export(directory=tmp_path, max_size=1_000_000)
+
+    trace = Trace()
+    with pytest.raises(RuntimeError):
+        with use_trace(trace), span("connect"):
+            raise RuntimeError("Device failed")
+
+    # Stopping the sink writes the queued trace.
+    tracing._EXPORTER["file"].stop()
+    exported = json.loads((tmp_path / "hyperglass.traces.json").read_text())
+    assert exported["trace_id"] == trace.id
+    assert exported["error"] == "RuntimeError"
+    assert [s["name"] for s in exported["spans"]] == ["connect"]
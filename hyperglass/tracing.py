@@ -0,0 +1,144 @@
+"""Per-query span tracing.
+
+Each query carries a `Trace`, which is made current while the query is handled, so any code in the
+query pipeline records its duration with `span()`, without passing the trace around. Outside of a
+query, e.g. when the CLI validates configuration, `span()` does nothing.
+
+Traces are summarized in the query response's `Server-Timing` header & `timing` field, and if
+enabled, exported as JSON lines to a file a local collector can tail.
+"""
+
+# Standard Library
+import json
+import time
+import typing as t
+import secrets
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Local
+from .log import QueueSink, RotatingFileWriter
+
+if t.TYPE_CHECKING:
+    # Standard Library
+    from pathlib import Path
+
+_TRACE: ContextVar[t.Optional["Trace"]] = ContextVar("hyperglass_trace", default=None)
+
+# Trace file sink, if trace export is enabled in this process.
+_EXPORTER: t.Dict[str, QueueSink] = {}
+
+
+class Span:
+    """Duration of a single stage of a query."""
+
+    __slots__ = ("name", "start", "duration", "attrs")
+
+    def __init__(self, name: str, start: float, attrs: t.Dict[str, t.Any]) -> None:
+        """Start the span, at `start` seconds after the trace started."""
+        self.name = name
+        self.start = start
+        self.duration = 0.0
+        self.attrs = attrs
+
+    def export(self) -> t.Dict[str, t.Any]:
+        """Export the span, with times in milliseconds."""
+        return {
+            "name": self.name,
+            "start": round(self.start * 1000, 3),
+            "duration": round(self.duration * 1000, 3),
+            **self.attrs,
+        }
+
+
+class Trace:
+    """Spans recorded while handling a single query."""
+
+    def __init__(self) -> None:
+        """Start the trace."""
+        self.id = secrets.token_hex(16)
+        self.timestamp = time.time()
+        self.spans: t.List[Span] = []
+        self.error: t.Optional[str] = None
+        self._start = time.perf_counter()
+
+    def elapsed(self) -> float:
+        """Get the time since the trace started, in seconds."""
+        return time.perf_counter() - self._start
+
+    @contextmanager
+    def span(self, name: str, **attrs: t.Any) -> t.Generator[Span, None, None]:
+        """Record the duration of a block, whether or not it raises an exception."""
+        span = Span(name, self.elapsed(), attrs)
+        self.spans.append(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - start
+
+    def timings(self) -> t.Dict[str, float]:
+        """Get the total duration of each stage & the whole trace so far, in milliseconds.
+
+        Stages may overlap, e.g. output plugins run while the output is parsed.
+        """
+        timings: t.Dict[str, float] = {}
+        for span in self.spans:
+            timings[span.name] = timings.get(span.name, 0.0) + span.duration
+        timings["total"] = self.elapsed()
+        return {name: round(duration * 1000, 3) for name, duration in timings.items()}
+
+    def server_timing(self) -> str:
+        """Summarize the trace as a `Server-Timing` header value."""
+        return ", ".join(f"{name};dur={duration}" for name, duration in self.timings().items())
+
+    def export(self) -> t.Dict[str, t.Any]:
+        """Export the trace & its spans."""
+        return {
+            "trace_id": self.id,
+            "timestamp": self.timestamp,
+            "duration": round(self.elapsed() * 1000, 3),
+            "error": self.error,
+            "spans": [span.export() for span in self.spans],
+        }
+
+
+@contextmanager
+def use_trace(trace: Trace) -> t.Generator[Trace, None, None]:
+    """Record spans in `trace` while handling a query, then export it, whether or not it fails."""
+    token = _TRACE.set(trace)
+    try:
+        yield trace
+    except BaseException as err:
+        trace.error = err.__class__.__name__
+        raise
+    finally:
+        _TRACE.reset(token)
+        export_trace(trace)
+
+
+@contextmanager
+def span(name: str, **attrs: t.Any) -> t.Generator[t.Optional[Span], None, None]:
+    """Record the duration of a block in the current trace, if there is one."""
+    trace = _TRACE.get()
+    if trace is None:
+        yield None
+        return
+    with trace.span(name, **attrs) as current:
+        yield current
+
+
+def enable_trace_export(*, directory: "Path", max_size: int) -> None:
+    """Export traces to a JSON lines file, once per process."""
+    if "file" in _EXPORTER:
+        return
+    writer = RotatingFileWriter(directory / "hyperglass.traces.json", max_size=max_size)
+    # Every line of the file is a trace, so dropped traces are counted but not reported in it.
+    _EXPORTER["file"] = QueueSink(writer, name="traces", close=writer.close, report_dropped=False)
+
+
+def export_trace(trace: Trace) -> None:
+    """Queue a trace to be written to the trace file, if trace export is enabled."""
+    exporter = _EXPORTER.get("file")
+    if exporter is not None:
+        exporter.write(json.dumps(trace.export(), default=str) + "\n")